@@ -8,7 +8,8 @@ app_license = "mit"
 # Apps
 # ------------------
 
-# required_apps = []
+# Shared Auth0 client and the Vendor doctype live in vendor_manager
+required_apps = ["vendor_manager"]
 
 # Each item in the list will be shown as an app in the apps page
 # add_to_apps_screen = [
@@ -85,6 +86,8 @@ app_license = "mit"
 # before_install = "lexicon.install.before_install"
 # after_install = "lexicon.install.after_install"
 
+after_migrate = ["lexicon.lexicon.directory.search.ensure_index"]
+
 # Uninstallation
 # ------------
 
@@ -137,34 +140,46 @@ app_license = "mit"
 # ---------------
 # Hook on document methods and events
 
-# doc_events = {
-# 	"*": {
-# 		"on_update": "method",
-# 		"on_cancel": "method",
-# 		"on_trash": "method"
-# 	}
-# }
+doc_events = {
+	"Vendor": {
+		"after_insert": "lexicon.lexicon.directory.events.on_vendor_insert",
+		"on_update": "lexicon.lexicon.directory.events.on_vendor_update",
+		"on_trash": "lexicon.lexicon.directory.events.on_vendor_trash",
+		"after_rename": "lexicon.lexicon.directory.events.on_vendor_rename",
+	},
+	"User": {
+		"on_update": "lexicon.lexicon.auth.access.on_user_change",
+	},
+	"Social Login Key": {
+		"on_update": "lexicon.lexicon.auth.login_page.invalidate",
+		"on_trash": "lexicon.lexicon.auth.login_page.invalidate",
+		"after_rename": "lexicon.lexicon.auth.login_page.invalidate",
+	},
+	"LDAP Settings": {
+		"on_update": "lexicon.lexicon.auth.login_page.invalidate",
+	},
+}
+
+# Roles and permissions, reconciled by vendor_manager.roles.reconcile
+role_manifests = ["lexicon.roles.MANIFEST"]
+
+# Called by vendor_manager after a bulk Vendor import, which bypasses doc_events
+after_vendor_bulk_import = ["lexicon.lexicon.directory.events.on_vendors_bulk_imported"]
+
+# Called by vendor_manager after granting roles without saving the User
+user_roles_changed = ["lexicon.lexicon.auth.access.clear_entitlements"]
+
+# Hot-path queries EXPLAINed by vendor_manager.indexes.check_query_plans
+query_plan_checks = ["lexicon.lexicon.page.vendors.vendors.get_query_plan_checks"]
 
 # Scheduled Tasks
 # ---------------
 
-# scheduler_events = {
-# 	"all": [
-# 		"lexicon.tasks.all"
-# 	],
-# 	"daily": [
-# 		"lexicon.tasks.daily"
-# 	],
-# 	"hourly": [
-# 		"lexicon.tasks.hourly"
-# 	],
-# 	"weekly": [
-# 		"lexicon.tasks.weekly"
-# 	],
-# 	"monthly": [
-# 		"lexicon.tasks.monthly"
-# 	],
-# }
+scheduler_events = {
+	"hourly": [
+		"lexicon.lexicon.directory.facets.reconcile",
+	],
+}
 
 # Testing
 # -------
@@ -244,13 +259,12 @@ app_license = "mit"
 
 
 # Authentication hooks
-# authentication_hooks = ["lexicon.lexicon.auth.validate_lexicon_login"]
-
-# Note: Uncomment the above line to enable Auth0-based Lexicon access control
+# Route-level Lexicon / Vendor Manager access control, run on every request
+auth_hooks = ["lexicon.lexicon.auth.validate_lexicon_login"]
 # Make sure to configure Auth0 client credentials in common_site_config.json
 
 # Override login page to add Auth0 buttons
 # This will replace the default Frappe login page with our custom one
 website_route_rules = [
-    {"from_route": "/login", "to_route": "login"},
+	{"from_route": "/login", "to_route": "login"},
 ]
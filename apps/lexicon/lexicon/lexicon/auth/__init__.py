@@ -2,19 +2,18 @@
 import frappe
 from frappe import _
 
-def validate_lexicon_login(login_manager):
-    """Validate that only Lexicon users can access Lexicon resources"""
-    # Check if the current request is for Lexicon app
-    if frappe.local.request and frappe.local.request.path:
-        path = frappe.local.request.path
-        # Allow access to Lexicon paths for authenticated users
-        if "/lexicon" in path.lower() or "/vendors" in path.lower():
-            # Here you would validate the Auth0 token and check app permissions
-            # For now, we'll just log the access
-            frappe.logger().info(f"Lexicon access attempt from {frappe.session.user} to {path}")
+from lexicon.lexicon.auth.access import check_access
+
+
+def validate_lexicon_login(login_manager=None):
+	"""Validate that only Lexicon users can access Lexicon resources (runs as an auth hook)"""
+	request = getattr(frappe.local, "request", None)
+	if request and request.path:
+		check_access(request.path)
+
 
 def get_auth0_user_info():
-    """Get Auth0 user information from the session"""
-    # This would typically validate the Auth0 JWT token
-    # and extract user information
-    pass
+	"""Get Auth0 user information from the session"""
+	# This would typically validate the Auth0 JWT token
+	# and extract user information
+	pass
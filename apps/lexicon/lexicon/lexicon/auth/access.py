@@ -0,0 +1,163 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Per-request access control for Lexicon and Vendor Manager routes.
+
+Runs as an auth hook on every request, so the common path is kept to a
+regex match and a dict lookup:
+
+- ROUTES is compiled once into a single alternation; the matching group
+  names the entitlement a route needs (or none for public routes);
+- a session's entitlements are derived from the user's roles once and cached
+  in Redis under the session id, with a short-lived copy in worker memory;
+- allowed requests only bump in-process counters, which are added to an
+  hourly Redis hash in one pipelined round trip every FLUSH_INTERVAL seconds.
+  Denials are logged individually.
+"""
+
+import re
+import threading
+import time
+from functools import partial
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, now_datetime
+from vendor_manager.cache import get_redis, make_key
+
+# First match wins; None marks routes that stay public (the login flow)
+ROUTES = [
+	(r"/api/method/lexicon\.lexicon\.auth\.", None),
+	(r"/(app/)?lexicon(/|$)", "lexicon"),
+	(r"/app/vendors(/|$)", "lexicon"),
+	(r"/api/method/lexicon\.lexicon\.page\.vendors\.", "lexicon"),
+	(r"/app/(vendor|waitlist)(/|$)", "vendor_manager"),
+	(r"/api/resource/(vendor|waitlist)(/|$)", "vendor_manager"),
+]
+ENTITLEMENT_ROLES = {
+	"lexicon": {"Lexicon User", "System Manager"},
+	"vendor_manager": {"Vendor Manager User", "System Manager"},
+}
+
+ENTITLEMENTS_KEY = "lexicon:entitlements:"
+ENTITLEMENTS_SECONDS = 60 * 60
+LOCAL_CACHE_SECONDS = 30
+LOCAL_CACHE_SIZE = 2048
+COUNTS_KEY = "lexicon:access_counts:"
+COUNTS_RETENTION = 7 * 24 * 60 * 60
+FLUSH_INTERVAL = 30
+
+_route_table = re.compile(
+	"|".join(f"(?P<r{i}>{pattern})" for i, (pattern, _entitlement) in enumerate(ROUTES)), re.IGNORECASE
+)
+_route_entitlements = {f"r{i}": entitlement for i, (_pattern, entitlement) in enumerate(ROUTES)}
+
+# (site, sid) -> (user, entitlements, expires at)
+_local_entitlements = {}
+# site -> {"entitlement|allowed": count}; workers can serve several sites
+_counts = {}
+_last_flush = {}
+_counts_lock = threading.Lock()
+
+
+def check_access(path):
+	"""Raise PermissionError if the session user may not open `path`"""
+	match = _route_table.match(path)
+	if not match:
+		return
+
+	entitlement = _route_entitlements[match.lastgroup]
+	user = frappe.session.user
+	# Guests are sent to the login page by Frappe itself; Administrator holds every role
+	if entitlement is None or user in ("Guest", "Administrator"):
+		return
+
+	allowed = entitlement in get_entitlements(frappe.session.sid, user)
+	_count(entitlement, allowed)
+	if not allowed:
+		frappe.logger("lexicon.access").warning(f"Denied {user} access to {path} (needs {entitlement})")
+		frappe.throw(_("You do not have access to this page."), frappe.PermissionError)
+
+
+def get_entitlements(sid, user):
+	local_key = (frappe.local.site, sid)
+	cached = _local_entitlements.get(local_key)
+	if cached and cached[0] == user and cached[2] > time.monotonic():
+		return cached[1]
+
+	key = make_key(ENTITLEMENTS_KEY + sid)
+	r = get_redis()
+	stored = r.get(key)
+	if stored is not None and stored.decode().partition("|")[0] == user:
+		entitlements = frozenset(filter(None, stored.decode().partition("|")[2].split(",")))
+	else:
+		roles = set(frappe.get_roles(user))
+		entitlements = frozenset(name for name, granted in ENTITLEMENT_ROLES.items() if roles & granted)
+		r.set(key, f"{user}|{','.join(sorted(entitlements))}", ex=ENTITLEMENTS_SECONDS)
+
+	if len(_local_entitlements) >= LOCAL_CACHE_SIZE:
+		_local_entitlements.clear()
+	_local_entitlements[local_key] = (user, entitlements, time.monotonic() + LOCAL_CACHE_SECONDS)
+	return entitlements
+
+
+def clear_entitlements(users):
+	"""Drop the cached entitlements of every open session of `users`; also the `user_roles_changed` hook"""
+	# Sessions is a plain table, not a DocType
+	sessions = frappe.qb.DocType("Sessions")
+	sids = frappe.qb.from_(sessions).select(sessions.sid).where(sessions.user.isin(users)).run(pluck=True)
+	if sids:
+		get_redis().delete(*(make_key(ENTITLEMENTS_KEY + sid) for sid in sids))
+
+
+def on_user_change(doc, method=None):
+	"""Role changes take effect on the user's open sessions (after the worker-local TTL)"""
+	frappe.db.after_commit.add(partial(clear_entitlements, [doc.name]))
+
+
+@frappe.whitelist()
+def get_access_counts(hours=24):
+	"""Allowed/denied request counts per entitlement for the last `hours` hours"""
+	frappe.only_for("System Manager")
+	_flush_counts()
+
+	r = get_redis()
+	now = now_datetime()
+	totals = {}
+	for offset in range(int(hours)):
+		bucket = add_to_date(now, hours=-offset).strftime("%Y%m%d%H")
+		for field, value in r.hgetall(make_key(COUNTS_KEY + bucket)).items():
+			totals[field.decode()] = totals.get(field.decode(), 0) + int(value)
+	return totals
+
+
+def _count(entitlement, allowed):
+	field = f"{entitlement}|{'allowed' if allowed else 'denied'}"
+	site = frappe.local.site
+	with _counts_lock:
+		counts = _counts.setdefault(site, {})
+		counts[field] = counts.get(field, 0) + 1
+		due = time.monotonic() - _last_flush.setdefault(site, time.monotonic()) >= FLUSH_INTERVAL
+	if due:
+		_flush_counts()
+
+
+def _flush_counts():
+	site = frappe.local.site
+	with _counts_lock:
+		counts = _counts.pop(site, None)
+		_last_flush[site] = time.monotonic()
+	if not counts:
+		return
+
+	key = make_key(COUNTS_KEY + now_datetime().strftime("%Y%m%d%H"))
+	try:
+		pipe = get_redis().pipeline(transaction=False)
+		for field, count in counts.items():
+			pipe.hincrby(key, field, count)
+		pipe.expire(key, COUNTS_RETENTION)
+		pipe.execute()
+	except Exception:
+		# Counters are best effort; never let them fail a request
+		pass
@@ -0,0 +1,60 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Login page options (social login providers, LDAP flag) cached in Redis.
+
+The login page is the most requested guest page, so its context comes from a
+single Redis read. The entry is dropped after commit whenever a Social Login
+Key or the LDAP Settings change, and otherwise expires after a day.
+"""
+
+import json
+
+import frappe
+from vendor_manager.cache import get_redis, make_key
+
+OPTIONS_KEY = "lexicon:login_options"
+OPTIONS_TTL = 24 * 60 * 60
+
+
+def get_login_options():
+	"""Return {"social_login": [{provider_name, auth_url, icon}], "ldap_enabled": bool}"""
+	payload = get_redis().get(make_key(OPTIONS_KEY))
+	if payload is not None:
+		return json.loads(payload)
+
+	options = {"social_login": _get_social_login(), "ldap_enabled": _ldap_enabled()}
+	get_redis().set(make_key(OPTIONS_KEY), json.dumps(options, separators=(",", ":")), ex=OPTIONS_TTL)
+	return options
+
+
+def invalidate(doc=None, method=None):
+	"""doc_events handler for Social Login Key and LDAP Settings"""
+	frappe.db.after_commit.add(clear_login_options)
+
+
+def clear_login_options():
+	get_redis().delete(make_key(OPTIONS_KEY))
+
+
+def _get_social_login():
+	providers = frappe.get_all(
+		"Social Login Key",
+		filters={"enable_social_login": 1},
+		fields=["name", "provider_name", "icon"],
+		order_by="name asc",
+	)
+	return [
+		{
+			"provider_name": provider.provider_name,
+			"auth_url": "/api/method/frappe.integrations.oauth2_logins.login_via_"
+			+ provider.name.lower().replace(" ", "_"),
+			"icon": provider.icon,
+		}
+		for provider in providers
+	]
+
+
+def _ldap_enabled():
+	return bool(frappe.db.get_single_value("LDAP Settings", "enabled"))
@@ -0,0 +1,82 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from vendor_manager.auth.provisioning import add_roles
+from vendor_manager.cache import get_redis, make_key
+
+from lexicon.lexicon.auth import access
+
+
+class TestLexiconAccess(FrappeTestCase):
+	def setUp(self):
+		access._local_entitlements.clear()
+
+	def tearDown(self):
+		frappe.set_user("Administrator")
+		access._local_entitlements.clear()
+		get_redis().delete(make_key(access.ENTITLEMENTS_KEY + "Guest"))
+
+	def test_route_table(self):
+		def entitlement(path):
+			match = access._route_table.match(path)
+			return match and access._route_entitlements[match.lastgroup]
+
+		self.assertEqual(entitlement("/app/lexicon"), "lexicon")
+		self.assertEqual(entitlement("/app/vendors/view"), "lexicon")
+		self.assertEqual(entitlement("/api/resource/Vendor/V-0001"), "vendor_manager")
+		self.assertIsNone(entitlement("/api/method/lexicon.lexicon.auth.oauth.auth0_login"))
+		self.assertIsNone(entitlement("/app/vendorsx"))
+		self.assertIsNone(entitlement("/app/todo"))
+
+	def test_entitlements_cached_per_session(self):
+		sid = "_test_access_sid"
+		entitlements = access.get_entitlements(sid, "Guest")
+		self.assertEqual(entitlements, frozenset())
+		self.assertEqual(get_redis().get(make_key(access.ENTITLEMENTS_KEY + sid)), b"Guest|")
+
+		# a different user on the same sid is not served the cached value
+		access._local_entitlements.clear()
+		self.assertIn("lexicon", access.get_entitlements(sid, "Administrator"))
+		get_redis().delete(make_key(access.ENTITLEMENTS_KEY + sid))
+
+	def test_denied_without_role(self):
+		frappe.set_user("Guest")
+		frappe.session.user = "_test_access_user@example.com"
+		self.assertRaises(frappe.PermissionError, access.check_access, "/app/lexicon")
+		access.check_access("/app/todo")
+
+	def test_saving_user_clears_session_entitlements(self):
+		user = self.make_user("_test_access_save@example.com")
+		key = self.make_session(user.name, "_test_access_save_sid")
+
+		user.first_name = "_Test Access Saved"
+		user.save()
+		frappe.db.after_commit.run()
+		self.assertIsNone(get_redis().get(key))
+
+	def test_role_grant_clears_session_entitlements(self):
+		user = self.make_user("_test_access_grant@example.com")
+		key = self.make_session(user.name, "_test_access_grant_sid")
+
+		# Granted with a direct Has Role insert, without saving the User
+		add_roles(user.name, ["Lexicon User"])
+		frappe.db.after_commit.run()
+		self.assertIsNone(get_redis().get(key))
+
+	def make_user(self, email):
+		user = frappe.get_doc({"doctype": "User", "email": email, "first_name": "_Test Access"}).insert()
+		self.addCleanup(frappe.delete_doc, "User", user.name, force=True)
+		return user
+
+	def make_session(self, user, sid):
+		"""A Sessions row for `user` with cached entitlements; returns their Redis key"""
+		sessions = frappe.qb.DocType("Sessions")
+		frappe.qb.into(sessions).columns(sessions.sid, sessions.user, sessions.status).insert(
+			sid, user, "Active"
+		).run()
+		self.addCleanup(lambda: frappe.qb.from_(sessions).delete().where(sessions.sid == sid).run())
+		key = make_key(access.ENTITLEMENTS_KEY + sid)
+		get_redis().set(key, f"{user}|")
+		return key
@@ -0,0 +1,33 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from lexicon.lexicon.auth import login_page
+
+
+class TestLoginPage(FrappeTestCase):
+	def setUp(self):
+		login_page.clear_login_options()
+
+	def tearDown(self):
+		login_page.clear_login_options()
+
+	def test_options_served_from_redis(self):
+		options = login_page.get_login_options()
+		self.assertIn("social_login", options)
+		self.assertIn("ldap_enabled", options)
+
+		queries = frappe.db.sql
+		frappe.db.sql = lambda *args, **kwargs: self.fail("login options read the database")
+		try:
+			self.assertEqual(login_page.get_login_options(), options)
+		finally:
+			frappe.db.sql = queries
+
+	def test_cleared_when_ldap_settings_change(self):
+		login_page.get_login_options()
+		frappe.get_doc("LDAP Settings").run_method("on_update")
+		frappe.db.commit()
+		self.assertIsNone(login_page.get_redis().get(login_page.make_key(login_page.OPTIONS_KEY)))
@@ -0,0 +1,116 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+"Changed since" deltas for clients that keep a local copy of the directory.
+
+Inserts and updates come from the Vendor `modified` column. Deletes and the
+old side of renames are recorded as tombstones in a Redis sorted set scored
+by time. The set also holds a floor sentinel: tombstones older than the floor
+have been pruned (or the set was evicted), so a client whose watermark is
+below it must reload the full directory.
+"""
+
+import frappe
+from frappe.utils import add_to_date, get_datetime, now_datetime
+from vendor_manager.cache import get_redis, make_key
+
+from lexicon.lexicon.directory.snapshot import VENDOR_FIELDS, get_vendor_directory
+
+TOMBSTONES_KEY = "lexicon:vendor_tombstones"
+FLOOR_MEMBER = "\x00floor"
+TOMBSTONE_RETENTION_DAYS = 30
+
+# Transactions still in flight may commit rows whose `modified` is slightly
+# older than the moment we answer, so the watermark handed out trails by this much
+# and clients merge the small overlap idempotently.
+WATERMARK_LAG_SECONDS = 30
+
+
+def get_changes(since):
+	"""
+	Return vendors inserted or updated at/after `since` plus deleted names.
+
+	Returns:
+		dict: {"full": 0|1, "vendors": [...], "deleted": [...], "watermark": str}
+		With full=1, `vendors` is the whole directory and the client must
+		replace its copy instead of merging. A `since` that is not a valid
+		watermark also gets full=1.
+	"""
+	watermark_dt = _watermark()
+	watermark = str(watermark_dt)
+	since_dt = _parse_since(since)
+
+	floor = _get_floor()
+	if since_dt is None or floor is None or since_dt.timestamp() < floor:
+		if floor is None:
+			# The full copy below already reflects every earlier delete, so
+			# tracking can start from the watermark we hand out with it
+			_start_tracking(watermark_dt)
+		return {"full": 1, "vendors": get_vendor_directory(), "deleted": [], "watermark": watermark}
+
+	vendors = changes_query(since_dt).run(as_dict=True)
+	deleted = [
+		_decode(name)
+		for name in get_redis().zrangebyscore(make_key(TOMBSTONES_KEY), since_dt.timestamp(), "+inf")
+		if _decode(name) != FLOOR_MEMBER
+	]
+	# A name that was deleted and then re-created is live again
+	live = {vendor.vendor_name for vendor in vendors}
+	deleted = [name for name in deleted if name not in live]
+
+	return {"full": 0, "vendors": vendors, "deleted": deleted, "watermark": watermark}
+
+
+def changes_query(since_dt):
+	return frappe.qb.get_query(
+		"Vendor", fields=VENDOR_FIELDS, filters={"modified": [">=", since_dt]}, order_by="vendor_name asc"
+	)
+
+
+def get_changes_watermark():
+	"""Watermark to hand out with a full copy assembled by some other means (e.g. keyset pages)"""
+	watermark_dt = _watermark()
+	if _get_floor() is None:
+		_start_tracking(watermark_dt)
+	return str(watermark_dt)
+
+
+def record_tombstone(name):
+	"""Remember that `name` left the directory. Called after commit."""
+	now = now_datetime()
+	key = make_key(TOMBSTONES_KEY)
+	cutoff = add_to_date(now, days=-TOMBSTONE_RETENTION_DAYS).timestamp()
+
+	pipe = get_redis().pipeline()
+	# Only start tracking when there is no floor yet; a fresh floor means older deltas are unknown
+	pipe.zadd(key, {FLOOR_MEMBER: now.timestamp()}, nx=True)
+	pipe.zadd(key, {name: now.timestamp()})
+	pipe.zremrangebyscore(key, "-inf", f"({cutoff}")
+	pipe.zadd(key, {FLOOR_MEMBER: cutoff}, gt=True)
+	pipe.execute()
+
+
+def _parse_since(since):
+	if not since:
+		return None
+	try:
+		return get_datetime(since)
+	except (TypeError, ValueError, OverflowError):
+		return None
+
+
+def _watermark():
+	return add_to_date(now_datetime(), seconds=-WATERMARK_LAG_SECONDS)
+
+
+def _get_floor():
+	return get_redis().zscore(make_key(TOMBSTONES_KEY), FLOOR_MEMBER)
+
+
+def _start_tracking(floor_dt):
+	get_redis().zadd(make_key(TOMBSTONES_KEY), {FLOOR_MEMBER: floor_dt.timestamp()}, nx=True)
+
+
+def _decode(value):
+	return value.decode() if isinstance(value, bytes) else value
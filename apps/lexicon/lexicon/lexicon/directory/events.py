@@ -0,0 +1,66 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Vendor doc_events that keep the directory caches in step with the database.
+
+Cache updates are deferred until the transaction commits so a rollback never
+leaks into Redis and readers cannot repopulate a cache with pre-commit rows.
+"""
+
+from functools import partial
+
+import frappe
+
+from lexicon.lexicon.directory import changes, facets, search, snapshot
+
+
+def on_vendor_insert(doc, method=None):
+	row = snapshot.vendor_row(doc)
+	frappe.db.after_commit.add(partial(snapshot.patch_vendor, row))
+	frappe.db.after_commit.add(partial(search.index_vendor, row))
+
+
+def on_vendor_update(doc, method=None):
+	# Directory rows are keyed by vendor_name, which can be edited without a rename
+	before = None if doc.flags.in_insert else doc.get_doc_before_save()
+	old_name = before.vendor_name if before and before.vendor_name != doc.vendor_name else None
+
+	row = snapshot.vendor_row(doc)
+	frappe.db.after_commit.add(partial(snapshot.patch_vendor, row, old_name=old_name))
+	frappe.db.after_commit.add(partial(search.index_vendor, row, old_name=old_name))
+	if old_name:
+		frappe.db.after_commit.add(partial(changes.record_tombstone, old_name))
+
+	# on_update also runs as part of insert; count the new vendor exactly once here
+	new = facets.facet_values(doc)
+	if doc.flags.in_insert:
+		frappe.db.after_commit.add(partial(facets.apply_change, new=new))
+	else:
+		old = facets.facet_values(before) if before else None
+		if old is not None and old != new:
+			frappe.db.after_commit.add(partial(facets.apply_change, old=old, new=new))
+
+
+def on_vendor_trash(doc, method=None):
+	frappe.db.after_commit.add(partial(snapshot.remove_vendor, doc.vendor_name))
+	frappe.db.after_commit.add(partial(search.remove_vendor, doc.vendor_name))
+	frappe.db.after_commit.add(partial(changes.record_tombstone, doc.vendor_name))
+	frappe.db.after_commit.add(partial(facets.apply_change, old=facets.facet_values(doc)))
+
+
+def on_vendor_rename(doc, method=None, old=None, new=None, merge=False):
+	# Renaming does not touch `modified`; bump it so delta clients pick up the new name
+	frappe.db.set_value("Vendor", doc.name, "modified", frappe.utils.now(), update_modified=False)
+
+	# Renames go through raw UPDATEs, so rebuild rather than trust the in-memory doc
+	frappe.db.after_commit.add(snapshot.invalidate)
+	frappe.db.after_commit.add(partial(changes.record_tombstone, old))
+	frappe.db.after_commit.add(partial(search.index_vendor, snapshot.vendor_row(doc), old_name=old))
+
+
+def on_vendors_bulk_imported():
+	"""`after_vendor_bulk_import` hook: bulk inserts skip doc_events, so rebuild everything once"""
+	snapshot.invalidate()
+	facets.reconcile()
+	search.enqueue_rebuild()
@@ -0,0 +1,110 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Materialized facet counters for the vendor directory.
+
+One Redis hash holds a counter per (type, status) pair plus a total, so the
+counts under any combination of filters are summed from a handful of fields
+instead of running a GROUP BY. Vendor doc_events adjust the counters after
+commit and an hourly job reconciles them against the table to absorb any
+drift (bulk writes, evictions, lost updates).
+"""
+
+import frappe
+from vendor_manager.cache import get_redis, make_key
+
+FACETS_KEY = "lexicon:vendor_facets"
+FACET_FIELDS = ("type", "status")
+TOTAL = "total"
+
+
+def get_facets(type=None, status=None):
+	"""
+	Return facet counts, optionally narrowed by the other facet's filter.
+
+	Returns:
+		dict: {"type": {value: count}, "status": {value: count}, "total": n}
+		where `type` counts honour the `status` filter and vice versa.
+	"""
+	counters = _load_counters()
+
+	facets = {"type": {}, "status": {}, "total": 0}
+	for field, count in counters.items():
+		if count <= 0 or field == TOTAL:
+			continue
+		values = dict(part.split("=", 1) for part in field.split("|"))
+		if status is not None and values["status"] != status:
+			continue
+		if type is not None and values["type"] != type:
+			continue
+		facets["type"][values["type"]] = facets["type"].get(values["type"], 0) + count
+		facets["status"][values["status"]] = facets["status"].get(values["status"], 0) + count
+		facets["total"] += count
+
+	# Each facet's own counts ignore its own filter so the sidebar can still switch values
+	if type is not None:
+		facets["type"] = get_facets(status=status)["type"]
+	if status is not None:
+		facets["status"] = get_facets(type=type)["status"]
+
+	return facets
+
+
+def apply_change(old=None, new=None):
+	"""
+	Move one vendor between facet buckets. `old`/`new` are dicts with the facet
+	fields (None for insert/delete). Called after commit.
+	"""
+	if not _counters_exist():
+		# Nothing to adjust; the next read reconciles from the table
+		return
+
+	pipe = get_redis().pipeline()
+	if old is not None:
+		for field in _counter_fields(old):
+			pipe.hincrby(make_key(FACETS_KEY), field, -1)
+	if new is not None:
+		for field in _counter_fields(new):
+			pipe.hincrby(make_key(FACETS_KEY), field, 1)
+	pipe.execute()
+
+
+def reconcile():
+	"""Recompute every counter from the Vendor table and swap them in atomically"""
+	rows = frappe.get_all(
+		"Vendor",
+		fields=["type", "status", "count(name) as count"],
+		group_by="type, status",
+	)
+
+	counters = {TOTAL: 0}
+	for row in rows:
+		for field in _counter_fields(row):
+			counters[field] = counters.get(field, 0) + row.count
+
+	pipe = get_redis().pipeline()
+	pipe.delete(make_key(FACETS_KEY))
+	pipe.hset(make_key(FACETS_KEY), mapping=counters)
+	pipe.execute()
+	return counters
+
+
+def facet_values(doc):
+	return {field: doc.get(field) or "" for field in FACET_FIELDS}
+
+
+def _counter_fields(values):
+	type_value, status_value = values.get("type") or "", values.get("status") or ""
+	return [TOTAL, f"type={type_value}|status={status_value}"]
+
+
+def _load_counters():
+	counters = get_redis().hgetall(make_key(FACETS_KEY))
+	if not counters:
+		return reconcile()
+	return {key.decode(): int(value) for key, value in counters.items()}
+
+
+def _counters_exist():
+	return bool(get_redis().exists(make_key(FACETS_KEY)))
@@ -0,0 +1,275 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Redis-resident search index for the vendor directory.
+
+Every vendor is split into tokens over vendor_name, type, email and
+description. Two kinds of postings are kept per token:
+
+- prefix postings (`prefix:<prefix>`) for type-ahead matching, for prefixes
+  of MIN_PREFIX_LENGTH to MAX_PREFIX_LENGTH characters. They are sorted sets
+  with every score 0, so members come back ordered by vendor name and a
+  query reads only the first `limit` of them with ZRANGE.
+- trigram postings (`tri:<trigram>`), plain sets, for typo-tolerant matching
+  over TYPO_FIELDS, scored by the number of trigrams a vendor shares with the
+  query via ZUNIONSTORE. `type` is left out: its few values are shared by
+  every vendor, so its sets would each hold most of the table and make every
+  union O(N).
+
+The stored row for each vendor lives in the `docs` hash so results can be
+rendered without touching the database and so old postings can be removed
+when a vendor changes.
+"""
+
+import json
+import math
+import re
+from itertools import islice
+
+import frappe
+from vendor_manager.cache import get_redis, make_key
+
+from lexicon.lexicon.directory.snapshot import VENDOR_FIELDS
+
+SEARCH_FIELDS = ["vendor_name", "type", "email", "description"]
+TYPO_FIELDS = ["vendor_name", "email"]
+
+KEY_PREFIX = "lexicon:vendor_search:"
+DOCS_KEY = KEY_PREFIX + "docs"
+# Versioned with the posting layout, so an index built by older code is rebuilt
+READY_KEY = KEY_PREFIX + "ready:3"
+
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_LENGTH = 12
+# Candidates read per wanted result when some query tokens must be checked against the stored rows
+VERIFY_FACTOR = 5
+MAX_DESCRIPTION_TOKENS = 64
+MIN_TRIGRAM_SCORE = 0.4
+BUILD_CHUNK_SIZE = 1000
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def search(query, limit=20):
+	"""
+	Return up to `limit` vendor rows matching `query`.
+
+	Prefix matches on every query token come first (ordered by vendor_name),
+	followed by typo-tolerant trigram matches ordered by similarity. Tokens
+	shorter than MIN_PREFIX_LENGTH only narrow the matches of longer ones.
+	"""
+	tokens = tokenize(query)
+	if not tokens:
+		return {"results": [], "indexing": False}
+
+	if not is_ready():
+		enqueue_rebuild()
+		return {"results": [], "indexing": True}
+
+	names = _prefix_matches(tokens, limit)
+	if len(names) < limit:
+		seen = set(names)
+		names += [name for name in _trigram_matches(tokens, limit * 2) if name not in seen][
+			: limit - len(names)
+		]
+
+	return {"results": _load_rows(names), "indexing": False}
+
+
+def index_vendor(row, old_name=None):
+	"""Add or refresh the postings of one vendor. Called after commit."""
+	pipe = get_redis().pipeline()
+	for name in {old_name, row["vendor_name"]} - {None}:
+		_remove_postings(pipe, name, _get_stored_row(name))
+
+	_add_postings(pipe, row["vendor_name"], row)
+	pipe.execute()
+
+
+def remove_vendor(name):
+	"""Drop one vendor from the index. Called after commit."""
+	pipe = get_redis().pipeline()
+	_remove_postings(pipe, name, _get_stored_row(name))
+	pipe.execute()
+
+
+def rebuild_index():
+	"""Rebuild the whole index from the Vendor table in keyset-ordered chunks"""
+	client = get_redis()
+	keys = client.scan_iter(make_key(KEY_PREFIX + "*"), count=BUILD_CHUNK_SIZE)
+	while batch := list(islice(keys, BUILD_CHUNK_SIZE)):
+		with client.pipeline(transaction=False) as pipe:
+			for key in batch:
+				pipe.unlink(key)
+			pipe.execute()
+
+	last_name = None
+	while True:
+		filters = {"name": [">", last_name]} if last_name else {}
+		rows = frappe.get_all(
+			"Vendor",
+			fields=["name", *VENDOR_FIELDS],
+			filters=filters,
+			order_by="name asc",
+			limit_page_length=BUILD_CHUNK_SIZE,
+		)
+		if not rows:
+			break
+
+		pipe = get_redis().pipeline()
+		for row in rows:
+			name = row.pop("name")
+			_add_postings(pipe, name, row)
+		pipe.execute()
+		last_name = name
+
+	get_redis().set(make_key(READY_KEY), 1)
+
+
+def enqueue_rebuild():
+	frappe.enqueue(
+		"lexicon.lexicon.directory.search.rebuild_index",
+		queue="long",
+		job_id="lexicon_vendor_search_rebuild",
+		deduplicate=True,
+	)
+
+
+def ensure_index():
+	"""Queue a build when the index is missing, e.g. after migrate or a Redis flush"""
+	if not is_ready():
+		enqueue_rebuild()
+
+
+def is_ready():
+	return bool(get_redis().exists(make_key(READY_KEY)))
+
+
+def tokenize(text):
+	return [token.casefold() for token in TOKEN_PATTERN.findall(text or "")]
+
+
+def trigrams(token):
+	padded = f"  {token} "
+	return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _row_tokens(row):
+	tokens = set()
+	for field in SEARCH_FIELDS:
+		field_tokens = tokenize(row.get(field))
+		if field == "description":
+			field_tokens = field_tokens[:MAX_DESCRIPTION_TOKENS]
+		tokens.update(field_tokens)
+	return tokens
+
+
+def _prefix_keys(row):
+	keys = set()
+	for token in _row_tokens(row):
+		for length in range(MIN_PREFIX_LENGTH, min(len(token), MAX_PREFIX_LENGTH) + 1):
+			keys.add(_prefix_key(token[:length]))
+	return keys
+
+
+def _trigram_keys(row):
+	keys = set()
+	for field in TYPO_FIELDS:
+		for token in tokenize(row.get(field)):
+			keys.update(make_key(f"{KEY_PREFIX}tri:{trigram}") for trigram in trigrams(token))
+	return keys
+
+
+def _prefix_key(prefix):
+	return make_key(f"{KEY_PREFIX}prefix:{prefix}")
+
+
+def _add_postings(pipe, name, row):
+	for key in _prefix_keys(row):
+		pipe.zadd(key, {name: 0})
+	for key in _trigram_keys(row):
+		pipe.sadd(key, name)
+	pipe.hset(make_key(DOCS_KEY), name, _dump(row))
+
+
+def _remove_postings(pipe, name, row):
+	if row is None:
+		return
+	for key in _prefix_keys(row):
+		pipe.zrem(key, name)
+	for key in _trigram_keys(row):
+		pipe.srem(key, name)
+	pipe.hdel(make_key(DOCS_KEY), name)
+
+
+def _prefix_matches(tokens, limit):
+	indexed = {token[:MAX_PREFIX_LENGTH] for token in tokens if len(token) >= MIN_PREFIX_LENGTH}
+	if not indexed:
+		return []
+
+	# Postings cover MIN_PREFIX_LENGTH..MAX_PREFIX_LENGTH, so confirm other tokens against the stored rows
+	unindexed = [token for token in tokens if token not in indexed]
+	count = limit * VERIFY_FACTOR if unindexed else limit
+
+	client = get_redis()
+	keys = [_prefix_key(prefix) for prefix in indexed]
+	if len(keys) == 1:
+		names = client.zrange(keys[0], 0, count - 1)
+	else:
+		scratch_key = make_key(f"{KEY_PREFIX}scratch:{frappe.generate_hash(length=12)}")
+		pipe = client.pipeline()
+		pipe.zinterstore(scratch_key, keys)
+		pipe.zrange(scratch_key, 0, count - 1)
+		pipe.delete(scratch_key)
+		names = pipe.execute()[1]
+	names = [_decode(name) for name in names]
+	if not unindexed:
+		return names
+
+	matches = []
+	for name, row in zip(names, _get_stored_rows(names), strict=True):
+		row_tokens = _row_tokens(row or {})
+		if all(any(t.startswith(token) for t in row_tokens) for token in unindexed):
+			matches.append(name)
+			if len(matches) == limit:
+				break
+	return matches
+
+
+def _trigram_matches(tokens, limit):
+	query_trigrams = set()
+	for token in tokens:
+		query_trigrams.update(trigrams(token))
+
+	min_score = max(2, math.ceil(len(query_trigrams) * MIN_TRIGRAM_SCORE))
+	scratch_key = make_key(f"{KEY_PREFIX}scratch:{frappe.generate_hash(length=12)}")
+
+	pipe = get_redis().pipeline()
+	pipe.zunionstore(scratch_key, [make_key(f"{KEY_PREFIX}tri:{trigram}") for trigram in query_trigrams])
+	pipe.zrevrangebyscore(scratch_key, "+inf", min_score, start=0, num=limit)
+	pipe.delete(scratch_key)
+	return [_decode(name) for name in pipe.execute()[1]]
+
+
+def _load_rows(names):
+	return [row for row in _get_stored_rows(names) if row is not None]
+
+
+def _get_stored_row(name):
+	return _get_stored_rows([name])[0]
+
+
+def _get_stored_rows(names):
+	if not names:
+		return []
+	payloads = get_redis().hmget(make_key(DOCS_KEY), names)
+	return [json.loads(payload) if payload is not None else None for payload in payloads]
+
+
+def _dump(row):
+	return json.dumps({field: row.get(field) for field in VENDOR_FIELDS}, separators=(",", ":"), default=str)
+
+
+def _decode(value):
+	return value.decode() if isinstance(value, bytes) else value
@@ -0,0 +1,124 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Serialized snapshot of the vendor directory kept in the Redis cache.
+
+Reads are served from a single JSON blob. Writes to Vendor bump a generation
+counter after commit and either patch the blob in place or drop it, so a
+rebuild that raced with a write can never be stored over newer data.
+"""
+
+import bisect
+import json
+
+import frappe
+import redis
+from vendor_manager.cache import get_redis, make_key
+
+VENDOR_FIELDS = ["vendor_name", "type", "email", "phone", "status", "description"]
+
+SNAPSHOT_KEY = "lexicon:vendor_directory"
+GENERATION_KEY = "lexicon:vendor_directory:generation"
+SNAPSHOT_TTL = 24 * 60 * 60
+
+
+def get_vendor_directory():
+	"""Return all vendors ordered by vendor_name, from Redis when possible"""
+	payload = get_redis().get(make_key(SNAPSHOT_KEY))
+	if payload is not None:
+		return json.loads(payload)
+
+	return rebuild_snapshot()
+
+
+def rebuild_snapshot():
+	"""Load the directory from the database and store it unless a write happened meanwhile"""
+	generation = _get_generation()
+	rows = directory_query().run(as_dict=True)
+	_store_if_generation(rows, generation)
+	return rows
+
+
+def directory_query():
+	return frappe.qb.get_query("Vendor", fields=VENDOR_FIELDS, order_by="vendor_name asc, name asc")
+
+
+def patch_vendor(row, old_name=None):
+	"""
+	Replace (or insert) one vendor row in the cached snapshot.
+
+	Called after commit. Falls back to dropping the snapshot if another
+	writer touched it concurrently.
+	"""
+	_patch(lambda rows: _upsert(_remove(rows, old_name or row["vendor_name"]), row))
+
+
+def remove_vendor(vendor_name):
+	"""Drop one vendor row from the cached snapshot. Called after commit."""
+	_patch(lambda rows: _remove(rows, vendor_name))
+
+
+def invalidate():
+	"""Discard the snapshot; the next read rebuilds it from the database"""
+	with get_redis().pipeline() as pipe:
+		pipe.incr(make_key(GENERATION_KEY))
+		pipe.delete(make_key(SNAPSHOT_KEY))
+		pipe.execute()
+
+
+def vendor_row(doc):
+	return {field: doc.get(field) for field in VENDOR_FIELDS}
+
+
+def _patch(apply):
+	snapshot_key, generation_key = make_key(SNAPSHOT_KEY), make_key(GENERATION_KEY)
+	with get_redis().pipeline() as pipe:
+		try:
+			pipe.watch(snapshot_key, generation_key)
+			payload = pipe.get(snapshot_key)
+			pipe.multi()
+			pipe.incr(generation_key)
+			if payload is not None:
+				rows = apply(json.loads(payload))
+				pipe.set(snapshot_key, _dump(rows), ex=SNAPSHOT_TTL)
+			pipe.execute()
+		except redis.WatchError:
+			invalidate()
+
+
+def _store_if_generation(rows, generation):
+	snapshot_key, generation_key = make_key(SNAPSHOT_KEY), make_key(GENERATION_KEY)
+	with get_redis().pipeline() as pipe:
+		try:
+			pipe.watch(generation_key)
+			if _int(pipe.get(generation_key)) != generation:
+				return
+			pipe.multi()
+			pipe.set(snapshot_key, _dump(rows), ex=SNAPSHOT_TTL)
+			pipe.execute()
+		except redis.WatchError:
+			pass
+
+
+def _remove(rows, vendor_name):
+	return [row for row in rows if row["vendor_name"] != vendor_name]
+
+
+def _upsert(rows, row):
+	# casefold approximates the case-insensitive collation the database sorts with
+	keys = [(r["vendor_name"] or "").casefold() for r in rows]
+	rows.insert(bisect.bisect_right(keys, (row["vendor_name"] or "").casefold()), row)
+	return rows
+
+
+def _get_generation():
+	return _int(get_redis().get(make_key(GENERATION_KEY)))
+
+
+def _int(value):
+	return int(value) if value is not None else 0
+
+
+def _dump(rows):
+	return json.dumps(rows, separators=(",", ":"), default=str)
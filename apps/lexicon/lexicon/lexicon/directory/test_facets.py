@@ -0,0 +1,39 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from lexicon.lexicon.directory import facets
+
+
+class TestVendorFacets(FrappeTestCase):
+	def setUp(self):
+		facets.reconcile()
+
+	def tearDown(self):
+		facets.reconcile()
+
+	def test_counts_match_table(self):
+		result = facets.get_facets()
+		self.assertEqual(result["total"], frappe.db.count("Vendor"))
+		for vendor_type, count in result["type"].items():
+			self.assertEqual(count, frappe.db.count("Vendor", {"type": vendor_type or ("is", "not set")}))
+
+	def test_filtered_counts(self):
+		active = facets.get_facets(status="Active")
+		self.assertEqual(active["total"], frappe.db.count("Vendor", {"status": "Active"}))
+		# the status facet itself is not narrowed by its own filter
+		self.assertEqual(active["status"], facets.get_facets()["status"])
+
+	def test_apply_change(self):
+		before = facets.get_facets()
+		facets.apply_change(new={"type": "Partner", "status": "Inactive"})
+		facets.apply_change(
+			old={"type": "Partner", "status": "Inactive"}, new={"type": "Supplier", "status": "Inactive"}
+		)
+
+		after = facets.get_facets()
+		self.assertEqual(after["total"], before["total"] + 1)
+		self.assertEqual(after["type"].get("Partner", 0), before["type"].get("Partner", 0))
+		self.assertEqual(after["type"].get("Supplier", 0), before["type"].get("Supplier", 0) + 1)
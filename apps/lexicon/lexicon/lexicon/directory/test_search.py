@@ -0,0 +1,54 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+from frappe.tests.utils import FrappeTestCase
+
+from lexicon.lexicon.directory import search
+
+TEST_ROW = {
+	"vendor_name": "_Test Quantum Logistics",
+	"type": "Distributor",
+	"email": "orders@quantumlogistics.example",
+	"phone": None,
+	"status": "Active",
+	"description": "Cold chain freight forwarding",
+}
+
+
+class TestVendorSearch(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		search.rebuild_index()
+		search.index_vendor(TEST_ROW)
+
+	@classmethod
+	def tearDownClass(cls):
+		search.remove_vendor(TEST_ROW["vendor_name"])
+		super().tearDownClass()
+
+	def assertFound(self, query):
+		names = [row["vendor_name"] for row in search.search(query)["results"]]
+		self.assertIn(TEST_ROW["vendor_name"], names, query)
+
+	def test_prefix_match(self):
+		self.assertFound("quan")
+		self.assertFound("quantum log")
+		self.assertFound("freig")
+		self.assertFound("quantumlogistics")
+		# one-character tokens are checked against the rows found for the longer ones
+		self.assertFound("quantum l")
+
+	def test_typo_tolerance(self):
+		self.assertFound("quantm logistcs")
+
+	def test_type_has_no_trigram_postings(self):
+		# every vendor shares the few type values; their trigram sets would span the table
+		self.assertEqual(search._trigram_keys({"type": TEST_ROW["type"]}), set())
+		self.assertFound("distributor")
+
+	def test_reindex_drops_old_postings(self):
+		search.index_vendor(dict(TEST_ROW, description="Bulk grain"))
+		names = [row["vendor_name"] for row in search.search("freight")["results"]]
+		self.assertNotIn(TEST_ROW["vendor_name"], names)
+		search.index_vendor(TEST_ROW)
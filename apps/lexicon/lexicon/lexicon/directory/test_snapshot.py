@@ -0,0 +1,61 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from vendor_manager.cache import get_redis, make_key
+
+from lexicon.lexicon.directory import snapshot
+
+
+class TestVendorDirectorySnapshot(FrappeTestCase):
+	def setUp(self):
+		snapshot.invalidate()
+
+	def tearDown(self):
+		snapshot.invalidate()
+
+	def test_snapshot_matches_database(self):
+		expected = frappe.get_all(
+			"Vendor", fields=snapshot.VENDOR_FIELDS, order_by="vendor_name asc, name asc"
+		)
+		self.assertEqual(snapshot.get_vendor_directory(), expected)
+		# second read is served from Redis
+		self.assertIsNotNone(get_redis().get(make_key(snapshot.SNAPSHOT_KEY)))
+		self.assertEqual(snapshot.get_vendor_directory(), expected)
+
+	def test_patch_and_remove(self):
+		snapshot.get_vendor_directory()
+		row = {field: None for field in snapshot.VENDOR_FIELDS}
+		row.update(vendor_name="_Test Snapshot Vendor", type="Partner", status="Active")
+
+		snapshot.patch_vendor(row)
+		self.assertIn(row, snapshot.get_vendor_directory())
+
+		snapshot.patch_vendor(dict(row, vendor_name="_Test Snapshot Vendor 2"), old_name=row["vendor_name"])
+		names = [r["vendor_name"] for r in snapshot.get_vendor_directory()]
+		self.assertNotIn("_Test Snapshot Vendor", names)
+		self.assertIn("_Test Snapshot Vendor 2", names)
+
+		snapshot.remove_vendor("_Test Snapshot Vendor 2")
+		names = [r["vendor_name"] for r in snapshot.get_vendor_directory()]
+		self.assertNotIn("_Test Snapshot Vendor 2", names)
+
+	def test_editing_vendor_name_replaces_row(self):
+		vendor = frappe.get_doc({"doctype": "Vendor", "vendor_name": "_Test Snapshot Edit"}).insert()
+		self.addCleanup(frappe.delete_doc, "Vendor", vendor.name, force=True)
+		frappe.db.after_commit.run()
+		snapshot.get_vendor_directory()
+
+		vendor.vendor_name = "_Test Snapshot Edited"
+		vendor.save()
+		frappe.db.after_commit.run()
+		names = [r["vendor_name"] for r in snapshot.get_vendor_directory()]
+		self.assertNotIn("_Test Snapshot Edit", names)
+		self.assertIn("_Test Snapshot Edited", names)
+
+	def test_stale_rebuild_is_discarded(self):
+		generation = snapshot._get_generation()
+		snapshot.invalidate()
+		snapshot._store_if_generation([], generation)
+		self.assertIsNone(get_redis().get(make_key(snapshot.SNAPSHOT_KEY)))
@@ -0,0 +1,48 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+from frappe.tests.utils import FrappeTestCase
+
+from lexicon.lexicon.directory.wire import from_columnar, shape_response, to_columnar
+
+ROWS = [
+	{
+		"vendor_name": "Acme",
+		"type": "Supplier",
+		"email": "a@x.io",
+		"phone": None,
+		"status": "Active",
+		"description": "",
+	},
+	{
+		"vendor_name": "Globex",
+		"type": "Partner",
+		"email": None,
+		"phone": "1",
+		"status": "Active",
+		"description": "g",
+	},
+	{
+		"vendor_name": "Initech",
+		"type": "Supplier",
+		"email": None,
+		"phone": None,
+		"status": "Inactive",
+		"description": None,
+	},
+]
+
+
+class TestVendorWireFormat(FrappeTestCase):
+	def test_columnar_round_trip(self):
+		block = to_columnar(ROWS)
+		self.assertEqual(block["dictionaries"]["type"], ["Supplier", "Partner"])
+		self.assertEqual(block["data"][block["columns"].index("type")], [0, 1, 0])
+		self.assertEqual(from_columnar(block), ROWS)
+
+	def test_records_is_default(self):
+		self.assertIs(shape_response(ROWS), ROWS)
+		payload = {"vendors": ROWS, "next_cursor": "abc"}
+		shaped = shape_response(payload, format="columnar")
+		self.assertEqual(shaped["next_cursor"], "abc")
+		self.assertEqual(from_columnar(shaped["vendors"]), ROWS)
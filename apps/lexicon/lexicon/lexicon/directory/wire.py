@@ -0,0 +1,102 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Compact wire formats for vendor listings.
+
+The default "records" format is a list of dicts. The "columnar" format sends
+the column names once and one array per column; the low-cardinality Select
+columns are dictionary-encoded as small integer codes into a per-response
+dictionary:
+
+	{
+		"columns": ["vendor_name", "type", ...],
+		"length": 2,
+		"dictionaries": {"type": ["Supplier", "Partner"], "status": ["Active"]},
+		"data": [["Acme", "Globex"], [0, 1], ...]
+	}
+
+Either format can be sent as JSON (default) or msgpack for API clients.
+"""
+
+import frappe
+from frappe import _
+from werkzeug.wrappers import Response
+
+from lexicon.lexicon.directory.snapshot import VENDOR_FIELDS
+
+FORMATS = ("records", "columnar")
+ENCODINGS = ("json", "msgpack")
+DICTIONARY_COLUMNS = ("type", "status")
+
+
+def to_columnar(rows, columns=VENDOR_FIELDS):
+	data = []
+	dictionaries = {}
+	for column in columns:
+		values = [row.get(column) for row in rows]
+		if column in DICTIONARY_COLUMNS:
+			dictionaries[column], values = _dictionary_encode(values)
+		data.append(values)
+
+	return {"columns": list(columns), "length": len(rows), "dictionaries": dictionaries, "data": data}
+
+
+def from_columnar(block):
+	"""Inverse of to_columnar, mainly for Python API clients and tests"""
+	columns = []
+	for column, values in zip(block["columns"], block["data"], strict=True):
+		dictionary = block["dictionaries"].get(column)
+		columns.append([dictionary[code] for code in values] if dictionary is not None else values)
+	return (
+		[dict(zip(block["columns"], row, strict=True)) for row in zip(*columns, strict=True)]
+		if columns
+		else []
+	)
+
+
+def shape_response(payload, format=None, encoding=None, rows_key="vendors"):
+	"""
+	Apply the requested wire format to a listing response.
+
+	`payload` is either a list of rows or a dict holding the rows under
+	`rows_key`; other keys of a dict payload are passed through untouched.
+	"""
+	format = format or "records"
+	encoding = encoding or "json"
+	if format not in FORMATS:
+		frappe.throw(_("Unsupported format {0}").format(format))
+	if encoding not in ENCODINGS:
+		frappe.throw(_("Unsupported encoding {0}").format(encoding))
+
+	if format == "columnar":
+		if isinstance(payload, list):
+			payload = to_columnar(payload)
+		else:
+			payload = dict(payload, **{rows_key: to_columnar(payload[rows_key])})
+
+	if encoding == "msgpack":
+		return _msgpack_response(payload)
+
+	return payload
+
+
+def _dictionary_encode(values):
+	dictionary, codes, index = [], [], {}
+	for value in values:
+		code = index.get(value)
+		if code is None:
+			code = index[value] = len(dictionary)
+			dictionary.append(value)
+		codes.append(code)
+	return dictionary, codes
+
+
+def _msgpack_response(payload):
+	try:
+		import msgpack
+	except ImportError:
+		frappe.throw(_("msgpack encoding is not available on this server"))
+
+	body = msgpack.packb({"message": payload}, default=str, use_bin_type=True)
+	return Response(body, mimetype="application/msgpack")
@@ -0,0 +1,63 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from lexicon.lexicon.directory import changes, snapshot
+from lexicon.lexicon.page.vendors.vendors import get_vendors, get_vendors_page
+
+TEST_VENDORS = [f"_Test Paged Vendor {i:02d}" for i in range(7)]
+
+
+class TestVendorsPage(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		for vendor_name in TEST_VENDORS:
+			if not frappe.db.exists("Vendor", vendor_name):
+				frappe.get_doc(
+					{"doctype": "Vendor", "vendor_name": vendor_name, "type": "Supplier", "status": "Active"}
+				).insert(ignore_permissions=True)
+
+	def test_keyset_pages_cover_directory_in_order(self):
+		seen = []
+		cursor = None
+		while True:
+			page = get_vendors_page(page_size=3, cursor=cursor)
+			self.assertLessEqual(len(page["vendors"]), 3)
+			seen.extend(v.vendor_name for v in page["vendors"])
+			cursor = page["next_cursor"]
+			if not cursor:
+				break
+
+		expected = frappe.get_all("Vendor", pluck="vendor_name", order_by="vendor_name asc, name asc")
+		self.assertEqual(seen, expected)
+		self.assertTrue(set(TEST_VENDORS).issubset(seen))
+
+	def test_invalid_cursor(self):
+		self.assertRaises(frappe.ValidationError, get_vendors_page, cursor="not-a-cursor")
+
+	def test_delta_since_watermark(self):
+		watermark = get_vendors_page(page_size=1)["watermark"]
+
+		vendor = frappe.get_doc("Vendor", TEST_VENDORS[0])
+		vendor.description = "Updated for delta sync"
+		vendor.save(ignore_permissions=True)
+		changes.record_tombstone("_Test Deleted Vendor")
+
+		delta = get_vendors(since=watermark)
+		self.assertEqual(delta["full"], 0)
+		self.assertIn(TEST_VENDORS[0], [v.vendor_name for v in delta["vendors"]])
+		self.assertIn("_Test Deleted Vendor", delta["deleted"])
+
+	def test_delta_older_than_floor_is_full(self):
+		snapshot.invalidate()
+		delta = get_vendors(since="2000-01-01 00:00:00")
+		self.assertEqual(delta["full"], 1)
+		self.assertEqual(len(delta["vendors"]), frappe.db.count("Vendor"))
+
+	def test_invalid_since_is_full(self):
+		delta = get_vendors(since="not-a-watermark")
+		self.assertEqual(delta["full"], 1)
+		self.assertEqual(len(delta["vendors"]), frappe.db.count("Vendor"))
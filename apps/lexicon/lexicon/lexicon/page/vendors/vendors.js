@@ -5,30 +5,371 @@ frappe.pages["vendors"].on_page_load = function(wrapper) {
         single_column: true
     });
 
-    frappe.call({
-        method: "lexicon.lexicon.page.vendors.vendors.get_vendors",
-        callback: function(r) {
-            if (r.message) {
-                let html = "";
-                r.message.forEach(vendor => {
-                    const statusClass = vendor.status === "Active" ? "success" : "secondary";
-                    html += `
-                        <div class="card p-3 m-2 shadow-sm" style="border-left: 4px solid #007bff">
-                            <h4 class="mb-2">${vendor.vendor_name}</h4>
-                            <p class="mb-1"><strong>Type:</strong> ${vendor.type}</p>
-                            <p class="mb-1"><strong>Email:</strong> ${vendor.email}</p>
-                            <p class="mb-1"><strong>Phone:</strong> ${vendor.phone}</p>
-                            <span class="badge bg-${statusClass}">${vendor.status}</span>
-                        </div>
-                    `;
+    const PAGE_SIZE = 200;
+
+    let $results = $("<div class=\"vendor-search-results\"></div>").appendTo(page.body).hide();
+    let $list = $("<div class=\"vendor-list\"></div>").appendTo(page.body);
+    let $status = $("<div class=\"vendor-list-status\"></div>").appendTo(page.body);
+
+    // Local copy of the pages loaded so far (for the active filters), kept sorted by vendor_name
+    let vendors = [];
+    // Keyset position after the last loaded page; complete once the last page is in
+    let next_cursor = null;
+    let complete = false;
+    let watermark = null;
+    let loading = false;
+    let failed = false;
+    // Bumped on every reset so responses to requests made before it are dropped
+    let generation = 0;
+    const cache = vendor_cache();
+    const list = new lexicon.VendorVirtualList($list[0], render_vendor, load_next_page);
+
+    function render_vendor(vendor) {
+        const statusClass = vendor.status === "Active" ? "success" : "secondary";
+        return `
+            <div class="card p-3 m-2 shadow-sm" style="border-left: 4px solid #007bff">
+                <h4 class="mb-2">${vendor.vendor_name}</h4>
+                <p class="mb-1"><strong>Type:</strong> ${vendor.type}</p>
+                <p class="mb-1"><strong>Email:</strong> ${vendor.email}</p>
+                <p class="mb-1"><strong>Phone:</strong> ${vendor.phone}</p>
+                <span class="badge bg-${statusClass}">${vendor.status}</span>
+            </div>
+        `;
+    }
+
+    function update_status() {
+        if (failed) {
+            $status.html(
+                "<p class=\"text-danger p-3\">Error loading vendors. <a href=\"#\" class=\"vendor-retry\">Retry</a></p>"
+            );
+        } else if (loading) {
+            $status.html(`<p class="text-muted p-3">Loading vendors... (${vendors.length})</p>`);
+        } else if (!vendors.length && complete) {
+            $status.html("<p class=\"text-muted p-3\">No vendors found.</p>");
+        } else {
+            $status.empty();
+        }
+    }
+
+    $status.on("click", ".vendor-retry", function(e) {
+        e.preventDefault();
+        failed = false;
+        load_next_page();
+    });
+
+    let filters = { type: null, status: null };
+
+    function is_filtered() {
+        return Boolean(filters.type || filters.status);
+    }
+
+    // Pages are fetched already filtered; this only hides rows a merged delta moved out of the filter
+    function visible_rows() {
+        if (!is_filtered()) return vendors;
+        return vendors.filter(v =>
+            (!filters.type || v.type === filters.type) && (!filters.status || v.status === filters.status)
+        );
+    }
+
+    function show(rows) {
+        vendors = rows;
+        list.set_rows(visible_rows());
+        update_status();
+    }
+
+    function compare_vendors(a, b) {
+        return (a.vendor_name || "").localeCompare(b.vendor_name || "", undefined, { sensitivity: "base" });
+    }
+
+    // Only the unfiltered directory is kept; the page always opens without filters
+    const save = frappe.utils.debounce(function() {
+        if (is_filtered()) return;
+        cache.put({ watermark: watermark, vendors: vendors, next_cursor: next_cursor, complete: complete });
+    }, 1000);
+
+    function reset() {
+        generation++;
+        loading = failed = false;
+        next_cursor = null;
+        complete = false;
+        watermark = null;
+        show([]);
+    }
+
+    // Fetch the next keyset page; the list calls this when its end scrolls into view
+    function load_next_page() {
+        if (loading || complete || failed) return;
+        loading = true;
+        update_status();
+        const request = generation;
+
+        frappe.call({
+            method: "lexicon.lexicon.page.vendors.vendors.get_vendors_page",
+            args: {
+                page_size: PAGE_SIZE,
+                cursor: next_cursor,
+                format: "columnar",
+                type: filters.type,
+                status: filters.status
+            },
+            callback: function(r) {
+                if (request !== generation) return;
+                const result = r.message || {};
+                if (!next_cursor) watermark = result.watermark;
+                next_cursor = result.next_cursor || null;
+                complete = !next_cursor;
+                loading = false;
+                show(vendors.concat(decode_columnar(result.vendors)));
+                save();
+            },
+            error: function() {
+                if (request !== generation) return;
+                loading = false;
+                failed = true;
+                update_status();
+            }
+        });
+    }
+
+    // Repeat visits: fetch only what changed since the stored watermark and merge it in
+    function sync_changes(since) {
+        frappe.call({
+            method: "lexicon.lexicon.page.vendors.vendors.get_vendors",
+            args: { since: since, format: "columnar" },
+            callback: function(r) {
+                const delta = r.message || {};
+                if (delta.full) {
+                    // The stored copy is too old to patch: start over, a page at a time
+                    reset();
+                    return;
+                }
+
+                delta.vendors = decode_columnar(delta.vendors);
+                watermark = delta.watermark;
+                let by_name = new Map(vendors.map(v => [v.vendor_name, v]));
+                (delta.deleted || []).forEach(name => by_name.delete(name));
+                // Vendors past the last loaded page arrive with the page that covers them
+                const last = vendors.length ? vendors[vendors.length - 1] : null;
+                delta.vendors
+                    .filter(v => complete || (last && compare_vendors(v, last) <= 0))
+                    .forEach(v => by_name.set(v.vendor_name, v));
+
+                show(Array.from(by_name.values()).sort(compare_vendors));
+                save();
+            },
+            error: reset
+        });
+    }
+
+    let search_request = 0;
+    const run_search = frappe.utils.debounce(function(query) {
+        const request = ++search_request;
+        if (!query) {
+            $results.hide().empty();
+            $list.show();
+            $status.show();
+            list.refresh();
+            return;
+        }
+
+        frappe.call({
+            method: "lexicon.lexicon.page.vendors.vendors.search_vendors",
+            args: { query: query, limit: 20 },
+            callback: function(r) {
+                // Ignore responses that arrive after a newer keystroke
+                if (request !== search_request) return;
+                const result = r.message || {};
+                const matches = result.results || [];
+                let html = matches.map(render_vendor).join("");
+                if (!matches.length) {
+                    html = result.indexing
+                        ? "<p class=\"text-muted p-3\">Search index is being built, please try again shortly.</p>"
+                        : "<p class=\"text-muted p-3\">No matching vendors.</p>";
+                }
+                $list.hide();
+                $status.hide();
+                $results.html(html).show();
+            }
+        });
+    }, 150);
+
+    page.add_field({
+        fieldtype: "Data",
+        fieldname: "search",
+        label: "Search vendors",
+        change: function() {
+            run_search((this.get_value() || "").trim());
+        }
+    }).$input.on("input", function() {
+        run_search(($(this).val() || "").trim());
+    });
+
+    // A facet change starts paging over from the first page of the filtered list;
+    // the counts come from the server's counters
+    function make_facet_field(fieldname, label) {
+        return page.add_field({
+            fieldtype: "Select",
+            fieldname: fieldname,
+            label: label,
+            options: [{ label: "All", value: "" }],
+            change: function() {
+                const value = this.get_value() || null;
+                if (value === filters[fieldname]) return;
+                filters[fieldname] = value;
+                reset();
+                refresh_facets();
+            }
+        });
+    }
+
+    const facet_fields = {
+        type: make_facet_field("type", "Type"),
+        status: make_facet_field("status", "Status")
+    };
+
+    function refresh_facets() {
+        frappe.call({
+            method: "lexicon.lexicon.page.vendors.vendors.get_vendor_facets",
+            args: filters,
+            callback: function(r) {
+                const counts = r.message || {};
+                Object.entries(facet_fields).forEach(([fieldname, field]) => {
+                    field.df.options = [{ label: "All", value: "" }].concat(
+                        Object.entries(counts[fieldname] || {})
+                            .filter(([value]) => value)
+                            .map(([value, count]) => ({ label: `${value} (${count})`, value: value }))
+                    );
+                    field.set_options(filters[fieldname] || "");
                 });
-                $(page.body).html(html);
-            } else {
-                $(page.body).html("<p class=\"text-muted p-3\">No vendors found.</p>");
             }
-        },
-        error: function() {
-            $(page.body).html("<p class=\"text-danger p-3\">Error loading vendors.</p>");
+        });
+    }
+
+    refresh_facets();
+
+    cache.get().then(copy => {
+        if (copy && copy.watermark) {
+            watermark = copy.watermark;
+            next_cursor = copy.next_cursor || null;
+            // Copies saved before the page loaded on demand hold the whole directory
+            complete = copy.complete !== false;
+            show(copy.vendors || []);
+            sync_changes(copy.watermark);
+        } else {
+            reset();
         }
     });
 };
+
+frappe.provide("lexicon");
+
+// Windowed list: only the cards in (or near) the viewport exist in the DOM.
+// Cards get a fixed slot height so positions can be computed without measuring.
+// on_near_end is called whenever the end of the rows comes within overscan of the viewport.
+lexicon.VendorVirtualList = class VendorVirtualList {
+    constructor(container, render_row, on_near_end = null, row_height = 176, overscan = 6) {
+        this.render_row = render_row;
+        this.on_near_end = on_near_end;
+        this.row_height = row_height;
+        this.overscan = overscan;
+        this.rows = [];
+        this.first = -1;
+        this.last = -1;
+
+        this.container = container;
+        this.container.style.position = "relative";
+        this.viewport = document.createElement("div");
+        this.container.appendChild(this.viewport);
+
+        this.schedule = this.schedule.bind(this);
+        window.addEventListener("scroll", this.schedule, { passive: true });
+        window.addEventListener("resize", this.schedule);
+    }
+
+    set_rows(rows) {
+        this.rows = rows;
+        this.first = this.last = -1;
+        this.schedule();
+    }
+
+    refresh() {
+        this.first = this.last = -1;
+        this.schedule();
+    }
+
+    schedule() {
+        if (this.frame) return;
+        this.frame = requestAnimationFrame(() => {
+            this.frame = null;
+            this.draw();
+        });
+    }
+
+    draw() {
+        this.container.style.height = `${this.rows.length * this.row_height}px`;
+        if (!this.container.offsetParent) return;
+
+        // Offset of the list top relative to the viewport top
+        const top = this.container.getBoundingClientRect().top;
+        const first = Math.max(0, Math.floor(-top / this.row_height) - this.overscan);
+        const last = Math.min(
+            this.rows.length,
+            Math.ceil((window.innerHeight - top) / this.row_height) + this.overscan
+        );
+        if (this.on_near_end && last >= this.rows.length) this.on_near_end();
+        if (first === this.first && last === this.last) return;
+        this.first = first;
+        this.last = last;
+
+        let html = "";
+        for (let i = first; i < last; i++) {
+            html += `<div style="position: absolute; left: 0; right: 0; top: ${i * this.row_height}px;
+                height: ${this.row_height}px; overflow: hidden">${this.render_row(this.rows[i])}</div>`;
+        }
+        this.viewport.innerHTML = html;
+    }
+};
+
+// Per-user copy of the directory in IndexedDB (too large for localStorage on big sites)
+function vendor_cache() {
+    const key = `${frappe.boot.sitename}:${frappe.session.user}`;
+    const store_name = "vendor_directory";
+
+    const db = new Promise(resolve => {
+        if (!window.indexedDB) return resolve(null);
+        const request = indexedDB.open("lexicon", 1);
+        request.onupgradeneeded = () => request.result.createObjectStore(store_name);
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => resolve(null);
+    });
+
+    function run(mode, fn) {
+        return db.then(conn => new Promise(resolve => {
+            if (!conn) return resolve(null);
+            const request = fn(conn.transaction(store_name, mode).objectStore(store_name));
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => resolve(null);
+        }));
+    }
+
+    return {
+        get: () => run("readonly", store => store.get(key)),
+        put: value => run("readwrite", store => store.put(value, key))
+    };
+}
+
+// Expand a columnar block ({columns, length, dictionaries, data}) back into row objects
+function decode_columnar(block) {
+    if (!block) return [];
+    let rows = new Array(block.length);
+    for (let i = 0; i < block.length; i++) rows[i] = {};
+
+    block.columns.forEach((column, c) => {
+        const values = block.data[c];
+        const dictionary = block.dictionaries[column];
+        for (let i = 0; i < block.length; i++) {
+            rows[i][column] = dictionary ? dictionary[values[i]] : values[i];
+        }
+    });
+    return rows;
+}
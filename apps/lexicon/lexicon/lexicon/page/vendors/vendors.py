@@ -1,10 +1,167 @@
+import base64
+import json
+
 import frappe
+from frappe import _
+
+from lexicon.lexicon.directory import changes, facets, search
+from lexicon.lexicon.directory.snapshot import VENDOR_FIELDS, get_vendor_directory
+from lexicon.lexicon.directory.wire import shape_response
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_SEARCH_RESULTS = 50
+
+
+@frappe.whitelist()
+def get_vendors(since=None, format=None, encoding=None):
+	"""
+	Fetch vendors from the cached directory snapshot (rebuilt from Vendor on a miss).
+
+	With `since` (a watermark returned by an earlier call), only vendors
+	inserted or updated after it are returned along with tombstones for
+	deleted/renamed ones; see lexicon.lexicon.directory.changes.get_changes.
+
+	`format="columnar"` and `encoding="msgpack"` opt into the compact wire
+	formats described in lexicon.lexicon.directory.wire.
+	"""
+	if since is not None:
+		return shape_response(changes.get_changes(since), format, encoding)
+
+	return shape_response(get_vendor_directory(), format, encoding)
+
 
 @frappe.whitelist()
-def get_vendors():
-    """Fetch vendors from Vendor doctype"""
-    return frappe.get_all(
-        'Vendor',
-        fields=['vendor_name', 'type', 'email', 'phone', 'status', 'description'],
-        order_by='vendor_name asc'
-    )
+def get_vendors_page(
+	page_size=DEFAULT_PAGE_SIZE, cursor=None, format=None, encoding=None, type=None, status=None
+):
+	"""
+	Fetch one page of vendors ordered by vendor_name using keyset pagination.
+
+	Seeks past the last row of the previous page instead of using OFFSET, so
+	every page costs the same regardless of how deep the client has scrolled.
+
+	Args:
+	    page_size (int): Number of vendors to return (capped at MAX_PAGE_SIZE)
+	    cursor (str): Opaque cursor returned as `next_cursor` by the previous call
+	    format (str): "records" (default) or "columnar"
+	    encoding (str): "json" (default) or "msgpack"
+	    type (str): Only vendors of this type
+	    status (str): Only vendors with this status
+
+	Returns:
+	    dict: {"vendors": [...], "next_cursor": str or None}
+	    The first page (no cursor) also carries a `watermark` to pass as
+	    `since` to get_vendors once the client has every page.
+	"""
+	page_size = min(max(frappe.utils.cint(page_size) or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+	query = vendor_page_query(page_size, decode_cursor(cursor) if cursor else None, type=type, status=status)
+
+	# Taken before reading so changes made while the client pages are replayed by the delta
+	watermark = None if cursor else changes.get_changes_watermark()
+	vendors = query.run(as_dict=True)
+
+	next_cursor = None
+	if len(vendors) > page_size:
+		vendors = vendors[:page_size]
+		next_cursor = encode_cursor(vendors[-1].vendor_name, vendors[-1].name)
+
+	for vendor in vendors:
+		vendor.pop("name", None)
+
+	result = {"vendors": vendors, "next_cursor": next_cursor}
+	if watermark:
+		result["watermark"] = watermark
+	return shape_response(result, format, encoding)
+
+
+def vendor_page_query(page_size, after=None, type=None, status=None):
+	"""
+	Keyset query behind get_vendors_page; fetches one row more than
+	`page_size` to tell whether another page follows.
+
+	Args:
+	    after (tuple): (vendor_name, name) of the last row of the previous page
+	"""
+	Vendor = frappe.qb.DocType("Vendor")
+	query = (
+		frappe.qb.from_(Vendor)
+		.select(Vendor.name, *[Vendor[field] for field in VENDOR_FIELDS])
+		.orderby(Vendor.vendor_name)
+		.orderby(Vendor.name)
+		.limit(page_size + 1)
+	)
+
+	if type:
+		query = query.where(Vendor.type == type)
+	if status:
+		query = query.where(Vendor.status == status)
+
+	if after:
+		after_vendor_name, after_name = after
+		query = query.where(
+			(Vendor.vendor_name > after_vendor_name)
+			| ((Vendor.vendor_name == after_vendor_name) & (Vendor.name > after_name))
+		)
+	return query
+
+
+def get_query_plan_checks():
+	"""
+	Queries behind the endpoints above, EXPLAINed by vendor_manager.indexes.check_query_plans.
+
+	The full directory read behind get_vendors (snapshot.directory_query) is left
+	out: it scans every row by design, runs only on a snapshot miss, and would
+	always fail the check on a table large enough to be checked.
+	"""
+	after = ("M", "M")
+	return [
+		("get_vendors since", changes.changes_query(frappe.utils.add_days(frappe.utils.now_datetime(), -1))),
+		("get_vendors_page", vendor_page_query(DEFAULT_PAGE_SIZE)),
+		("get_vendors_page after cursor", vendor_page_query(DEFAULT_PAGE_SIZE, after)),
+		(
+			"get_vendors_page by status and type",
+			vendor_page_query(DEFAULT_PAGE_SIZE, after, type="Supplier", status="Active"),
+		),
+		("get_vendors_page by type", vendor_page_query(DEFAULT_PAGE_SIZE, after, type="Partner")),
+		("get_vendors_page by status", vendor_page_query(DEFAULT_PAGE_SIZE, after, status="Active")),
+	]
+
+
+@frappe.whitelist()
+def get_vendor_facets(type=None, status=None):
+	"""
+	Vendor counts per type and per status, served from materialized counters.
+
+	Type counts honour the `status` filter and status counts honour the
+	`type` filter, matching what get_vendors_page returns for those filters.
+	"""
+	return facets.get_facets(type=type or None, status=status or None)
+
+
+@frappe.whitelist()
+def search_vendors(query, limit=20):
+	"""
+	Type-ahead search over vendor_name, type, email and description.
+
+	Served entirely from the Redis search index; while the index is being
+	(re)built the response carries `indexing: True` and no results.
+	"""
+	limit = min(max(frappe.utils.cint(limit) or 20, 1), MAX_SEARCH_RESULTS)
+	return search.search(query, limit=limit)
+
+
+def encode_cursor(vendor_name, name):
+	"""Build the opaque cursor pointing just after the given vendor"""
+	payload = json.dumps([vendor_name, name], separators=(",", ":")).encode()
+	return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+	"""Return (vendor_name, name) from a cursor built by encode_cursor"""
+	try:
+		padded = cursor + "=" * (-len(cursor) % 4)
+		vendor_name, name = json.loads(base64.urlsafe_b64decode(padded.encode()))
+		return str(vendor_name), str(name)
+	except Exception:
+		frappe.throw(_("Invalid vendor cursor"), frappe.ValidationError)
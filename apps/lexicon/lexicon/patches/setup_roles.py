@@ -1,314 +1,33 @@
 import frappe
-from frappe import _
-from frappe.permissions import add_permission, update_permission_property
+from vendor_manager.roles import format_diff, has_changes, sync
 
-def execute():
-    """
-    Automatic setup of roles and permissions for Lexicon and Vendor Manager apps.
-    This patch creates roles and assigns DocType permissions.
-    """
-
-    # Step 1: Create or update roles
-    create_or_update_role(
-        role_name="Lexicon User",
-        desk_access=True,
-        description="Can access Lexicon vendor directory"
-    )
-
-    create_or_update_role(
-        role_name="Vendor Manager User",
-        desk_access=True,
-        description="Can access Vendor Manager (Vendors and Waitlist)"
-    )
-
-    # Step 2: Set module restrictions
-    set_module_roles("Lexicon", ["Lexicon User", "System Manager"])
-    set_module_roles("Vendor Manager", ["Vendor Manager User", "System Manager"])
-
-    # Step 3: Assign Page permissions
-    assign_page_permission("vendors", "Lexicon User")
-
-    # Step 4: Assign DocType permissions
-
-    # Lexicon User: NO direct DocType permissions on Vendor
-    # They access vendors ONLY through the whitelisted vendors.py get_vendors() function
-    # This prevents them from accessing /app/vendor list view
-    remove_doctype_permission("Vendor", "Lexicon User")
-
-    # Vendor Manager User permissions on Vendor doctype
-    assign_doctype_permissions(
-        doctype="Vendor",
-        role="Vendor Manager User",
-        permissions={
-            "read": 1,
-            "write": 1,
-            "create": 1,
-            "delete": 1,
-            "submit": 0,
-            "cancel": 0,
-            "amend": 0
-        }
-    )
-
-    # Vendor Manager User permissions on Waitlist doctype
-    assign_doctype_permissions(
-        doctype="Waitlist",
-        role="Vendor Manager User",
-        permissions={
-            "read": 1,
-            "write": 1,
-            "create": 1,
-            "delete": 1,
-            "submit": 0,
-            "cancel": 0,
-            "amend": 0
-        }
-    )
-
-    # Step 5: Commit changes
-    frappe.db.commit()
-
-    # Step 6: Log confirmation
-    frappe.logger().info("✅ Roles and permissions setup completed successfully")
-    print("✅ Roles created/updated: Lexicon User, Vendor Manager User")
-    print("✅ Module restrictions applied")
-    print("✅ Page permissions assigned")
-    print("✅ DocType permissions assigned for Vendor and Waitlist")
-    print("✅ Setup complete!")
-
-
-def create_or_update_role(role_name, desk_access, description=None):
-    """
-    Create a new role or update existing role.
-    Idempotent: Won't duplicate if role already exists.
-    Note: description parameter is kept for backwards compatibility but not used.
-    """
-    if frappe.db.exists("Role", role_name):
-        # Role exists, update it using db.set_value to avoid validation issues
-        frappe.db.set_value("Role", role_name, "desk_access", desk_access)
-        frappe.db.set_value("Role", role_name, "disabled", 0)
-        frappe.logger().info(f"Updated role: {role_name}")
-        print(f"✓ Updated role: {role_name}")
-    else:
-        # Create new role
-        role = frappe.get_doc({
-            "doctype": "Role",
-            "role_name": role_name,
-            "desk_access": desk_access,
-            "disabled": 0
-        })
-        role.insert(ignore_permissions=True)
-        frappe.logger().info(f"Created role: {role_name}")
-        print(f"✓ Created role: {role_name}")
-
-
-def assign_doctype_permissions(doctype, role, permissions):
-    """
-    Assign permissions to a role for a specific doctype.
-    Idempotent: Won't duplicate permissions if they already exist.
-
-    Args:
-        doctype (str): Name of the DocType
-        role (str): Name of the Role
-        permissions (dict): Dictionary of permission flags
-    """
-    # Check if DocType exists
-    if not frappe.db.exists("DocType", doctype):
-        frappe.logger().warning(f"DocType {doctype} does not exist. Skipping permissions.")
-        print(f"⚠ Warning: DocType {doctype} not found. Skipping.")
-        return
-
-    # Check if permission already exists
-    existing_permission = frappe.db.get_value(
-        "Custom DocPerm",
-        {
-            "parent": doctype,
-            "role": role
-        },
-        "name"
-    )
-
-    if existing_permission:
-        # Update existing permission
-        perm = frappe.get_doc("Custom DocPerm", existing_permission)
-        perm.read = permissions.get("read", 0)
-        perm.write = permissions.get("write", 0)
-        perm.create = permissions.get("create", 0)
-        perm.delete = permissions.get("delete", 0)
-        perm.submit = permissions.get("submit", 0)
-        perm.cancel = permissions.get("cancel", 0)
-        perm.amend = permissions.get("amend", 0)
-        perm.save(ignore_permissions=True)
-        frappe.logger().info(f"Updated permissions for {role} on {doctype}")
-        print(f"✓ Updated permissions: {role} → {doctype}")
-    else:
-        # Add new permission using Frappe's add_permission function
-        try:
-            add_permission(
-                doctype=doctype,
-                role=role,
-                permlevel=0
-            )
-
-            # Update the permission properties
-            update_permission_property(
-                doctype=doctype,
-                role=role,
-                permlevel=0,
-                ptype="read",
-                value=permissions.get("read", 0)
-            )
-            update_permission_property(
-                doctype=doctype,
-                role=role,
-                permlevel=0,
-                ptype="write",
-                value=permissions.get("write", 0)
-            )
-            update_permission_property(
-                doctype=doctype,
-                role=role,
-                permlevel=0,
-                ptype="create",
-                value=permissions.get("create", 0)
-            )
-            update_permission_property(
-                doctype=doctype,
-                role=role,
-                permlevel=0,
-                ptype="delete",
-                value=permissions.get("delete", 0)
-            )
-            update_permission_property(
-                doctype=doctype,
-                role=role,
-                permlevel=0,
-                ptype="submit",
-                value=permissions.get("submit", 0)
-            )
-            update_permission_property(
-                doctype=doctype,
-                role=role,
-                permlevel=0,
-                ptype="cancel",
-                value=permissions.get("cancel", 0)
-            )
-            update_permission_property(
-                doctype=doctype,
-                role=role,
-                permlevel=0,
-                ptype="amend",
-                value=permissions.get("amend", 0)
-            )
-
-            frappe.logger().info(f"Added permissions for {role} on {doctype}")
-            print(f"✓ Added permissions: {role} → {doctype}")
-
-        except Exception as e:
-            frappe.logger().error(f"Error adding permissions for {role} on {doctype}: {str(e)}")
-            print(f"✗ Error adding permissions: {role} → {doctype}: {str(e)}")
 
-
-def set_module_roles(module_name, roles):
-    """
-    Restrict module access to specific roles.
-
-    Args:
-        module_name (str): Name of the Module
-        roles (list): List of role names that should have access
-    """
-    if not frappe.db.exists("Module Def", module_name):
-        frappe.logger().warning(f"Module {module_name} does not exist. Skipping.")
-        print(f"⚠ Warning: Module {module_name} not found. Skipping.")
-        return
-
-    try:
-        module = frappe.get_doc("Module Def", module_name)
-
-        # Clear existing roles
-        module.set("restrict_to_domain", [])
-
-        # Add new roles - Module Def doesn't have a roles child table
-        # Instead, we need to set permissions via Has Role doctype
-        # For now, just log that modules exist
-        frappe.logger().info(f"Module {module_name} configured for roles: {', '.join(roles)}")
-        print(f"✓ Module configured: {module_name}")
-
-    except Exception as e:
-        frappe.logger().error(f"Error configuring module {module_name}: {str(e)}")
-        print(f"✗ Error configuring module: {module_name}: {str(e)}")
-
-
-def assign_page_permission(page_name, role):
-    """
-    Assign permission to a role for accessing a specific page.
-
-    Args:
-        page_name (str): Name of the Page
-        role (str): Name of the Role
-    """
-    if not frappe.db.exists("Page", page_name):
-        frappe.logger().warning(f"Page {page_name} does not exist. Skipping.")
-        print(f"⚠ Warning: Page {page_name} not found. Skipping.")
-        return
-
-    try:
-        page = frappe.get_doc("Page", page_name)
-
-        # Check if role already has permission
-        existing_roles = [r.role for r in page.roles] if hasattr(page, 'roles') and page.roles else []
-
-        if role not in existing_roles:
-            # Add role to page permissions
-            page.append("roles", {
-                "role": role
-            })
-            page.save(ignore_permissions=True)
-            frappe.logger().info(f"Added page permission: {role} → {page_name}")
-            print(f"✓ Page permission added: {role} → {page_name}")
-        else:
-            frappe.logger().info(f"Page permission already exists: {role} → {page_name}")
-            print(f"✓ Page permission exists: {role} → {page_name}")
-
-    except Exception as e:
-        frappe.logger().error(f"Error adding page permission for {role} on {page_name}: {str(e)}")
-        print(f"✗ Error adding page permission: {role} → {page_name}: {str(e)}")
-
-
-def remove_doctype_permission(doctype, role):
-    """
-    Remove all permissions for a specific role on a doctype.
-
-    Args:
-        doctype (str): Name of the DocType
-        role (str): Name of the Role
-    """
-    if not frappe.db.exists("DocType", doctype):
-        frappe.logger().warning(f"DocType {doctype} does not exist. Skipping.")
-        print(f"⚠ Warning: DocType {doctype} not found. Skipping.")
-        return
-
-    try:
-        # Remove from Custom DocPerm
-        frappe.db.sql("""
-            DELETE FROM `tabCustom DocPerm`
-            WHERE parent = %s AND role = %s
-        """, (doctype, role))
-
-        # Remove from standard DocPerm (if exists)
-        frappe.db.sql("""
-            DELETE FROM `tabDocPerm`
-            WHERE parent = %s AND role = %s
-        """, (doctype, role))
-
-        frappe.logger().info(f"Removed all permissions: {role} from {doctype}")
-        print(f"✓ Removed permissions: {role} from {doctype}")
-
-    except Exception as e:
-        frappe.logger().error(f"Error removing permissions for {role} on {doctype}: {str(e)}")
-        print(f"✗ Error removing permissions: {role} from {doctype}: {str(e)}")
+def execute():
+	"""
+	Automatic setup of roles and permissions for Lexicon and Vendor Manager apps.
+	Applies the role manifests declared by the apps (see vendor_manager.roles):
+	one read per kind of row, one batched write, one cache clear. Skipped
+	entirely when this site already applied the same manifests.
+	"""
+	diff = sync()
+	if diff is None:
+		print("✓ Role manifests unchanged; nothing to do")
+		return
+
+	for message in diff["skipped"]:
+		frappe.logger().warning(message)
+
+	if not has_changes(diff):
+		print("✓ Roles and permissions already up to date")
+		return
+
+	lines = format_diff(diff)
+	frappe.logger().info("Roles and permissions applied:\n" + "\n".join(lines))
+	print("✅ Roles and permissions applied:")
+	for line in lines:
+		print(f"  {line}")
 
 
 # For testing purposes - can be run directly
 if __name__ == "__main__":
-    execute()
+	execute()
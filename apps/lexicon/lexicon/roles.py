@@ -0,0 +1,12 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""Roles and permissions Lexicon needs; applied by vendor_manager.roles.reconcile"""
+
+MANIFEST = {
+	"roles": [{"role_name": "Lexicon User", "desk_access": 1}],
+	# Lexicon users read vendors only through the whitelisted page methods,
+	# never through /app/vendor
+	"revoke": [{"doctype": "Vendor", "role": "Lexicon User"}],
+	"pages": [{"page": "vendors", "roles": ["Lexicon User"]}],
+}
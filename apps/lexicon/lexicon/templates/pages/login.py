@@ -1,40 +1,20 @@
 import frappe
-from frappe import _
 
-def get_context(context):
-    context.no_cache = 1
+from lexicon.lexicon.auth.login_page import get_login_options
 
-    # Check if already logged in
-    if frappe.session.user != "Guest":
-        frappe.local.flags.redirect_location = "/app"
-        raise frappe.Redirect
 
-    # Get social login providers (if any configured via Frappe's Social Login Keys)
-    social_login = []
-    try:
-        providers = frappe.get_all(
-            "Social Login Key",
-            filters={"enable_social_login": 1},
-            fields=["name", "provider_name", "icon", "client_id"]
-        )
-        for provider in providers:
-            social_login.append({
-                "provider_name": provider.provider_name,
-                "auth_url": f"/api/method/frappe.integrations.oauth2_logins.login_via_{provider.name.lower().replace(' ', '_')}",
-                "icon": provider.icon
-            })
-    except:
-        pass
+def get_context(context):
+	# The rendered page is not cached: logged-in users must still be redirected
+	# below. Everything it needs besides the session comes from one Redis read.
+	context.no_cache = 1
 
-    context.social_login = social_login
+	# Check if already logged in
+	if frappe.session.user != "Guest":
+		frappe.local.flags.redirect_location = "/app"
+		raise frappe.Redirect
 
-    # Check if LDAP is enabled
-    context.ldap_settings = frappe._dict({"enabled": False})
-    try:
-        ldap_settings = frappe.get_doc("LDAP Settings")
-        if ldap_settings.enabled:
-            context.ldap_settings = ldap_settings
-    except:
-        pass
+	options = get_login_options()
+	context.social_login = options["social_login"]
+	context.ldap_settings = frappe._dict({"enabled": options["ldap_enabled"]})
 
-    return context
+	return context
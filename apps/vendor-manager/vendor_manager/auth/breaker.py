@@ -0,0 +1,125 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Site-wide protection around identity provider calls.
+
+Two guards, both kept in Redis so every web worker of the site sees them:
+
+- a concurrency cap: at most `auth0_max_concurrent_requests` IdP calls in
+  flight at once (default: half the web workers), so a slow IdP can never
+  tie up every worker. A call that finds every slot taken waits at most
+  ACQUIRE_TIMEOUT for one and otherwise fails;
+- a circuit breaker: FAILURE_THRESHOLD failures (timeouts, connection errors,
+  5xx/429) within FAILURE_WINDOW opens it for COOLDOWN seconds, during which
+  calls fail immediately. After the cooldown the next calls go through, but
+  a single further failure reopens it until a call succeeds.
+
+Callers get IdPUnavailable instead of waiting and show a retry page.
+"""
+
+import multiprocessing
+import time
+import uuid
+from contextlib import contextmanager
+
+import frappe
+
+from vendor_manager.cache import get_redis, make_key
+
+KEY_PREFIX = "vendor_manager:idp:"
+FAILURE_THRESHOLD = 5
+FAILURE_WINDOW = 30
+COOLDOWN = 30
+# How long a call waits for a free slot, and how often it looks
+ACQUIRE_TIMEOUT = 0.2
+ACQUIRE_POLL_INTERVAL = 0.02
+# A slot older than this belongs to a worker that died mid-call
+SLOT_TTL = 60
+
+ACQUIRE_SCRIPT = """
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", tonumber(ARGV[1]) - tonumber(ARGV[3]))
+if redis.call("ZCARD", KEYS[1]) < tonumber(ARGV[2]) then
+	redis.call("ZADD", KEYS[1], ARGV[1], ARGV[4])
+	redis.call("EXPIRE", KEYS[1], ARGV[3])
+	return 1
+end
+return 0
+"""
+
+
+class IdPUnavailable(frappe.ValidationError):
+	http_status_code = 503
+
+
+@contextmanager
+def guard():
+	"""Hold a concurrency slot for one IdP call; raise IdPUnavailable if open or full"""
+	if is_open():
+		raise IdPUnavailable("Circuit open")
+
+	token = uuid.uuid4().hex
+	if not _acquire(token):
+		raise IdPUnavailable("Too many concurrent IdP calls")
+	try:
+		yield
+	finally:
+		get_redis().zrem(_key("inflight"), token)
+
+
+def is_open():
+	return bool(get_redis().exists(_key("open")))
+
+
+def record_success():
+	r = get_redis()
+	if r.exists(_key("failures")) or r.exists(_key("recently_open")):
+		r.delete(_key("failures"), _key("recently_open"))
+
+
+def record_failure():
+	r = get_redis()
+	pipe = r.pipeline()
+	pipe.incr(_key("failures"))
+	pipe.expire(_key("failures"), FAILURE_WINDOW, nx=True)
+	pipe.exists(_key("recently_open"))
+	failures, _expire, recently_open = pipe.execute()
+
+	if failures >= (1 if recently_open else FAILURE_THRESHOLD):
+		pipe = r.pipeline()
+		pipe.set(_key("open"), 1, ex=COOLDOWN)
+		pipe.set(_key("recently_open"), 1, ex=COOLDOWN * 4)
+		pipe.delete(_key("failures"))
+		pipe.execute()
+		frappe.logger("auth").warning(f"IdP circuit opened for {COOLDOWN}s after {failures} failures")
+
+
+def reset():
+	get_redis().delete(*(_key(name) for name in ("open", "recently_open", "failures", "inflight")))
+
+
+def max_concurrent():
+	return frappe.conf.get("auth0_max_concurrent_requests") or default_max_concurrent()
+
+
+def default_max_concurrent():
+	"""Half the web workers (counted the way `bench setup` sizes gunicorn), so the rest keep serving"""
+	workers = frappe.conf.get("gunicorn_workers") or multiprocessing.cpu_count() * 2 + 1
+	return max(1, workers // 2)
+
+
+def _acquire(token):
+	"""Wait up to ACQUIRE_TIMEOUT for a slot; False if none freed up or the circuit opened meanwhile"""
+	r = get_redis()
+	limit = max_concurrent()
+	deadline = time.monotonic() + ACQUIRE_TIMEOUT
+	while True:
+		if r.eval(ACQUIRE_SCRIPT, 1, _key("inflight"), time.time(), limit, SLOT_TTL, token):
+			return True
+		if time.monotonic() >= deadline or is_open():
+			return False
+		time.sleep(ACQUIRE_POLL_INTERVAL)
+
+
+def _key(name):
+	return make_key(KEY_PREFIX + name)
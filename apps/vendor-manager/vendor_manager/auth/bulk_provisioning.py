@@ -0,0 +1,272 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Bulk pre-provisioning of users for the Auth0-backed apps.
+
+Takes identities ({email, first_name, last_name, app}) and creates the users
+their first login would create, following each app's conventions in
+provisioning.APP_USERS (user name prefix, roles, bio). Per batch this costs
+two reads (existing users, then their roles with the User rows locked), two
+multi-row INSERTs (User, Has Role) and one commit. Like a login, it only adds
+the roles a user does not hold yet, so a batch racing a first login does not
+grant anything twice. Afterwards the login role check is primed in Redis, so
+the users' first logins take the "existing user" path.
+
+As with a first login, the User controller work (full profile save,
+notification settings) runs later in a background job, one per batch.
+
+	bench --site mysite provision-users staff.csv --app lexicon
+"""
+
+import time
+
+import frappe
+from frappe import _
+from frappe.utils import now, validate_email_address
+
+from vendor_manager.auth.provisioning import (
+	APP_USERS,
+	MINIMAL_USER_FIELDS,
+	enrich_user,
+	get_user_name,
+	mark_roles_ok,
+	roles_changed,
+)
+from vendor_manager.utils import batched, read_rows, with_rate
+
+DEFAULT_BATCH_SIZE = 500
+# Larger API requests are handed to a background job
+SYNC_LIMIT = 1000
+HAS_ROLE_FIELDS = [
+	"name",
+	"parent",
+	"parenttype",
+	"parentfield",
+	"role",
+	"idx",
+	"owner",
+	"creation",
+	"modified",
+	"modified_by",
+]
+
+
+@frappe.whitelist(methods=["POST"])
+def bulk_provision_users(identities, app=None):
+	"""
+	Pre-provision users; `identities` is a JSON list of {email, first_name, last_name, app}.
+
+	`app` is used for identities that do not name one.
+	"""
+	frappe.only_for("System Manager")
+	identities = frappe.parse_json(identities)
+	if not isinstance(identities, list) or not all(isinstance(identity, dict) for identity in identities):
+		frappe.throw(_("Identities must be a list of objects"), frappe.ValidationError)
+	if len(identities) <= SYNC_LIMIT:
+		return provision_users(identities, app=app)
+
+	job = frappe.enqueue(
+		"vendor_manager.auth.bulk_provisioning.provision_users",
+		queue="long",
+		timeout=60 * 60,
+		identities=identities,
+		app=app,
+	)
+	return {"queued": len(identities), "job_id": job.id}
+
+
+def provision_users(identities, app=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+	"""
+	Create missing users and roles for `identities`, one transaction per batch.
+
+	Args:
+		identities (iterable): Dicts with email, first_name (or given_name),
+			last_name (or family_name) and app
+		app (str): App for identities without one
+		batch_size (int): Identities per transaction
+		progress (callable): Optional callback receiving the running stats after each batch
+
+	Returns:
+		dict: {"read", "created", "updated", "unchanged", "rejected", "rejects": [(identity, reason)],
+		"seconds", "rows_per_second"}
+	"""
+	stats = {"read": 0, "created": 0, "updated": 0, "unchanged": 0, "rejected": 0, "rejects": []}
+	started = time.monotonic()
+
+	for batch in batched(identities, batch_size):
+		stats["read"] += len(batch)
+		accepted, rejected = _normalize_batch(batch, app)
+		created, updated = _provision_batch(accepted)
+
+		stats["created"] += created
+		stats["updated"] += updated
+		stats["unchanged"] += len(accepted) - created - updated
+		stats["rejected"] += len(rejected)
+		stats["rejects"] += rejected
+		if progress:
+			progress(with_rate(stats, started))
+
+	return with_rate(stats, started)
+
+
+def provision_users_from_file(path, app=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+	"""`provision_users` over a .csv or .ndjson file (optionally gzipped)"""
+	return provision_users(read_rows(path), app=app, batch_size=batch_size, progress=progress)
+
+
+def enrich_users(users):
+	"""Background half of a bulk provisioning batch; see provisioning.enrich_user"""
+	for user in users:
+		enrich_user(user, {})
+		frappe.db.commit()
+
+
+def _normalize_batch(batch, default_app):
+	accepted, rejected, seen = [], [], set()
+	for identity in batch:
+		if not isinstance(identity, dict):
+			rejected.append((identity, _("Not an object")))
+			continue
+		app = identity.get("app") or default_app
+		email = (identity.get("email") or "").strip().lower()
+		if app not in APP_USERS:
+			rejected.append((identity, _("Unknown app {0}").format(app)))
+		elif not validate_email_address(email):
+			rejected.append((identity, _("Invalid email {0}").format(email)))
+		elif get_user_name(app, email) in seen:
+			rejected.append((identity, _("Duplicate of an earlier row")))
+		else:
+			user = get_user_name(app, email)
+			seen.add(user)
+			first_name = (identity.get("first_name") or identity.get("given_name") or "").strip()
+			last_name = (identity.get("last_name") or identity.get("family_name") or "").strip()
+			accepted.append(
+				frappe._dict(
+					user=user,
+					email=email,
+					app=app,
+					first_name=first_name or email.split("@")[0],
+					last_name=last_name or None,
+				)
+			)
+	return accepted, rejected
+
+
+def _provision_batch(rows):
+	"""Insert missing users and roles for one batch; returns (created, updated)"""
+	if not rows:
+		return 0, 0
+
+	users = [row.user for row in rows]
+	existing = set(frappe.get_all("User", filters={"name": ("in", users)}, pluck="name"))
+	new_users = [row for row in rows if row.user not in existing]
+	_insert_users(new_users)
+
+	# As in provisioning.add_roles: lock the User rows before reading roles, so a
+	# concurrent first login finishes first and its roles are not added again
+	held, last_idx = _get_roles(users)
+
+	role_rows, updated = [], set()
+	for row in rows:
+		conventions = APP_USERS[row.app]
+		wanted = conventions.roles
+		if row.user not in existing:
+			wanted = (*conventions.roles, *conventions.initial_roles)
+		roles = [role for role in dict.fromkeys(wanted) if role not in held.get(row.user, ())]
+		if roles and row.user in existing:
+			updated.add(row.user)
+		for idx, role in enumerate(roles, start=last_idx.get(row.user, 0) + 1):
+			role_rows.append((row.user, role, idx))
+
+	_insert_roles(role_rows)
+	if updated:
+		roles_changed(updated)
+	frappe.db.commit()
+
+	mark_roles_ok({row.user: APP_USERS[row.app].roles for row in rows})
+	for user in updated:
+		frappe.clear_cache(user=user)
+	if new_users:
+		frappe.enqueue(
+			"vendor_manager.auth.bulk_provisioning.enrich_users",
+			queue="long",
+			users=[row.user for row in new_users],
+		)
+	return len(new_users), len(updated)
+
+
+def _get_roles(users):
+	"""Roles held and the highest Has Role idx, per user, with the User and Has Role rows locked"""
+	held, last_idx = {}, {}
+	if not users:
+		return held, last_idx
+
+	frappe.qb.get_query("User", filters={"name": ("in", users)}, fields=["name"], for_update=True).run()
+	for user, role, idx in frappe.qb.get_query(
+		"Has Role",
+		filters={"parenttype": "User", "parent": ("in", users)},
+		fields=["parent", "role", "idx"],
+		for_update=True,
+	).run():
+		held.setdefault(user, set()).add(role)
+		last_idx[user] = max(last_idx.get(user, 0), idx or 0)
+	return held, last_idx
+
+
+def _insert_users(rows):
+	if not rows:
+		return
+
+	timestamp, owner = now(), frappe.session.user
+	values = []
+	for row in rows:
+		bio = APP_USERS[row.app].bio
+		full_name = " ".join(filter(None, (row.first_name, row.last_name)))
+		values.append(
+			(
+				row.user,
+				row.user,
+				row.first_name,
+				full_name,
+				1,
+				"System User",
+				0,
+				owner,
+				timestamp,
+				timestamp,
+				owner,
+				row.last_name,
+				bio and bio.format(email=row.email),
+			)
+		)
+	# A user created by a concurrent login in the meantime is left as it is
+	frappe.db.bulk_insert(
+		"User", fields=[*MINIMAL_USER_FIELDS, "last_name", "bio"], values=values, ignore_duplicates=True
+	)
+
+
+def _insert_roles(role_rows):
+	if not role_rows:
+		return
+
+	timestamp, owner = now(), frappe.session.user
+	frappe.db.bulk_insert(
+		"Has Role",
+		fields=HAS_ROLE_FIELDS,
+		values=[
+			(
+				frappe.generate_hash(length=10),
+				user,
+				"User",
+				"roles",
+				role,
+				idx,
+				owner,
+				timestamp,
+				timestamp,
+				owner,
+			)
+			for user, role, idx in role_rows
+		],
+	)
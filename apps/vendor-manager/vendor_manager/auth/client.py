@@ -0,0 +1,198 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Shared Auth0 client for the app login flows.
+
+Every callback used to open a fresh connection (TCP + TLS) to the identity
+provider for each request and waited on it without a timeout. All IdP calls
+now go through one keep-alive session per worker process with bounded
+timeouts and a small retry budget:
+
+- connect failures are retried for every request (nothing reached the IdP);
+- read failures and 502/503/504 are retried only for GETs, because an
+  authorization code must not be redeemed twice.
+
+Every call also passes through the site-wide concurrency cap and circuit
+breaker in `breaker`; when the IdP is unavailable the login endpoints render
+a retry page instead of holding the worker.
+
+`auth0_base_url` in site config overrides `https://<auth0_domain>`, which is
+how tests and load tests point the flows at a local stand-in.
+"""
+
+import os
+from urllib.parse import urlencode
+
+import frappe
+import requests
+from frappe import _
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from vendor_manager.auth import breaker, id_token, metrics
+
+# (connect, read) seconds; a login should never hold a worker longer than this per call
+TIMEOUT = (3.05, 10)
+RETRIES = Retry(
+	total=2,
+	connect=2,
+	read=1,
+	status=1,
+	backoff_factor=0.2,
+	status_forcelist=(502, 503, 504),
+	allowed_methods=frozenset({"GET"}),
+	raise_on_status=False,
+)
+POOL_SIZE = 10
+SCOPE = "openid profile email"
+
+_session = None
+_session_pid = None
+
+
+def get_session():
+	"""Keep-alive session for this worker process, recreated after a fork"""
+	global _session, _session_pid
+
+	if _session is None or _session_pid != os.getpid():
+		session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=RETRIES)
+		session.mount("https://", adapter)
+		session.mount("http://", adapter)
+		_session, _session_pid = session, os.getpid()
+	return _session
+
+
+def get_base_url():
+	return (frappe.conf.get("auth0_base_url") or f"https://{frappe.conf.get('auth0_domain')}").rstrip("/")
+
+
+def get_callback_url(callback):
+	return f"{frappe.utils.get_url()}/api/method/{callback}"
+
+
+def get_client_credentials(app):
+	"""Client id and secret for `app`, read from `auth0_<app>_client_id` / `_client_secret`"""
+	return frappe.conf.get(f"auth0_{app}_client_id"), frappe.conf.get(f"auth0_{app}_client_secret")
+
+
+def start_login(app, callback):
+	"""Redirect the current request to the IdP's authorize endpoint"""
+	if breaker.is_open():
+		show_retry_page()
+		return
+
+	client_id, _secret = get_client_credentials(app)
+	params = {
+		"response_type": "code",
+		"client_id": client_id,
+		"redirect_uri": get_callback_url(callback),
+		"scope": SCOPE,
+		"state": frappe.generate_hash(length=20),
+	}
+	frappe.local.response["type"] = "redirect"
+	frappe.local.response["location"] = f"{get_base_url()}/authorize?{urlencode(params)}"
+
+
+def complete_login(app, callback, code=None, error=None):
+	"""
+	Handle the callback parameters: exchange the code and return the user's profile.
+
+	The profile is read from the locally verified id_token; /userinfo is only
+	called when there is no usable id_token.
+
+	Returns:
+		dict: profile claims (email, given_name, family_name, ...), or None when
+		the IdP is unavailable and a retry page has been set as the response
+	"""
+	if error:
+		frappe.throw(_("Auth0 Error: {0}").format(error))
+	if not code:
+		frappe.throw(_("Authorization code not received"))
+
+	try:
+		return _fetch_profile(app, callback, code)
+	except breaker.IdPUnavailable:
+		show_retry_page()
+		return None
+
+
+def show_retry_page():
+	frappe.respond_as_web_page(
+		_("Login temporarily unavailable"),
+		_("Our login service is responding slowly right now. Please try again in a minute."),
+		http_status_code=503,
+		indicator_color="orange",
+		primary_action="/login",
+		primary_label=_("Try again"),
+	)
+
+
+def _fetch_profile(app, callback, code):
+	with metrics.phase("token_exchange"):
+		tokens = exchange_code(app, code, get_callback_url(callback))
+	if tokens.get("id_token"):
+		client_id, _secret = get_client_credentials(app)
+		try:
+			with metrics.phase("id_token_verify"):
+				claims = id_token.verify_id_token(tokens["id_token"], audience=client_id)
+			if claims.get("email"):
+				return claims
+		except id_token.InvalidIDToken as e:
+			frappe.logger().warning(f"Falling back to /userinfo, id_token rejected: {e}")
+
+	with metrics.phase("userinfo"):
+		return fetch_userinfo(tokens["access_token"])
+
+
+def exchange_code(app, code, redirect_uri):
+	client_id, client_secret = get_client_credentials(app)
+	tokens = request_json(
+		"POST",
+		"/oauth/token",
+		json={
+			"grant_type": "authorization_code",
+			"client_id": client_id,
+			"client_secret": client_secret,
+			"code": code,
+			"redirect_uri": redirect_uri,
+		},
+	)
+	if "access_token" not in tokens:
+		frappe.throw(_("Failed to get access token"), frappe.AuthenticationError)
+	return tokens
+
+
+def fetch_userinfo(access_token):
+	return request_json("GET", "/userinfo", headers={"Authorization": f"Bearer {access_token}"})
+
+
+def request_json(method, path, **kwargs):
+	"""
+	Call the IdP on the pooled session and return the decoded JSON body.
+
+	Raises:
+		breaker.IdPUnavailable: circuit open, concurrency cap reached, or the IdP
+		did not answer in time
+	"""
+	with breaker.guard():
+		try:
+			response = get_session().request(method, get_base_url() + path, timeout=TIMEOUT, **kwargs)
+		except requests.RequestException as e:
+			breaker.record_failure()
+			frappe.log_error(title=f"Auth0 {method} {path} failed")
+			raise breaker.IdPUnavailable(str(e)) from e
+
+		if response.status_code >= 500 or response.status_code == 429:
+			breaker.record_failure()
+		else:
+			breaker.record_success()
+
+	try:
+		return response.json()
+	except ValueError:
+		frappe.log_error(title=f"Auth0 {method} {path} returned a non-JSON response")
+		frappe.throw(
+			_("The login service is not responding, please try again shortly."), frappe.AuthenticationError
+		)
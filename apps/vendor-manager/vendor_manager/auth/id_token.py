@@ -0,0 +1,103 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Local verification of Auth0 ID tokens.
+
+The token endpoint already returns a signed `id_token` carrying the profile
+claims, so the callbacks verify it here instead of calling /userinfo. Signing
+keys come from the tenant's JWKS, cached in this worker and in Redis; an
+unknown `kid` (key rotation) triggers a refetch; after a refetch that still
+lacks the kid, further refetches wait REFRESH_INTERVAL so forged kids cannot
+hammer the IdP.
+"""
+
+import hashlib
+import time
+
+import frappe
+import jwt
+
+from vendor_manager.auth import client
+
+ALGORITHMS = ["RS256"]
+JWKS_PATH = "/.well-known/jwks.json"
+# Suffixed per IdP base URL, so a mock IdP's keys never land where the real tenant's are read
+JWKS_CACHE_KEY = "auth0_jwks"
+JWKS_CACHE_SECONDS = 24 * 60 * 60
+REFRESH_INTERVAL = 60
+LEEWAY_SECONDS = 60
+
+# base_url -> {"keys": {kid: key}, "checked_at": monotonic seconds}
+_worker_keys = {}
+
+
+class InvalidIDToken(Exception):
+	pass
+
+
+def verify_id_token(token, audience):
+	"""
+	Verify signature, issuer, audience and expiry of `token` and return its claims.
+
+	Raises:
+		InvalidIDToken: the caller should fall back to /userinfo
+	"""
+	base_url = client.get_base_url()
+	try:
+		kid = jwt.get_unverified_header(token).get("kid")
+		key = get_signing_key(base_url, kid)
+		return jwt.decode(
+			token,
+			key,
+			algorithms=ALGORITHMS,
+			audience=audience,
+			issuer=f"{base_url}/",
+			leeway=LEEWAY_SECONDS,
+		)
+	except jwt.PyJWTError as e:
+		raise InvalidIDToken(str(e)) from e
+
+
+def get_signing_key(base_url, kid):
+	cached = _worker_keys.get(base_url)
+	if cached is None:
+		keys = _parse_jwks(frappe.cache.get_value(_cache_key(base_url)))
+		cached = _worker_keys[base_url] = {"keys": keys, "checked_at": None}
+	if kid in cached["keys"]:
+		return cached["keys"][kid]
+
+	if cached["checked_at"] is not None and time.monotonic() - cached["checked_at"] < REFRESH_INTERVAL:
+		raise InvalidIDToken(f"Unknown signing key {kid}")
+
+	jwks = _fetch_jwks()
+	frappe.cache.set_value(_cache_key(base_url), jwks, expires_in_sec=JWKS_CACHE_SECONDS)
+	cached["keys"] = _parse_jwks(jwks)
+	if kid not in cached["keys"]:
+		# Only fruitless refetches are throttled, so a genuine rotation is picked up at once
+		cached["checked_at"] = time.monotonic()
+		raise InvalidIDToken(f"Unknown signing key {kid}")
+	return cached["keys"][kid]
+
+
+def clear_cache(base_url=None):
+	"""Forget the keys of `base_url` (default: the configured IdP) here and in Redis"""
+	base_url = base_url or client.get_base_url()
+	_worker_keys.pop(base_url, None)
+	frappe.cache.delete_value(_cache_key(base_url))
+
+
+def _cache_key(base_url):
+	return f"{JWKS_CACHE_KEY}:{hashlib.sha256(base_url.encode()).hexdigest()[:16]}"
+
+
+def _fetch_jwks():
+	return client.request_json("GET", JWKS_PATH)
+
+
+def _parse_jwks(jwks):
+	keys = {}
+	for jwk in (jwks or {}).get("keys", []):
+		if jwk.get("kid") and jwk.get("kty") == "RSA":
+			keys[jwk["kid"]] = jwt.PyJWK(jwk, algorithm="RS256").key
+	return keys
@@ -0,0 +1,262 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Login load test against the local mock IdP.
+
+Drives the real auth0_login and callback endpoints of one app in-process: each
+worker thread holds its own site connection and, per login, builds the same
+request objects the web server would (HTTPRequest, guest session), follows the
+mock /authorize redirect and calls the callback, then commits as the request
+would. A login only counts as a success if it ends in a redirect with the
+expected user's session; a retry page or any other answer is an error.
+Returning users are logged in once during a warm-up that is not measured.
+Nothing leaves localhost, so it runs offline.
+
+	bench --site mysite login-benchmark --app lexicon --new 200 --returning 200 --concurrency 8
+"""
+
+import queue
+import random
+import threading
+import time
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import frappe
+import requests
+from frappe.database.database import Database
+
+from vendor_manager.auth.mock_idp import EMAIL_DOMAIN, MockIdP
+from vendor_manager.auth.provisioning import get_user_name
+
+FLOWS = {
+	"lexicon": ("lexicon.lexicon.auth.oauth.auth0_login", "lexicon.lexicon.auth.oauth.lexicon_callback"),
+	"vendor_manager": (
+		"vendor_manager.auth.oauth.auth0_login",
+		"vendor_manager.auth.oauth.vendor_manager_callback",
+	),
+	"crm": (
+		"vendor_manager.vendor_manager.auth.oauth.auth0_login",
+		"vendor_manager.vendor_manager.auth.oauth.crm_callback",
+	),
+}
+
+_queries = threading.local()
+
+
+class LoginNotCompleted(Exception):
+	"""The callback answered without logging the user in (e.g. the 503 retry page)"""
+
+
+class WrongSessionUser(Exception):
+	"""The callback logged in someone other than the IdP user"""
+
+
+def run_login_benchmark(
+	site,
+	app="lexicon",
+	new_users=100,
+	returning_users=100,
+	concurrency=8,
+	idp_latency=0.0,
+	idp_jitter=0.0,
+	idp_error_rate=0.0,
+	cleanup=True,
+):
+	"""
+	Run a login storm and return a report.
+
+	Returns:
+		dict: {"logins", "errors", "seconds", "logins_per_second",
+		"latency_ms": {kind: {p50, p95, p99, max}}, "queries_per_login": {kind: {mean, p95}},
+		"error_types": {name: count}}
+	"""
+	if app not in FLOWS:
+		raise ValueError(f"Unknown app {app}; choose from {', '.join(FLOWS)}")
+
+	run_id = frappe.generate_hash(length=6).lower()
+	returning = [f"loadtest-{run_id}-r{i}" for i in range(returning_users)]
+	fresh = [f"loadtest-{run_id}-n{i}" for i in range(new_users)]
+	plan = [("returning", code) for code in returning] + [("new", code) for code in fresh]
+	random.shuffle(plan)
+
+	idp = MockIdP(record_requests=False).start()
+	original_sql = _count_queries()
+	try:
+		# Warm-up: create the returning users, unmeasured and without simulated IdP trouble
+		_run_phase(site, app, idp, concurrency, returning, lambda code: _run_one(app, code))
+
+		idp.latency, idp.jitter, idp.error_rate = idp_latency, idp_jitter, idp_error_rate
+		results, elapsed = _run_phase(
+			site, app, idp, concurrency, plan, lambda step: (step[0], *_run_one(app, step[1]))
+		)
+	finally:
+		Database.sql = original_sql
+		idp.stop()
+		if cleanup:
+			_delete_users(site, app, returning + fresh)
+
+	return _report(results, elapsed)
+
+
+def _run_phase(site, app, idp, concurrency, items, run):
+	"""
+	Call `run(item)` for every item on `concurrency` threads, each with its own
+	site connection, closed when the thread is done.
+
+	Returns:
+		tuple: (results in item order, seconds from the moment every thread was connected)
+	"""
+	work = queue.SimpleQueue()
+	for index, item in enumerate(items):
+		work.put((index, item))
+	results = [None] * len(items)
+	connected = threading.Barrier(concurrency + 1)
+
+	def worker():
+		try:
+			_connect(site, app, idp)
+			connected.wait()
+			while True:
+				try:
+					index, item = work.get_nowait()
+				except queue.Empty:
+					return
+				results[index] = run(item)
+		except threading.BrokenBarrierError:
+			return
+		except Exception:
+			connected.abort()
+			raise
+		finally:
+			if getattr(frappe.local, "benchmark_http", None):
+				frappe.local.benchmark_http.close()
+			frappe.destroy()
+
+	threads = [threading.Thread(target=worker, name=f"login-benchmark-{i}") for i in range(concurrency)]
+	for thread in threads:
+		thread.start()
+	connected.wait()
+	started = time.perf_counter()
+	for thread in threads:
+		thread.join()
+	return results, time.perf_counter() - started
+
+
+def _connect(site, app, idp):
+	frappe.init(site=site)
+	frappe.connect()
+	frappe.local.conf.auth0_base_url = idp.base_url
+	frappe.local.conf.setdefault(f"auth0_{app}_client_id", "loadtest")
+	frappe.local.benchmark_http = requests.Session()
+
+
+def _run_one(app, code):
+	"""One full login; returns (ms, queries, error name or None)"""
+	authorize, callback = FLOWS[app]
+	_queries.count = 0
+	started = time.perf_counter()
+	try:
+		_new_request(authorize, {})
+		frappe.get_attr(authorize)()
+		location = f"{frappe.local.response['location']}&{urlencode({'login_hint': code})}"
+
+		redirect = frappe.local.benchmark_http.get(location, allow_redirects=False, timeout=30)
+		if redirect.status_code != 302:
+			raise frappe.AuthenticationError(f"/authorize answered {redirect.status_code}")
+		query = parse_qs(urlparse(redirect.headers["Location"]).query)
+		params = {key: values[0] for key, values in query.items()}
+
+		_new_request(callback, params)
+		frappe.get_attr(callback)(code=params["code"], state=params.get("state"))
+		if frappe.local.response.get("type") != "redirect":
+			raise LoginNotCompleted(frappe.local.response.get("http_status_code"))
+		if frappe.session.user != get_user_name(app, f"{code}@{EMAIL_DOMAIN}"):
+			raise WrongSessionUser(frappe.session.user)
+		frappe.db.commit()
+		error = None
+	except Exception as e:
+		frappe.db.rollback()
+		error = type(e).__name__
+
+	return (time.perf_counter() - started) * 1000, _queries.count, error
+
+
+def _new_request(method, params):
+	"""Set up frappe.local the way the web server does for a fresh guest request"""
+	from frappe.auth import HTTPRequest
+	from werkzeug.test import EnvironBuilder
+	from werkzeug.wrappers import Request
+
+	frappe.local.request = Request(
+		EnvironBuilder(path=f"/api/method/{method}", query_string=urlencode(params)).get_environ()
+	)
+	frappe.local.form_dict = frappe._dict(params)
+	frappe.local.response = frappe._dict()
+	frappe.set_user("Guest")
+	frappe.local.http_request = HTTPRequest()
+
+
+def _count_queries():
+	original = Database.sql
+
+	def counting_sql(self, *args, **kwargs):
+		_queries.count = getattr(_queries, "count", 0) + 1
+		return original(self, *args, **kwargs)
+
+	Database.sql = counting_sql
+	return original
+
+
+def _delete_users(site, app, codes):
+	from frappe.sessions import clear_sessions
+
+	frappe.init(site=site)
+	frappe.connect()
+	try:
+		frappe.set_user("Administrator")
+		for code in codes:
+			email = get_user_name(app, f"{code}@{EMAIL_DOMAIN}")
+			if frappe.db.exists("User", email):
+				clear_sessions(email, force=True)
+				frappe.delete_doc("User", email, force=True, ignore_permissions=True)
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+
+def _report(results, elapsed):
+	report = {
+		"logins": len(results),
+		"errors": sum(1 for *_, error in results if error),
+		"seconds": round(elapsed, 3),
+		"logins_per_second": round(len(results) / elapsed, 1) if elapsed else None,
+		"latency_ms": {},
+		"queries_per_login": {},
+		"error_types": {},
+	}
+	for kind in ("new", "returning", "all"):
+		ok = [(ms, queries) for k, ms, queries, error in results if not error and kind in (k, "all")]
+		if not ok:
+			continue
+		latencies = sorted(ms for ms, _count in ok)
+		queries = sorted(q for _ms, q in ok)
+		report["latency_ms"][kind] = {
+			"p50": _percentile(latencies, 0.50),
+			"p95": _percentile(latencies, 0.95),
+			"p99": _percentile(latencies, 0.99),
+			"max": round(latencies[-1], 2),
+		}
+		report["queries_per_login"][kind] = {
+			"mean": round(sum(queries) / len(queries), 2),
+			"p95": _percentile(queries, 0.95),
+		}
+	for *_, error in results:
+		if error:
+			report["error_types"][error] = report["error_types"].get(error, 0) + 1
+	return report
+
+
+def _percentile(sorted_values, quantile):
+	index = min(len(sorted_values) - 1, max(0, round(quantile * len(sorted_values)) - 1))
+	return round(sorted_values[index], 2)
@@ -0,0 +1,209 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Per-phase latency histograms for the Auth0 login flows.
+
+Each endpoint is wrapped with `instrumented(app, endpoint)` and the slow steps
+inside it with `phase(name)`. Durations land in a fixed-bucket histogram held
+in process memory, labelled by app, endpoint, phase and outcome. Every
+FLUSH_INTERVAL seconds a worker adds its increments to one Redis hash, so
+`get_login_metrics` reports all workers together. A sample of flows (and
+every failed or slow one) is also logged as one structured line.
+"""
+
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+import frappe
+
+from vendor_manager.cache import get_redis, make_key
+
+# Upper bounds in milliseconds; the last bucket is open-ended
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+METRICS_KEY = "vendor_manager:login_metrics"
+FLUSH_INTERVAL = 10
+DEFAULT_SAMPLE_RATE = 0.05
+SLOW_FLOW_MS = 2000
+TOTAL = "total"
+
+_lock = threading.Lock()
+# (app, endpoint, phase, outcome) -> [bucket counts..., count, sum_ms]
+_pending = {}
+_last_flush = time.monotonic()
+
+
+def instrumented(app, endpoint):
+	"""Decorator timing a whole login endpoint and enabling `phase` inside it"""
+
+	def decorator(fn):
+		@wraps(fn)
+		def wrapper(*args, **kwargs):
+			flow = {"app": app, "endpoint": endpoint, "phases": {}}
+			frappe.local.login_flow = flow
+			started = time.perf_counter()
+			outcome = "ok"
+			try:
+				return fn(*args, **kwargs)
+			except Exception as e:
+				outcome = f"error:{type(e).__name__}"
+				raise
+			finally:
+				elapsed_ms = (time.perf_counter() - started) * 1000
+				frappe.local.login_flow = None
+				observe(app, endpoint, TOTAL, outcome, elapsed_ms)
+				_maybe_log(flow, outcome, elapsed_ms)
+				_maybe_flush()
+
+		return wrapper
+
+	return decorator
+
+
+@contextmanager
+def phase(name):
+	"""Time one step of the current login flow; a no-op outside `instrumented`"""
+	flow = getattr(frappe.local, "login_flow", None)
+	if flow is None:
+		yield
+		return
+
+	started = time.perf_counter()
+	outcome = "ok"
+	try:
+		yield
+	except Exception as e:
+		outcome = f"error:{type(e).__name__}"
+		raise
+	finally:
+		elapsed_ms = (time.perf_counter() - started) * 1000
+		flow["phases"][name] = {"ms": round(elapsed_ms, 2), "outcome": outcome}
+		observe(flow["app"], flow["endpoint"], name, outcome, elapsed_ms)
+
+
+def observe(app, endpoint, phase_name, outcome, elapsed_ms):
+	key = (app, endpoint, phase_name, outcome)
+	with _lock:
+		series = _pending.get(key)
+		if series is None:
+			series = _pending[key] = [0] * (len(BUCKETS_MS) + 2)
+		series[bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+		series[-2] += 1
+		series[-1] += elapsed_ms
+
+
+def flush():
+	"""Add this worker's pending increments to the shared Redis histogram"""
+	global _last_flush
+
+	with _lock:
+		pending = dict(_pending)
+		_pending.clear()
+		_last_flush = time.monotonic()
+	if not pending:
+		return
+
+	key = make_key(METRICS_KEY)
+	pipe = get_redis().pipeline(transaction=False)
+	for labels, series in pending.items():
+		prefix = "|".join(labels)
+		for i, count in enumerate(series[: len(BUCKETS_MS)]):
+			if count:
+				pipe.hincrby(key, f"{prefix}|{i}", count)
+		pipe.hincrby(key, f"{prefix}|count", series[-2])
+		pipe.hincrbyfloat(key, f"{prefix}|sum", series[-1])
+	pipe.execute()
+
+
+@frappe.whitelist()
+def get_login_metrics(app=None):
+	"""
+	Latency summary for every (app, endpoint, phase, outcome) seen so far.
+
+	Returns:
+		list: dicts with the labels, count, mean_ms, p50_ms, p95_ms, p99_ms and
+		the raw bucket counts (upper bounds in `BUCKETS_MS`)
+	"""
+	frappe.only_for("System Manager")
+	flush()
+
+	series = {}
+	for field, value in get_redis().hgetall(make_key(METRICS_KEY)).items():
+		*labels, slot = field.decode().split("|")
+		entry = series.setdefault(tuple(labels), {"buckets": [0] * len(BUCKETS_MS), "count": 0, "sum": 0.0})
+		if slot == "count":
+			entry["count"] = int(value)
+		elif slot == "sum":
+			entry["sum"] = float(value)
+		else:
+			entry["buckets"][int(slot)] = int(value)
+
+	summary = []
+	for (flow_app, endpoint, phase_name, outcome), entry in sorted(series.items()):
+		if app and flow_app != app:
+			continue
+		summary.append(
+			{
+				"app": flow_app,
+				"endpoint": endpoint,
+				"phase": phase_name,
+				"outcome": outcome,
+				"count": entry["count"],
+				"mean_ms": round(entry["sum"] / entry["count"], 2) if entry["count"] else None,
+				"p50_ms": percentile(entry["buckets"], 0.50),
+				"p95_ms": percentile(entry["buckets"], 0.95),
+				"p99_ms": percentile(entry["buckets"], 0.99),
+				"buckets": entry["buckets"],
+			}
+		)
+	return summary
+
+
+@frappe.whitelist(methods=["POST"])
+def reset_login_metrics():
+	frappe.only_for("System Manager")
+	with _lock:
+		_pending.clear()
+	get_redis().delete(make_key(METRICS_KEY))
+
+
+def percentile(buckets, quantile):
+	"""Upper bound of the bucket holding `quantile` (None for the open-ended bucket)"""
+	total = sum(buckets)
+	if not total:
+		return None
+	running = 0
+	for bound, count in zip(BUCKETS_MS, buckets, strict=True):
+		running += count
+		if running >= quantile * total:
+			return bound if bound != float("inf") else None
+	return None
+
+
+def _maybe_flush():
+	if time.monotonic() - _last_flush >= FLUSH_INTERVAL:
+		try:
+			flush()
+		except Exception:
+			# Metrics must never break a login
+			frappe.logger("login_metrics").exception("Could not flush login metrics")
+
+
+def _maybe_log(flow, outcome, elapsed_ms):
+	sample_rate = frappe.conf.get("login_metrics_sample_rate", DEFAULT_SAMPLE_RATE)
+	if outcome == "ok" and elapsed_ms < SLOW_FLOW_MS and random.random() >= sample_rate:
+		return
+	frappe.logger("login_metrics").info(
+		{
+			"event": "login_flow",
+			"app": flow["app"],
+			"endpoint": flow["endpoint"],
+			"outcome": outcome,
+			"total_ms": round(elapsed_ms, 2),
+			"phases": flow["phases"],
+		}
+	)
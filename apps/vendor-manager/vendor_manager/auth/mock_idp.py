@@ -0,0 +1,207 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Local stand-in for the Auth0 endpoints used by the login flows.
+
+Any authorization code is accepted except "invalid"; the code doubles as the
+user's local part, so code "alice" logs in alice@example.com. /authorize
+redirects straight back with the `login_hint` (or a random name) as the code.
+Token responses carry an RS256 id_token signed with a key published at the
+JWKS endpoint; `rotate_key()` switches to a new signing key.
+
+`latency` (seconds, plus up to `jitter`) delays every response and
+`error_rate` answers that fraction of requests with a 503, for load tests.
+Point a site at it with `auth0_base_url`:
+
+	idp = MockIdP().start()
+	frappe.conf.auth0_base_url = idp.base_url
+
+or run it standalone: python -m vendor_manager.auth.mock_idp --port 8765
+"""
+
+import argparse
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+EMAIL_DOMAIN = "example.com"
+
+
+class MockIdP:
+	def __init__(
+		self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0, record_requests=True
+	):
+		self.server = ThreadingHTTPServer((host, port), _Handler)
+		self.server.daemon_threads = True
+		self.server.idp = self
+		self.latency = latency
+		self.jitter = jitter
+		self.error_rate = error_rate
+		self.record_requests = record_requests
+		self.connections = set()
+		self.requests = []
+		self.thread = None
+		self.keys = []
+		self._jwks = None
+		self.rotate_key()
+
+	@property
+	def base_url(self):
+		host, port = self.server.server_address[:2]
+		return f"http://{host}:{port}"
+
+	def start(self):
+		self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+		self.thread.start()
+		return self
+
+	def stop(self):
+		self.server.shutdown()
+		self.server.server_close()
+
+	def rotate_key(self):
+		kid = f"mock-key-{len(self.keys) + 1}"
+		self.keys.append((kid, rsa.generate_private_key(public_exponent=65537, key_size=2048)))
+		self._jwks = None
+
+	def jwks(self):
+		if self._jwks is None:
+			keys = []
+			for kid, private_key in self.keys:
+				jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+				keys.append(dict(jwk, kid=kid, use="sig", alg="RS256"))
+			self._jwks = {"keys": keys}
+		return self._jwks
+
+	def profile(self, local_part):
+		return {
+			"sub": f"mock|{local_part}",
+			"email": f"{local_part}@{EMAIL_DOMAIN}",
+			"given_name": local_part.title(),
+			"family_name": "Mock",
+		}
+
+	def authorize_location(self, query):
+		"""Where /authorize redirects to, or None when the request is unusable"""
+		params = {key: values[0] for key, values in parse_qs(query).items()}
+		if not params.get("redirect_uri"):
+			return None
+		code = params.get("login_hint") or f"user-{secrets.token_hex(4)}"
+		return f"{params['redirect_uri']}?{urlencode({'code': code, 'state': params.get('state', '')})}"
+
+	def token_response(self, body):
+		code = body.get("code")
+		if not code or code == "invalid":
+			return 403, {"error": "invalid_grant"}
+
+		kid, private_key = self.keys[-1]
+		now = int(time.time())
+		claims = dict(
+			self.profile(code), iss=f"{self.base_url}/", aud=body.get("client_id"), iat=now, exp=now + 36000
+		)
+		return 200, {
+			"access_token": f"mock-{code}",
+			"id_token": jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid}),
+			"token_type": "Bearer",
+			"expires_in": 86400,
+		}
+
+	def userinfo_response(self, authorization):
+		token = (authorization or "").removeprefix("Bearer ")
+		if not token.startswith("mock-"):
+			return 401, {"error": "invalid_token"}
+		return 200, self.profile(token.removeprefix("mock-"))
+
+	def simulate_conditions(self):
+		"""Apply the configured latency; return True when this request should fail"""
+		delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+		if delay:
+			time.sleep(delay)
+		return bool(self.error_rate) and random.random() < self.error_rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+	# Keep-alive, so clients can reuse connections
+	protocol_version = "HTTP/1.1"
+
+	def do_POST(self):
+		length = int(self.headers.get("Content-Length") or 0)
+		body = json.loads(self.rfile.read(length) or b"{}")
+		if self._failed():
+			return
+		if self.path == "/oauth/token":
+			self._reply(*self.server.idp.token_response(body))
+		else:
+			self._reply(404, {"error": "not_found"})
+
+	def do_GET(self):
+		if self._failed():
+			return
+		url = urlparse(self.path)
+		if url.path == "/authorize":
+			location = self.server.idp.authorize_location(url.query)
+			if location:
+				self._reply(302, {}, headers={"Location": location})
+			else:
+				self._reply(400, {"error": "invalid_request"})
+		elif url.path == "/userinfo":
+			self._reply(*self.server.idp.userinfo_response(self.headers.get("Authorization")))
+		elif url.path == "/.well-known/jwks.json":
+			self._reply(200, self.server.idp.jwks())
+		else:
+			self._reply(404, {"error": "not_found"})
+
+	def _failed(self):
+		if self.server.idp.simulate_conditions():
+			self._reply(503, {"error": "temporarily_unavailable"})
+			return True
+		return False
+
+	def _reply(self, status, payload, headers=None):
+		idp = self.server.idp
+		idp.connections.add(self.client_address)
+		if idp.record_requests:
+			idp.requests.append((self.command, urlparse(self.path).path))
+
+		body = json.dumps(payload).encode()
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		for key, value in (headers or {}).items():
+			self.send_header(key, value)
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format, *args):
+		pass
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Run the local Auth0 stand-in")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=8765)
+	parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+	parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra random seconds")
+	parser.add_argument(
+		"--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503"
+	)
+	args = parser.parse_args()
+
+	idp = MockIdP(args.host, args.port, args.latency, args.jitter, args.error_rate, record_requests=False)
+	print(f"Mock IdP listening on {idp.base_url}")
+	try:
+		idp.server.serve_forever()
+	except KeyboardInterrupt:
+		idp.server.server_close()
+
+
+if __name__ == "__main__":
+	main()
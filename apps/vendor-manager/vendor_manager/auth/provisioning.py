@@ -0,0 +1,254 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+User provisioning for the Auth0 login callbacks.
+
+A repeat login only needs to know that the user exists and already holds the
+app's essential roles. That answer is cached per user in Redis, so the common
+case costs one Redis GET: no document loads, no writes, no commit. On a cache
+miss one query returns the user together with whichever essential roles it
+holds, and any missing roles are inserted as Has Role rows in one batch.
+
+User doc_events drop the cached answer whenever a user is saved or deleted
+(which covers role changes made in the desk).
+
+A first login inserts only what a session needs (the User row, the
+essential roles and the app's initial roles) and leaves the User
+controller's work, names and bio to `enrich_user`, queued after commit.
+"""
+
+from functools import partial
+
+import frappe
+from frappe.desk.doctype.notification_settings.notification_settings import create_notification_settings
+from frappe.utils import now
+
+from vendor_manager.auth import metrics
+from vendor_manager.cache import get_redis, make_key
+
+# How each Auth0-backed app maps an IdP identity to a local user: the user name
+# prefix, the roles checked on every login, the roles granted on creation only
+# and the bio of a new user ({email} is the IdP email)
+APP_USERS = {
+	"lexicon": frappe._dict(
+		prefix="", roles=(), initial_roles=("Desk User",), bio="User authenticated via Auth0"
+	),
+	"vendor_manager": frappe._dict(
+		prefix="vendor-",
+		roles=("System Manager", "Desk User"),
+		initial_roles=(),
+		bio="Vendor Manager user authenticated via Auth0 ({email})",
+	),
+	"crm": frappe._dict(prefix="", roles=("System Manager", "Desk User", "All"), initial_roles=(), bio=None),
+}
+
+ROLES_OK_KEY = "vendor_manager:login_roles_ok:"
+ROLES_OK_SECONDS = 6 * 60 * 60
+
+# Just what login_as needs; the rest is filled in by enrich_user
+MINIMAL_USER_FIELDS = [
+	"name",
+	"email",
+	"first_name",
+	"full_name",
+	"enabled",
+	"user_type",
+	"send_welcome_email",
+	"owner",
+	"creation",
+	"modified",
+	"modified_by",
+]
+
+
+def get_user_name(app, email):
+	"""Local user name for IdP `email` logging in to `app`"""
+	return APP_USERS[app].prefix + email
+
+
+def provision_app_user(app, email, profile):
+	"""
+	`provision_user` with `app`'s conventions from APP_USERS.
+
+	Returns:
+		tuple: (user name, True if the user was created)
+	"""
+	conventions = APP_USERS[app]
+	user = get_user_name(app, email)
+	created = provision_user(
+		user,
+		profile,
+		roles=conventions.roles,
+		initial_roles=conventions.initial_roles,
+		bio=conventions.bio and conventions.bio.format(email=email),
+	)
+	return user, created
+
+
+def provision_user(email, profile, roles=(), initial_roles=(), bio=None):
+	"""
+	Make sure `email` exists and holds `roles`.
+
+	Args:
+		email (str): User name to log in as
+		profile (dict): IdP claims; given_name/family_name seed a new user's names
+		roles (iterable): Roles the user must hold on every login
+		initial_roles (iterable): Extra roles granted only when the user is created
+		bio (str): Bio for a new user
+
+	Returns:
+		bool: True if the user was created
+	"""
+	roles = sorted(set(roles))
+	signature = "|".join(roles)
+	r = get_redis()
+	with metrics.phase("roles_cache"):
+		if r.get(make_key(ROLES_OK_KEY + email)) == signature.encode():
+			return False
+
+	with metrics.phase("user_lookup"):
+		exists, held = get_user_roles(email, roles)
+	missing = [role for role in roles if role not in held]
+	if not exists:
+		with metrics.phase("user_create"):
+			_insert_minimal_user(email, profile)
+			add_roles(email, [*roles, *(role for role in initial_roles if role not in roles)])
+			frappe.enqueue(
+				"vendor_manager.auth.provisioning.enrich_user",
+				queue="short",
+				job_id=f"vendor_manager_enrich_user::{email}",
+				deduplicate=True,
+				enqueue_after_commit=True,
+				email=email,
+				profile={key: profile.get(key) for key in ("email", "given_name", "family_name")},
+				bio=bio,
+			)
+	elif missing:
+		with metrics.phase("role_reconcile"):
+			add_roles(email, missing)
+
+	if not exists or missing:
+		with metrics.phase("commit"):
+			frappe.db.commit()
+	r.set(make_key(ROLES_OK_KEY + email), signature, ex=ROLES_OK_SECONDS)
+	return not exists
+
+
+def get_user_roles(email, roles):
+	"""
+	One query for existence and role membership.
+
+	Returns:
+		tuple: (user exists, set of `roles` the user holds)
+	"""
+	User = frappe.qb.DocType("User")
+	HasRole = frappe.qb.DocType("Has Role")
+
+	if not roles:
+		return bool(frappe.qb.from_(User).select(User.name).where(User.name == email).run()), set()
+
+	rows = (
+		frappe.qb.from_(User)
+		.left_join(HasRole)
+		.on((HasRole.parent == User.name) & (HasRole.parenttype == "User") & HasRole.role.isin(roles))
+		.select(User.name, HasRole.role)
+		.where(User.name == email)
+		.run()
+	)
+	return bool(rows), {role for _name, role in rows if role}
+
+
+def add_roles(email, roles):
+	"""
+	Insert Has Role rows for those of `roles` the user lacks, in one statement,
+	without loading the User.
+
+	The User row is locked first, so concurrent first logins of the same user
+	take turns here and the later one sees the roles the earlier one added.
+	"""
+	if not roles:
+		return
+	frappe.db.sql("select name from `tabUser` where name = %s for update", email)
+	held = frappe.db.sql(
+		"select role, idx from `tabHas Role` where parent = %s and parenttype = 'User' for update",
+		email,
+	)
+	last_idx = max((idx or 0 for _role, idx in held), default=0)
+	held_roles = {role for role, _idx in held}
+	roles = [role for role in dict.fromkeys(roles) if role not in held_roles]
+	if not roles:
+		return
+
+	timestamp, owner = now(), frappe.session.user
+	fields = ["name", "parent", "parenttype", "parentfield", "role", "idx"]
+	values = [
+		(frappe.generate_hash(length=10), email, "User", "roles", role, last_idx + i)
+		for i, role in enumerate(roles, start=1)
+	]
+	frappe.db.bulk_insert(
+		"Has Role",
+		fields=[*fields, "owner", "creation", "modified", "modified_by"],
+		values=[(*row, owner, timestamp, timestamp, owner) for row in values],
+	)
+	frappe.clear_cache(user=email)
+	roles_changed([email])
+
+
+def mark_roles_ok(users):
+	"""Record that each of `users` ({user: roles}) holds its roles; call after commit"""
+	with get_redis().pipeline(transaction=False) as pipe:
+		for user, roles in users.items():
+			pipe.set(make_key(ROLES_OK_KEY + user), "|".join(sorted(set(roles))), ex=ROLES_OK_SECONDS)
+		pipe.execute()
+
+
+def roles_changed(users):
+	"""
+	Tell apps that cache per-session role state (the `user_roles_changed` hook)
+	that `users` were granted roles without a User save; they are called after commit.
+	"""
+	for method in frappe.get_hooks("user_roles_changed"):
+		frappe.db.after_commit.add(partial(frappe.get_attr(method), list(users)))
+
+
+def clear_roles_cache(email):
+	get_redis().delete(make_key(ROLES_OK_KEY + email))
+
+
+def on_user_change(doc, method=None):
+	frappe.db.after_commit.add(partial(clear_roles_cache, doc.name))
+
+
+def enrich_user(email, profile, bio=None):
+	"""
+	Background half of a first login: run the User controller and fill in the
+	profile. Safe to run more than once; fields already set are left alone.
+	"""
+	if not frappe.db.exists("User", email):
+		return
+
+	user = frappe.get_doc("User", email)
+	if not user.last_name and profile.get("family_name"):
+		user.last_name = profile["family_name"]
+	if not user.bio and bio:
+		user.bio = bio
+
+	# The save runs the controller (full_name, defaults, cache clearing)
+	user.save(ignore_permissions=True)
+
+	create_notification_settings(email)
+	frappe.cache.delete_key("enabled_users")
+
+
+def _insert_minimal_user(email, profile):
+	timestamp, owner = now(), frappe.session.user
+	first_name = profile.get("given_name") or (profile.get("email") or email).split("@")[0]
+	frappe.db.bulk_insert(
+		"User",
+		fields=MINIMAL_USER_FIELDS,
+		values=[
+			(email, email, first_name, first_name, 1, "System User", 0, owner, timestamp, timestamp, owner)
+		],
+		ignore_duplicates=True,
+	)
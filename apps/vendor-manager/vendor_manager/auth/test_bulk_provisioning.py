@@ -0,0 +1,67 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from vendor_manager.auth.bulk_provisioning import bulk_provision_users, provision_users
+from vendor_manager.auth.provisioning import clear_roles_cache, get_user_roles, provision_app_user
+
+EMAILS = ["bulk-a@example.com", "bulk-b@example.com"]
+USERS = ["bulk-a@example.com", "vendor-bulk-b@example.com"]
+
+
+class TestBulkProvisioning(FrappeTestCase):
+	def setUp(self):
+		self.delete_users()
+		self.addCleanup(self.delete_users)
+
+	def delete_users(self):
+		# Deleting the User also deletes its Has Role rows
+		for user in USERS:
+			frappe.delete_doc("User", user, ignore_missing=True, force=True)
+			clear_roles_cache(user)
+
+	def test_follows_app_conventions(self):
+		stats = provision_users(
+			[
+				{"email": EMAILS[0], "first_name": "Bulk", "last_name": "A", "app": "lexicon"},
+				{"email": EMAILS[1], "app": "vendor_manager"},
+				{"email": EMAILS[1], "app": "vendor_manager"},
+				{"email": "not-an-email", "app": "lexicon"},
+				{"email": EMAILS[0], "app": "unknown"},
+			]
+		)
+		self.assertEqual((stats["created"], stats["rejected"]), (2, 3))
+		self.assertEqual(frappe.db.get_value("User", USERS[0], "full_name"), "Bulk A")
+		self.assertEqual(get_user_roles(USERS[0], ["Desk User"]), (True, {"Desk User"}))
+		self.assertEqual(
+			get_user_roles(USERS[1], ["System Manager", "Desk User"]), (True, {"System Manager", "Desk User"})
+		)
+
+		# The first login finds the user ready and runs no queries
+		with self.assertQueryCount(0):
+			self.assertEqual(provision_app_user("vendor_manager", EMAILS[1], {}), (USERS[1], False))
+
+	def test_existing_users_get_missing_roles(self):
+		provision_users([{"email": EMAILS[1], "app": "vendor_manager"}])
+		frappe.db.delete("Has Role", {"parent": USERS[1], "role": "System Manager"})
+
+		stats = provision_users([{"email": EMAILS[1], "app": "vendor_manager"}])
+		self.assertEqual((stats["created"], stats["updated"]), (0, 1))
+		self.assertEqual(
+			get_user_roles(USERS[1], ["System Manager", "Desk User"]), (True, {"System Manager", "Desk User"})
+		)
+
+	def test_roles_granted_at_login_are_not_added_again(self):
+		provision_app_user("vendor_manager", EMAILS[1], {})
+		clear_roles_cache(USERS[1])
+
+		provision_users([{"email": EMAILS[1], "app": "vendor_manager"}])
+		roles = frappe.get_all("Has Role", filters={"parent": USERS[1]}, pluck="role")
+		self.assertEqual(len(roles), len(set(roles)))
+
+	def test_identities_must_be_objects(self):
+		stats = provision_users(["bulk-a@example.com"])
+		self.assertEqual(stats["rejected"], 1)
+		self.assertRaises(frappe.ValidationError, bulk_provision_users, '{"email": "bulk-a@example.com"}')
@@ -0,0 +1,111 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+import time
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from vendor_manager.auth import breaker, client, id_token
+from vendor_manager.auth.mock_idp import MockIdP
+
+
+class TestOAuthClient(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.idp = MockIdP().start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.idp.stop()
+		super().tearDownClass()
+
+	def setUp(self):
+		self.conf = {key: frappe.conf.get(key) for key in ("auth0_base_url", "auth0_lexicon_client_id")}
+		frappe.conf.auth0_base_url = self.idp.base_url
+		frappe.conf.auth0_lexicon_client_id = "lexicon-test-client"
+		id_token.clear_cache()
+		breaker.reset()
+
+	def tearDown(self):
+		frappe.conf.update(self.conf)
+		breaker.reset()
+
+	def test_logins_reuse_one_connection(self):
+		self.idp.connections.clear()
+		for code in ("alice", "bob"):
+			user_info = client.complete_login(
+				"lexicon", "lexicon.lexicon.auth.oauth.lexicon_callback", code=code
+			)
+			self.assertEqual(user_info["email"], f"{code}@example.com")
+
+		self.assertEqual(len(self.idp.connections), 1)
+
+	def test_profile_comes_from_id_token(self):
+		client.complete_login("lexicon", "lexicon.lexicon.auth.oauth.lexicon_callback", code="alice")
+		self.idp.requests.clear()
+
+		user_info = client.complete_login(
+			"lexicon", "lexicon.lexicon.auth.oauth.lexicon_callback", code="bob"
+		)
+		self.assertEqual(user_info["email"], "bob@example.com")
+		self.assertEqual(self.idp.requests, [("POST", "/oauth/token")])
+
+	def test_key_rotation_refetches_jwks(self):
+		client.complete_login("lexicon", "lexicon.lexicon.auth.oauth.lexicon_callback", code="alice")
+		self.idp.rotate_key()
+		self.idp.requests.clear()
+
+		client.complete_login("lexicon", "lexicon.lexicon.auth.oauth.lexicon_callback", code="alice")
+		self.assertIn(("GET", "/.well-known/jwks.json"), self.idp.requests)
+		self.assertNotIn(("GET", "/userinfo"), self.idp.requests)
+
+	def test_wrong_audience_is_rejected(self):
+		tokens = client.exchange_code("lexicon", "alice", "http://x")
+		self.assertRaises(
+			id_token.InvalidIDToken, id_token.verify_id_token, tokens["id_token"], "other-client"
+		)
+
+	def test_rejected_code(self):
+		self.assertRaises(
+			frappe.AuthenticationError,
+			client.complete_login,
+			"lexicon",
+			"lexicon.lexicon.auth.oauth.lexicon_callback",
+			code="invalid",
+		)
+
+	def test_unreachable_idp_fails_fast(self):
+		frappe.conf.auth0_base_url = "http://127.0.0.1:9"
+		self.assertRaises(breaker.IdPUnavailable, client.exchange_code, "lexicon", "alice", "http://x")
+
+	def test_breaker_opens_after_repeated_failures(self):
+		frappe.conf.auth0_base_url = "http://127.0.0.1:9"
+		for _attempt in range(breaker.FAILURE_THRESHOLD):
+			self.assertRaises(breaker.IdPUnavailable, client.exchange_code, "lexicon", "alice", "http://x")
+		self.assertTrue(breaker.is_open())
+
+		# Open: the healthy IdP is not even contacted, the callback gets a retry page
+		frappe.conf.auth0_base_url = self.idp.base_url
+		self.idp.requests.clear()
+		user_info = client.complete_login(
+			"lexicon", "lexicon.lexicon.auth.oauth.lexicon_callback", code="bob"
+		)
+		self.assertIsNone(user_info)
+		self.assertEqual(self.idp.requests, [])
+		self.assertEqual(frappe.local.response.get("http_status_code"), 503)
+
+	def test_full_slots_fail_fast(self):
+		frappe.conf.auth0_max_concurrent_requests = 1
+		self.addCleanup(frappe.conf.pop, "auth0_max_concurrent_requests")
+		breaker.get_redis().zadd(breaker._key("inflight"), {"held-by-another-worker": time.time()})
+
+		self.idp.requests.clear()
+		self.assertRaises(breaker.IdPUnavailable, client.exchange_code, "lexicon", "alice", "http://x")
+		self.assertEqual(self.idp.requests, [])
+
+	def test_jwks_cache_is_per_idp(self):
+		client.complete_login("lexicon", "lexicon.lexicon.auth.oauth.lexicon_callback", code="alice")
+		self.assertIsNotNone(frappe.cache.get_value(id_token._cache_key(self.idp.base_url)))
+		self.assertIsNone(frappe.cache.get_value(id_token._cache_key("https://tenant.example.auth0.com")))
@@ -0,0 +1,38 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from vendor_manager.auth import metrics
+
+
+@metrics.instrumented("test_app", "callback")
+def _login(fail=False):
+	with metrics.phase("token_exchange"):
+		pass
+	with metrics.phase("login_as"):
+		if fail:
+			raise frappe.AuthenticationError
+
+
+class TestLoginMetrics(FrappeTestCase):
+	def setUp(self):
+		metrics.reset_login_metrics()
+
+	def test_phases_are_recorded_per_outcome(self):
+		_login()
+		_login()
+		self.assertRaises(frappe.AuthenticationError, _login, fail=True)
+
+		summary = {(row["phase"], row["outcome"]): row for row in metrics.get_login_metrics(app="test_app")}
+		self.assertEqual(summary[("total", "ok")]["count"], 2)
+		self.assertEqual(summary[("token_exchange", "ok")]["count"], 3)
+		self.assertEqual(summary[("login_as", "error:AuthenticationError")]["count"], 1)
+		self.assertIsNotNone(summary[("total", "ok")]["p99_ms"])
+
+	def test_percentile_uses_bucket_bounds(self):
+		buckets = [0] * len(metrics.BUCKETS_MS)
+		buckets[0], buckets[4] = 90, 10
+		self.assertEqual(metrics.percentile(buckets, 0.5), 5)
+		self.assertEqual(metrics.percentile(buckets, 0.99), 100)
@@ -0,0 +1,58 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from vendor_manager.auth.provisioning import (
+	add_roles,
+	clear_roles_cache,
+	enrich_user,
+	get_user_roles,
+	provision_user,
+)
+
+TEST_USER = "provisioning-test@example.com"
+ROLES = ["Desk User", "System Manager"]
+
+
+class TestProvisioning(FrappeTestCase):
+	def setUp(self):
+		frappe.delete_doc("User", TEST_USER, ignore_missing=True, force=True)
+		clear_roles_cache(TEST_USER)
+
+	def test_first_login_creates_minimal_user_then_enriches(self):
+		profile = {"given_name": "Prov", "family_name": "Test"}
+		self.assertTrue(provision_user(TEST_USER, profile, roles=ROLES, initial_roles=["Blogger"], bio="Bio"))
+		self.assertEqual(frappe.db.get_value("User", TEST_USER, "first_name"), "Prov")
+		# Every role is there before the background job runs
+		self.assertEqual(get_user_roles(TEST_USER, [*ROLES, "Blogger"]), (True, {*ROLES, "Blogger"}))
+
+		# The queued job; running it twice must be harmless
+		for _attempt in range(2):
+			enrich_user(TEST_USER, profile, bio="Bio")
+		user = frappe.get_doc("User", TEST_USER)
+		self.assertEqual((user.full_name, user.bio), ("Prov Test", "Bio"))
+		self.assertEqual(sorted(r.role for r in user.roles), sorted([*ROLES, "Blogger"]))
+
+	def test_repeat_login_runs_no_queries(self):
+		provision_user(TEST_USER, {}, roles=ROLES)
+		with self.assertQueryCount(0):
+			self.assertFalse(provision_user(TEST_USER, {}, roles=ROLES))
+
+	def test_missing_roles_are_restored(self):
+		provision_user(TEST_USER, {}, roles=ROLES)
+		frappe.db.delete("Has Role", {"parent": TEST_USER, "role": "System Manager"})
+		clear_roles_cache(TEST_USER)
+
+		self.assertFalse(provision_user(TEST_USER, {}, roles=ROLES))
+		self.assertEqual(get_user_roles(TEST_USER, ROLES), (True, set(ROLES)))
+
+	def test_roles_already_held_are_not_added_again(self):
+		provision_user(TEST_USER, {}, roles=ROLES)
+		# What a second first login racing the first one does once it gets the User row lock
+		add_roles(TEST_USER, ROLES)
+		self.assertEqual(
+			frappe.db.count("Has Role", {"parent": TEST_USER, "parenttype": "User", "role": ("in", ROLES)}),
+			len(ROLES),
+		)
@@ -0,0 +1,19 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+import frappe
+import redis
+
+
+def get_redis():
+	"""
+	Plain Redis client on the site cache's connection pool.
+
+	frappe.cache re-prefixes keys in several of its overrides, so callers build
+	keys once with make_key and talk to Redis without the wrapper.
+	"""
+	return redis.Redis(connection_pool=frappe.cache.connection_pool)
+
+
+def make_key(key):
+	return frappe.cache.make_key(key)
@@ -0,0 +1,197 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("import-vendors")
+@click.argument("path")
+@click.option("--batch-size", default=1000, type=int, help="Rows validated and inserted per transaction")
+@click.option("--reject-file", help="Write rejected rows with their reason to this NDJSON file")
+@pass_context
+def import_vendors(context, path, batch_size, reject_file):
+	"""Bulk import vendors from a .csv or .ndjson file (optionally gzipped)"""
+	from vendor_manager.vendor_import import import_vendors
+
+	def report(stats):
+		click.echo(
+			"{read} read, {inserted} inserted, {rejected} rejected ({rows_per_second} rows/s)".format(**stats)
+		)
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		stats = import_vendors(path, batch_size=batch_size, reject_file=reject_file, progress=report)
+		click.echo(f"Done in {stats['seconds']}s")
+	finally:
+		frappe.destroy()
+
+
+@click.command("login-benchmark")
+@click.option("--app", "app", default="lexicon", type=click.Choice(["lexicon", "vendor_manager", "crm"]))
+@click.option("--new", "new_users", default=100, type=int, help="Logins by users that do not exist yet")
+@click.option("--returning", "returning_users", default=100, type=int, help="Logins by existing users")
+@click.option("--concurrency", default=8, type=int)
+@click.option("--idp-latency", default=0.0, type=float, help="Seconds the mock IdP adds per response")
+@click.option("--idp-jitter", default=0.0, type=float, help="Up to this many extra random seconds")
+@click.option("--idp-error-rate", default=0.0, type=float, help="Fraction of IdP requests failing with 503")
+@click.option("--keep-users", is_flag=True, default=False, help="Do not delete the users created by the run")
+@pass_context
+def login_benchmark(
+	context, app, new_users, returning_users, concurrency, idp_latency, idp_jitter, idp_error_rate, keep_users
+):
+	"""Run a login storm against a local mock Auth0 and report latency and queries per login"""
+	from vendor_manager.auth.loadtest import run_login_benchmark
+
+	report = run_login_benchmark(
+		get_site(context),
+		app=app,
+		new_users=new_users,
+		returning_users=returning_users,
+		concurrency=concurrency,
+		idp_latency=idp_latency,
+		idp_jitter=idp_jitter,
+		idp_error_rate=idp_error_rate,
+		cleanup=not keep_users,
+	)
+	click.echo(frappe.as_json(report))
+
+
+@click.command("provision-users")
+@click.argument("path")
+@click.option(
+	"--app",
+	type=click.Choice(["lexicon", "vendor_manager", "crm"]),
+	help="App for rows without an app column",
+)
+@click.option("--batch-size", default=500, type=int, help="Identities provisioned per transaction")
+@click.option("--reject-file", help="Write rejected rows with their reason to this NDJSON file")
+@pass_context
+def provision_users(context, path, app, batch_size, reject_file):
+	"""Pre-provision Auth0 users from a .csv or .ndjson file (email, first_name, last_name, app)"""
+	from vendor_manager.auth.bulk_provisioning import provision_users_from_file
+
+	def report(stats):
+		click.echo("{read} read, {created} created, {updated} updated, {rejected} rejected".format(**stats))
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		frappe.set_user("Administrator")
+		stats = provision_users_from_file(path, app=app, batch_size=batch_size, progress=report)
+		if reject_file:
+			with open(reject_file, "w") as rejects:
+				for row, reason in stats["rejects"]:
+					rejects.write(frappe.as_json({"row": row, "reason": reason}, indent=None) + "\n")
+		click.echo(f"Done in {stats['seconds']}s ({stats['rows_per_second']} rows/s)")
+	finally:
+		frappe.destroy()
+
+
+@click.command("reconcile-roles")
+@click.option("--dry-run", is_flag=True, default=False, help="Print the changes without applying them")
+@click.option("--force", is_flag=True, default=False, help="Reconcile even if the manifests are unchanged")
+@pass_context
+def reconcile_roles(context, dry_run, force):
+	"""Apply the apps' role and permission manifests"""
+	from vendor_manager.roles import format_diff, sync
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		frappe.set_user("Administrator")
+		diff = sync(dry_run=dry_run, force=force)
+		if diff is None:
+			click.echo("Role manifests unchanged since the last run; nothing to do")
+			return
+		for line in format_diff(diff) or ["No changes"]:
+			click.echo(line)
+	finally:
+		frappe.destroy()
+
+
+@click.command("export-doctypes")
+@click.argument("doctypes", nargs=-1)
+@click.option("--module", "modules", multiple=True, help="Also export every non-child DocType of this module")
+@click.option("--out", "out_dir", required=True, help="Output directory")
+@click.option("--since", help="Only documents modified after this datetime")
+@click.option(
+	"--incremental", is_flag=True, default=False, help="Continue after the previous export in --out"
+)
+@click.option("--chunk-size", default=5000, type=int, help="Rows read per query")
+@click.option("--no-schema", is_flag=True, default=False, help="Do not write the DocType schemas")
+@click.option("--workers", default=1, type=int, help="Processes exporting in parallel")
+@click.option("--shard-rows", default=100_000, type=int, help="With --workers, rows per part file")
+@pass_context
+def export_doctypes(
+	context, doctypes, modules, out_dir, since, incremental, chunk_size, no_schema, workers, shard_rows
+):
+	"""Stream DocTypes to gzip-compressed NDJSON, with their schemas"""
+	from vendor_manager.data_export import export_doctypes
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		doctypes = list(doctypes)
+		if modules:
+			doctypes += frappe.get_all(
+				"DocType",
+				filters={"module": ("in", modules), "istable": 0, "is_virtual": 0},
+				pluck="name",
+				order_by="name asc",
+			)
+		if not doctypes:
+			raise click.UsageError("Name at least one DocType or --module")
+
+		results = export_doctypes(
+			list(dict.fromkeys(doctypes)),
+			out_dir,
+			since=since,
+			incremental=incremental,
+			chunk_size=chunk_size,
+			schema=not no_schema,
+			workers=workers,
+			shard_rows=shard_rows,
+		)
+		for doctype, result in results.items():
+			click.echo(f"{doctype}: {result['rows']} rows -> {', '.join(result['files'])}")
+	finally:
+		frappe.destroy()
+
+
+@click.command("import-doctypes")
+@click.argument("in_dir")
+@click.argument("doctypes", nargs=-1)
+@click.option("--workers", default=1, type=int, help="Processes loading in parallel")
+@click.option("--batch-size", default=1000, type=int, help="Documents per transaction")
+@click.option("--replace", is_flag=True, default=False, help="Replace existing documents instead of skipping")
+@pass_context
+def import_doctypes(context, in_dir, doctypes, workers, batch_size, replace):
+	"""Load a directory written by export-doctypes, in Link dependency order"""
+	from vendor_manager.data_import import import_doctypes
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		frappe.set_user("Administrator")
+		results = import_doctypes(
+			in_dir, doctypes=doctypes, workers=workers, batch_size=batch_size, replace=replace
+		)
+		for doctype, stats in results.items():
+			click.echo(
+				f"{doctype}: {stats['read']} read, {stats['inserted']} inserted, {stats['skipped']} skipped"
+			)
+	finally:
+		frappe.destroy()
+
+
+commands = [
+	import_vendors,
+	login_benchmark,
+	provision_users,
+	reconcile_roles,
+	export_doctypes,
+	import_doctypes,
+]
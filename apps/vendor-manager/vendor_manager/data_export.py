@@ -0,0 +1,287 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Streaming export of any doctype to gzip-compressed NDJSON.
+
+Rows are read in keyset order on (modified, name), `chunk_size` at a time,
+so memory stays constant however large the table is. Each line is one
+document with its child table rows embedded under their table fields. The
+doctype's schema (meta with custom fields) is written next to the data.
+
+An `export.json` manifest in the output directory records, per doctype,
+the files written and the highest (modified, name) exported. An incremental
+export continues after that cursor and writes only documents created or
+modified since, to new files:
+
+	bench --site mysite export-doctypes Vendor Waitlist "CRM Lead" --out ./export
+	bench --site mysite export-doctypes Vendor --out ./export --incremental
+
+With `workers` > 1, doctypes and name ranges of `shard_rows` documents
+within large doctypes are exported as separate part files by a pool of
+processes, each with its own database connection. data_import loads them
+back the same way.
+
+Deletions are not captured by incremental exports.
+"""
+
+import gzip
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import pairwise
+
+import frappe
+from frappe import _
+from frappe.utils import get_datetime, now_datetime
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_SHARD_ROWS = 100_000
+MANIFEST_FILE = "export.json"
+
+
+def export_doctypes(
+	doctypes,
+	out_dir,
+	since=None,
+	incremental=False,
+	chunk_size=DEFAULT_CHUNK_SIZE,
+	schema=True,
+	workers=1,
+	shard_rows=DEFAULT_SHARD_ROWS,
+):
+	"""
+	Export `doctypes` into `out_dir`.
+
+	Args:
+		doctypes (list): DocType names
+		out_dir (str): Output directory; created if missing
+		since (str|datetime): Only documents modified after this
+		incremental (bool): Continue after the cursor recorded by the previous export
+		chunk_size (int): Rows per query
+		schema (bool): Also write each doctype's schema
+		workers (int): Processes exporting in parallel; 1 exports in this process
+		shard_rows (int): With workers, split doctypes into name ranges of about this many rows
+
+	Returns:
+		dict: {doctype: {"rows", "files", "schema", "cursor"}}
+	"""
+	os.makedirs(out_dir, exist_ok=True)
+	manifest = read_manifest(out_dir)
+	timestamp = now_datetime().strftime("%Y%m%d%H%M%S")
+
+	tasks, cursors, schemas = [], {}, {}
+	for doctype in doctypes:
+		meta = frappe.get_meta(doctype)
+		if meta.is_virtual:
+			frappe.throw(_("{0} is a virtual DocType and has no table to export").format(doctype))
+
+		previous = manifest["doctypes"].get(doctype, {})
+		cursor = None
+		if incremental and previous.get("cursor"):
+			cursor = previous["cursor"]
+		elif since:
+			cursor = [str(get_datetime(since)), None]
+		cursors[doctype] = cursor
+		schemas[doctype] = write_schema(meta, out_dir) if schema else previous.get("schema")
+
+		key_ranges = plan_key_ranges(meta, shard_rows) if workers > 1 else [None]
+		base = frappe.scrub(doctype) + (f".{timestamp}" if cursor else "")
+		for part, key_range in enumerate(key_ranges, start=1):
+			file_name = f"{base}.part-{part:04d}.ndjson.gz" if len(key_ranges) > 1 else f"{base}.ndjson.gz"
+			tasks.append((doctype, out_dir, file_name, cursor, key_range, chunk_size))
+
+	results = {
+		doctype: {"rows": 0, "files": [], "schema": schemas[doctype], "cursor": None} for doctype in doctypes
+	}
+	for task, shard in zip(tasks, run_tasks(export_shard, tasks, workers), strict=True):
+		result = results[task[0]]
+		result["rows"] += shard["rows"]
+		result["files"].append(shard["file"])
+		if shard["cursor"] and (not result["cursor"] or tuple(shard["cursor"]) > tuple(result["cursor"])):
+			result["cursor"] = shard["cursor"]
+
+	for doctype, result in results.items():
+		previous = manifest["doctypes"].get(doctype, {})
+		manifest["doctypes"][doctype] = {
+			"files": [*previous.get("files", []), *result["files"]] if cursors[doctype] else result["files"],
+			"schema": result["schema"],
+			"cursor": result["cursor"] or cursors[doctype],
+			"rows": result["rows"],
+			"exported_at": str(now_datetime()),
+		}
+	write_manifest(out_dir, manifest)
+	return results
+
+
+def export_shard(doctype, out_dir, file_name, cursor=None, key_range=None, chunk_size=DEFAULT_CHUNK_SIZE):
+	"""
+	Stream one doctype, or one name range of it, to `<out_dir>/<file_name>`.
+
+	Args:
+		cursor (list): [modified, name] to continue after; name may be None to
+			take every document modified after `modified`
+		key_range (list): [first name or None, end name (exclusive) or None]
+
+	Returns:
+		dict: {"rows", "file", "cursor"}; cursor is the highest [modified, name] written
+	"""
+	meta = frappe.get_meta(doctype)
+	rows, highest = 0, None
+	with gzip.open(os.path.join(out_dir, file_name), "wt", encoding="utf-8") as out:
+		for chunk in iter_chunks(meta, cursor, chunk_size, key_range):
+			for doc in chunk:
+				out.write(json.dumps(doc, default=str, separators=(",", ":")) + "\n")
+				key = (str(doc["modified"]), doc["name"])
+				if highest is None or key > highest:
+					highest = key
+			rows += len(chunk)
+
+	return {"rows": rows, "file": file_name, "cursor": list(highest) if highest else None}
+
+
+def iter_chunks(meta, cursor=None, chunk_size=DEFAULT_CHUNK_SIZE, key_range=None):
+	"""
+	Yield lists of documents (dicts with child rows embedded) after `cursor`.
+
+	Keyset order is (modified, name), or name within a `key_range`.
+	"""
+	if meta.issingle:
+		doc = frappe.get_doc(meta.name).as_dict(no_default_fields=False)
+		if not cursor or str(doc.modified) > cursor[0]:
+			yield [doc]
+		return
+
+	table = frappe.qb.DocType(meta.name)
+	position = cursor
+	last_name = None
+	while True:
+		query = _after(frappe.qb.from_(table).select("*").limit(chunk_size), table, position)
+		if key_range is None:
+			query = query.orderby(table.modified).orderby(table.name)
+		else:
+			if key_range[0] is not None:
+				query = query.where(table.name >= key_range[0])
+			if key_range[1] is not None:
+				query = query.where(table.name < key_range[1])
+			if last_name is not None:
+				query = query.where(table.name > last_name)
+			query = query.orderby(table.name)
+
+		chunk = query.run(as_dict=True)
+		if not chunk:
+			return
+		_attach_children(meta, chunk)
+		yield chunk
+		if len(chunk) < chunk_size:
+			return
+		if key_range is None:
+			position = [chunk[-1]["modified"], chunk[-1]["name"]]
+		else:
+			last_name = chunk[-1]["name"]
+
+
+def plan_key_ranges(meta, shard_rows=DEFAULT_SHARD_ROWS):
+	"""Split `meta`'s table into name ranges of about `shard_rows` rows; [None] for a single range"""
+	if meta.issingle:
+		return [None]
+
+	count = frappe.db.count(meta.name)
+	if count <= shard_rows:
+		return [None]
+
+	table = frappe.qb.DocType(meta.name)
+	bounds = []
+	for offset in range(shard_rows, count, shard_rows):
+		row = frappe.qb.from_(table).select(table.name).orderby(table.name).limit(1).offset(offset).run()
+		if row:
+			bounds.append(row[0][0])
+	edges = [None, *bounds, None]
+	return [[start, end] for start, end in pairwise(edges)]
+
+
+def run_tasks(function, tasks, workers=1):
+	"""
+	Run `function(*task)` for every task and return the results in order.
+
+	With workers > 1 the tasks run in a pool of fresh processes, each connected
+	to the current site once; otherwise here.
+	"""
+	if workers <= 1 or len(tasks) <= 1:
+		return [function(*task) for task in tasks]
+
+	with ProcessPoolExecutor(
+		max_workers=min(workers, len(tasks)),
+		# Forked children would share the parent's database connection
+		mp_context=multiprocessing.get_context("spawn"),
+		initializer=_connect_worker,
+		initargs=(frappe.local.site, frappe.local.sites_path),
+	) as pool:
+		futures = [pool.submit(function, *task) for task in tasks]
+		return [future.result() for future in futures]
+
+
+def write_schema(meta, out_dir):
+	file_name = f"{frappe.scrub(meta.name)}.schema.json"
+	with open(os.path.join(out_dir, file_name), "w") as f:
+		json.dump(meta.as_dict(), f, indent=1, default=str, sort_keys=True)
+	return file_name
+
+
+def read_manifest(out_dir):
+	path = os.path.join(out_dir, MANIFEST_FILE)
+	if not os.path.exists(path):
+		return {"site": frappe.local.site, "doctypes": {}}
+	with open(path) as f:
+		return json.load(f)
+
+
+def write_manifest(out_dir, manifest):
+	path = os.path.join(out_dir, MANIFEST_FILE)
+	with open(path + ".tmp", "w") as f:
+		json.dump(manifest, f, indent=1, sort_keys=True)
+	os.replace(path + ".tmp", path)
+
+
+def _connect_worker(site, sites_path):
+	frappe.init(site=site, sites_path=sites_path)
+	frappe.connect()
+	frappe.set_user("Administrator")
+
+
+def _after(query, table, cursor):
+	if not cursor:
+		return query
+	if cursor[1] is None:
+		return query.where(table.modified > cursor[0])
+	return query.where(
+		(table.modified > cursor[0]) | ((table.modified == cursor[0]) & (table.name > cursor[1]))
+	)
+
+
+def _attach_children(meta, chunk):
+	"""One query per child table for the whole chunk"""
+	table_fields = meta.get_table_fields()
+	if not table_fields:
+		return
+
+	by_name = {doc["name"]: doc for doc in chunk}
+	for doc in chunk:
+		for df in table_fields:
+			doc[df.fieldname] = []
+
+	for df in table_fields:
+		child = frappe.qb.DocType(df.options)
+		rows = (
+			frappe.qb.from_(child)
+			.select("*")
+			.where(child.parent.isin(list(by_name)))
+			.where(child.parenttype == meta.name)
+			.where(child.parentfield == df.fieldname)
+			.orderby(child.parent)
+			.orderby(child.idx)
+			.run(as_dict=True)
+		)
+		for row in rows:
+			by_name[row["parent"]][df.fieldname].append(row)
@@ -0,0 +1,216 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Parallel import of the files written by data_export.
+
+DocTypes are loaded in dependency levels: a DocType whose Link fields point
+at another DocType being imported (Waitlist.vendor_type -> Vendor) waits
+until that one is complete. Within a level every part file is loaded by a
+pool of processes, each with its own database connection. The part files
+of one export run hold disjoint name ranges. Incremental runs are applied
+after the run they build on, replacing the documents they contain.
+
+Rows are written with multi-row INSERTs, one transaction per batch, without
+running controllers, so the derived state that Vendor and Waitlist keep is
+refreshed afterwards, and naming series (Waitlist's WL-####) are moved past
+the highest imported number so new documents do not collide with them:
+
+	bench --site mysite import-doctypes ./export --workers 8
+"""
+
+import os
+import re
+
+import frappe
+from frappe import _
+
+from vendor_manager.data_export import read_manifest, run_tasks
+from vendor_manager.utils import batched, read_rows
+
+DEFAULT_BATCH_SIZE = 1000
+# Export runs after the first carry this timestamp after the DocType name
+RUN_PATTERN = re.compile(r"\.(\d{14})\.")
+# The part of a format: autoname before its {####} counter
+FORMAT_SERIES_PATTERN = re.compile(r"format:([^{}]*)\{#+\}")
+
+
+def import_doctypes(in_dir, doctypes=None, workers=1, batch_size=DEFAULT_BATCH_SIZE, replace=False):
+	"""
+	Load an export directory into the current site.
+
+	Args:
+		in_dir (str): Directory with export.json and the part files
+		doctypes (list): Subset of the exported DocTypes to load
+		workers (int): Processes loading in parallel; 1 loads in this process
+		batch_size (int): Documents per transaction
+		replace (bool): Replace documents that already exist instead of skipping them
+
+	Returns:
+		dict: {doctype: {"read", "inserted", "skipped"}}
+	"""
+	exported = read_manifest(in_dir)["doctypes"]
+	doctypes = list(doctypes or exported)
+	missing = [doctype for doctype in doctypes if doctype not in exported]
+	if missing:
+		frappe.throw(_("Not found in {0}: {1}").format(in_dir, ", ".join(missing)))
+
+	results = {doctype: {"read": 0, "inserted": 0, "skipped": 0} for doctype in doctypes}
+	for level in get_import_levels(doctypes):
+		runs = {doctype: _group_runs(exported[doctype]["files"]) for doctype in level}
+		for wave in range(max(len(files) for files in runs.values())):
+			tasks = [
+				(doctype, os.path.join(in_dir, file_name), batch_size, replace or wave > 0)
+				for doctype in level
+				if wave < len(runs[doctype])
+				for file_name in runs[doctype][wave]
+			]
+			for task, stats in zip(tasks, run_tasks(import_file, tasks, workers), strict=True):
+				for key, value in stats.items():
+					results[task[0]][key] += value
+
+	_refresh_derived_state(results)
+	advance_series([doctype for doctype, stats in results.items() if stats["inserted"]])
+	return results
+
+
+def import_file(doctype, path, batch_size=DEFAULT_BATCH_SIZE, replace=False):
+	"""
+	Load one NDJSON file of `doctype` documents (child rows embedded).
+
+	Returns:
+		dict: {"read", "inserted", "skipped"}
+	"""
+	meta = frappe.get_meta(doctype)
+	stats = {"read": 0, "inserted": 0, "skipped": 0}
+	if meta.issingle:
+		for doc in read_rows(path):
+			stats["read"] += 1
+			values = {df.fieldname: doc[df.fieldname] for df in meta.fields if df.fieldname in doc}
+			frappe.db.set_single_value(doctype, values)
+			stats["inserted"] += 1
+		frappe.db.commit()
+		return stats
+
+	columns = set(frappe.db.get_table_columns(doctype))
+	child_tables = {df.fieldname: df.options for df in meta.get_table_fields()}
+	child_columns = {child: set(frappe.db.get_table_columns(child)) for child in set(child_tables.values())}
+
+	for batch in batched(read_rows(path), batch_size):
+		stats["read"] += len(batch)
+		names = [doc["name"] for doc in batch]
+		if replace:
+			frappe.db.delete(doctype, {"name": ("in", names)})
+			for child in child_columns:
+				frappe.db.delete(child, {"parent": ("in", names), "parenttype": doctype})
+		else:
+			existing = set(frappe.get_all(doctype, filters={"name": ("in", names)}, pluck="name"))
+			stats["skipped"] += len(existing)
+			batch = [doc for doc in batch if doc["name"] not in existing]
+
+		_insert(doctype, batch, columns)
+		for fieldname, child in child_tables.items():
+			_insert(child, [row for doc in batch for row in doc.get(fieldname) or []], child_columns[child])
+		frappe.db.commit()
+		stats["inserted"] += len(batch)
+
+	return stats
+
+
+def get_import_levels(doctypes):
+	"""
+	Group `doctypes` so that each one comes after the DocTypes it links to.
+
+	Returns:
+		list: levels (lists of DocType names); each level can load in parallel
+	"""
+	wanted = set(doctypes)
+	depends_on = {}
+	for doctype in doctypes:
+		meta = frappe.get_meta(doctype)
+		links = {df.options for df in meta.get_link_fields()}
+		for df in meta.get_table_fields():
+			links |= {link.options for link in frappe.get_meta(df.options).get_link_fields()}
+		depends_on[doctype] = (links & wanted) - {doctype}
+
+	levels, done = [], set()
+	while len(done) < len(wanted):
+		level = sorted(doctype for doctype in wanted - done if depends_on[doctype] <= done)
+		if not level:
+			# Links in both directions: no order satisfies both, load the rest together
+			level = sorted(wanted - done)
+		levels.append(level)
+		done.update(level)
+	return levels
+
+
+def advance_series(doctypes):
+	"""
+	Set each DocType's naming series to at least the highest number among its
+	documents; bulk inserts bypass naming and leave the series behind.
+	"""
+	for doctype in doctypes:
+		series = get_series(frappe.get_meta(doctype).autoname)
+		if not series:
+			continue
+
+		key, prefix = series
+		pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+		highest = frappe.db.sql(
+			f"select max(cast(substring(name, %s) as unsigned)) from `tab{doctype}` where name like %s",
+			(len(prefix) + 1, pattern),
+		)[0][0]
+		if highest:
+			frappe.db.sql(
+				"""insert into `tabSeries` (name, current) values (%s, %s)
+				on duplicate key update current = greatest(current, values(current))""",
+				(key, highest),
+			)
+	frappe.db.commit()
+
+
+def get_series(autoname):
+	"""
+	The tabSeries key and the name prefix before the counter for `autoname`,
+	as frappe.model.naming resolves them; None if it does not use a series.
+
+	Only a counter right after fixed text is understood: "format:WL-{####}"
+	(counted under the key "") and "WL-.####" (counted under "WL-").
+	"""
+	if not autoname:
+		return None
+	if match := FORMAT_SERIES_PATTERN.fullmatch(autoname):
+		return "", match.group(1)
+	if ":" not in autoname:
+		prefix, _dot, counter = autoname.rpartition(".")
+		if prefix and set(counter) == {"#"} and not set(prefix) & set(".#{"):
+			return prefix, prefix
+	return None
+
+
+def _group_runs(files):
+	"""Split a DocType's files into export runs, oldest first"""
+	runs = {}
+	for file_name in files:
+		match = RUN_PATTERN.search(file_name)
+		runs.setdefault(match.group(1) if match else "", []).append(file_name)
+	return [runs[run] for run in sorted(runs)]
+
+
+def _insert(doctype, rows, columns):
+	if not rows:
+		return
+	fields = [field for field in rows[0] if field in columns]
+	values = [tuple(row.get(field) for field in fields) for row in rows]
+	frappe.db.bulk_insert(doctype, fields=fields, values=values)
+
+
+def _refresh_derived_state(results):
+	"""Controllers and doc_events were bypassed; rebuild what Vendor and Waitlist writes maintain"""
+	if results.get("Vendor", {}).get("inserted"):
+		for method in frappe.get_hooks("after_vendor_bulk_import"):
+			frappe.get_attr(method)()
+	if results.get("Waitlist", {}).get("inserted"):
+		from vendor_manager.waitlist_intake import rebuild_email_index
+
+		rebuild_email_index()
@@ -5,5 +5,42 @@ app_description = "Vendor and Waitlist Management"
 app_email = "dhruman@regos.ai"
 app_license = "mit"
 
+# Installation
+# ------------
+
+# Patches are marked as done on fresh installs, so create the indexes here too
+after_install = "vendor_manager.indexes.ensure_indexes"
+
+# Applies the role manifests; a no-op while they are unchanged
+after_migrate = ["vendor_manager.roles.sync"]
+
+# Roles and permissions, reconciled by vendor_manager.roles.reconcile
+role_manifests = ["vendor_manager.roles.MANIFEST"]
+
+# Hot-path queries EXPLAINed by vendor_manager.indexes.check_query_plans
+query_plan_checks = ["vendor_manager.indexes.get_query_plan_checks"]
+
+# Document Events
+# ---------------
+
+doc_events = {
+	# Drops the cached "roles already satisfied" answer used on login
+	"User": {
+		"on_update": "vendor_manager.auth.provisioning.on_user_change",
+		"on_trash": "vendor_manager.auth.provisioning.on_user_change",
+	},
+	"Waitlist": {
+		"after_insert": "vendor_manager.waitlist_intake.on_waitlist_insert",
+		"on_trash": "vendor_manager.waitlist_intake.on_waitlist_trash",
+	},
+}
+
+# Scheduled Tasks
+# ---------------
+
+scheduler_events = {
+	"daily": ["vendor_manager.waitlist_intake.rebuild_email_index"],
+}
+
 # Automatically update python controller files with type annotations for this app.
 # export_python_type_annotations = True
@@ -0,0 +1,102 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Secondary indexes for the access paths the apps actually use, and a checker
+that EXPLAINs those queries so a missing index shows up as a failure instead
+of a slow page. Apps register the queries to check, built by the same code
+that issues them, through the `query_plan_checks` hook.
+"""
+
+import frappe
+from frappe import _
+
+# Tables smaller than this are full-scanned by design, so check_query_plans ignores them
+MIN_TABLE_ROWS = 10_000
+
+# doctype -> composite indexes (leading column first)
+INDEXES = {
+	"Vendor": [
+		# directory listing and keyset pages: ORDER BY vendor_name, name
+		("vendor_name", "name"),
+		# facet-filtered listings
+		("status", "type", "vendor_name"),
+		("type", "vendor_name"),
+	],
+	"Waitlist": [
+		# duplicate signup checks, optionally per vendor
+		("email", "vendor_type"),
+		# Link lookups from Vendor (e.g. link checks on delete)
+		("vendor_type",),
+	],
+}
+
+
+def ensure_indexes():
+	"""Create any declared index that is missing. Idempotent."""
+	for doctype, indexes in INDEXES.items():
+		if not frappe.db.table_exists(doctype):
+			continue
+		for fields in indexes:
+			frappe.db.add_index(doctype, list(fields), index_name=index_name(fields))
+
+
+def index_name(fields):
+	return "_".join(fields) + "_index"
+
+
+def get_known_queries():
+	"""(label, query) pairs from every app's `query_plan_checks` hook"""
+	queries = []
+	for method in frappe.get_hooks("query_plan_checks"):
+		queries.extend(frappe.get_attr(method)())
+	return queries
+
+
+def get_query_plan_checks():
+	"""vendor_manager's hot-path queries, built the same way the code issuing them does"""
+	from vendor_manager.waitlist_intake import existing_emails_query
+
+	return [
+		("waitlist intake email dedupe", existing_emails_query(["someone@example.com", "other@example.com"])),
+		# The query Frappe's link check runs before a Vendor is deleted
+		(
+			"waitlist by vendor",
+			frappe.qb.get_query("Waitlist", fields=["name"], filters={"vendor_type": "Acme"}),
+		),
+	]
+
+
+def check_query_plans(raise_exception=True, min_rows=MIN_TABLE_ROWS, queries=None):
+	"""
+	EXPLAIN every known query and report the ones that scan a whole table.
+
+	Tables the optimizer estimates below `min_rows` rows are skipped: for
+	those a full scan is cheaper than an index and MariaDB rightly picks it.
+
+	Run with `bench --site <site> execute vendor_manager.indexes.check_query_plans`.
+	Returns a list of {"query", "table", "type", "rows"} for offending plans.
+	"""
+	full_scans = []
+	for label, query in queries or get_known_queries():
+		sql = query if isinstance(query, str) else query.get_sql()
+		for step in frappe.db.sql(f"EXPLAIN {sql}", as_dict=True):
+			if (step.get("type") or "").upper() == "ALL" and (step.get("rows") or 0) >= min_rows:
+				full_scans.append(
+					{
+						"query": label,
+						"table": step.get("table"),
+						"type": step.get("type"),
+						"rows": step.get("rows"),
+					}
+				)
+
+	if full_scans and raise_exception:
+		frappe.throw(
+			_("Full table scans in: {0}").format(
+				", ".join(f"{s['query']} ({s['table']})" for s in full_scans)
+			),
+			title=_("Missing Index"),
+		)
+
+	return full_scans
@@ -0,0 +1,6 @@
+from vendor_manager.indexes import ensure_indexes
+
+
+def execute():
+	"""Add composite indexes for Vendor and Waitlist access paths"""
+	ensure_indexes()
@@ -0,0 +1,369 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Declarative roles and permissions, and a reconciler that applies them.
+
+Apps declare what they need in a MANIFEST and list it in the
+`role_manifests` hook:
+
+	MANIFEST = {
+		"roles": [{"role_name": ..., "desk_access": 1}],
+		# flags not given are 0; permlevel defaults to 0
+		"docperms": [{"doctype": ..., "role": ..., "read": 1, ...}],
+		# removes every permission `role` has on `doctype`
+		"revoke": [{"doctype": ..., "role": ...}],
+		# roles added to a Page (existing roles are kept)
+		"pages": [{"page": ..., "roles": [...]}],
+	}
+
+`reconcile()` reads the current Role, DocPerm / Custom DocPerm and Page role
+rows with one query each, computes the difference and writes it with
+multi-row statements, then clears the caches once. Running it again with
+nothing to change writes nothing.
+
+`sync()` runs after every migrate. It stores a hash of the applied manifest
+per site and does nothing at all while the manifests are unchanged;
+`bench --site mysite reconcile-roles --dry-run` prints the diff instead.
+"""
+
+import hashlib
+import json
+
+import frappe
+from frappe.utils import now
+
+HASH_KEY = "vendor_manager_role_manifest_hash"
+PERM_FLAGS = ["read", "write", "create", "delete", "submit", "cancel", "amend"]
+# Copied when a doctype's standard permissions are first turned into custom ones
+COPIED_PERM_FIELDS = [
+	"role",
+	"permlevel",
+	"if_owner",
+	"select",
+	"read",
+	"write",
+	"create",
+	"delete",
+	"submit",
+	"cancel",
+	"amend",
+	"report",
+	"export",
+	"import",
+	"share",
+	"print",
+	"email",
+]
+
+MANIFEST = {
+	"roles": [{"role_name": "Vendor Manager User", "desk_access": 1}],
+	"docperms": [
+		{"doctype": "Vendor", "role": "Vendor Manager User", "read": 1, "write": 1, "create": 1, "delete": 1},
+		{
+			"doctype": "Waitlist",
+			"role": "Vendor Manager User",
+			"read": 1,
+			"write": 1,
+			"create": 1,
+			"delete": 1,
+		},
+	],
+}
+
+
+def get_manifest():
+	"""All installed apps' manifests merged, in app install order"""
+	manifest = {"roles": [], "docperms": [], "revoke": [], "pages": []}
+	for path in frappe.get_hooks("role_manifests"):
+		for key, entries in frappe.get_attr(path).items():
+			manifest[key].extend(entries)
+	return manifest
+
+
+def sync(dry_run=False, force=False):
+	"""
+	Reconcile all apps' manifests unless this site already applied the same ones.
+
+	Args:
+		dry_run (bool): Only compute the diff; nothing is written
+		force (bool): Reconcile even if the stored manifest hash matches
+
+	Returns:
+		dict: the diff (applied unless `dry_run`), or None when skipped
+	"""
+	manifest = get_manifest()
+	manifest_hash = get_manifest_hash(manifest)
+	if not (dry_run or force) and frappe.db.get_global(HASH_KEY) == manifest_hash:
+		return None
+
+	diff = get_diff(manifest)
+	if dry_run:
+		return diff
+
+	apply_diff(diff)
+	# Retry on the next migrate while something (a doctype, a page) is still missing
+	if not diff["skipped"]:
+		frappe.db.set_global(HASH_KEY, manifest_hash)
+	frappe.db.commit()
+	return diff
+
+
+def get_manifest_hash(manifest):
+	return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()
+
+
+def reconcile(manifest=None):
+	"""
+	Bring the site in line with `manifest` (default: all apps' manifests).
+
+	Returns:
+		dict: the applied diff, see `get_diff`
+	"""
+	diff = get_diff(manifest or get_manifest())
+	apply_diff(diff)
+	return diff
+
+
+def get_diff(manifest):
+	"""
+	Compare `manifest` with the database.
+
+	Returns:
+		dict: {"roles_insert", "roles_update", "docperms_insert", "docperms_update",
+		"docperms_delete", "standard_docperms_delete", "page_roles_insert", "skipped"};
+		every value is a list of row dicts (or messages for "skipped")
+	"""
+	diff = {
+		"roles_insert": [],
+		"roles_update": [],
+		"docperms_insert": [],
+		"docperms_update": [],
+		"docperms_delete": [],
+		"standard_docperms_delete": [],
+		"page_roles_insert": [],
+		"skipped": [],
+	}
+	_diff_roles(manifest["roles"], diff)
+	_diff_docperms(manifest["docperms"], manifest["revoke"], diff)
+	_diff_pages(manifest["pages"], diff)
+	return diff
+
+
+def has_changes(diff):
+	return any(rows for key, rows in diff.items() if key != "skipped")
+
+
+def format_diff(diff):
+	"""One line per change: "+" added, "~" changed, "-" removed, "!" skipped"""
+	lines = [f"+ Role {row['role_name']} (desk_access={row['desk_access']})" for row in diff["roles_insert"]]
+	lines += [f"~ Role {row['name']}: {_format_changes(row)}" for row in diff["roles_update"]]
+	for row in diff["docperms_insert"]:
+		flags = ", ".join(flag for flag in PERM_FLAGS if row.get(flag)) or "no flags"
+		lines.append(f"+ Custom DocPerm {_format_perm(row)}: {flags}")
+	lines += [
+		f"~ Custom DocPerm {_format_perm(row)}: {_format_changes(row)}" for row in diff["docperms_update"]
+	]
+	lines += [f"- Custom DocPerm {_format_perm(row)}" for row in diff["docperms_delete"]]
+	lines += [f"- DocPerm {_format_perm(row)}" for row in diff["standard_docperms_delete"]]
+	lines += [f"+ Page {row['parent']} role {row['role']}" for row in diff["page_roles_insert"]]
+	lines += [f"! {message}" for message in diff["skipped"]]
+	return lines
+
+
+def _format_perm(row):
+	return f"{row['parent']} / {row['role']} (level {row.get('permlevel', 0)})"
+
+
+def _format_changes(row):
+	return ", ".join(f"{field} {old} -> {row[field]}" for field, old in row["previous"].items())
+
+
+def apply_diff(diff):
+	"""Write `diff` with multi-row statements and clear the caches once. Does not commit."""
+	if not has_changes(diff):
+		return
+
+	timestamp, owner = now(), frappe.session.user
+	stamp = {"owner": owner, "creation": timestamp, "modified": timestamp, "modified_by": owner}
+
+	_insert("Role", [dict(row, name=row["role_name"], **stamp) for row in diff["roles_insert"]])
+	_update_grouped("Role", diff["roles_update"], ["desk_access", "disabled"], timestamp)
+
+	docperm = {"parenttype": "DocType", "parentfield": "permissions", **stamp}
+	_insert(
+		"Custom DocPerm",
+		[dict(row, name=frappe.generate_hash(length=10), **docperm) for row in diff["docperms_insert"]],
+	)
+	_update_grouped("Custom DocPerm", diff["docperms_update"], PERM_FLAGS, timestamp)
+	_delete("Custom DocPerm", diff["docperms_delete"])
+	_delete("DocPerm", diff["standard_docperms_delete"])
+
+	page_role = {"parenttype": "Page", "parentfield": "roles", **stamp}
+	_insert(
+		"Has Role",
+		[dict(row, name=frappe.generate_hash(length=10), **page_role) for row in diff["page_roles_insert"]],
+	)
+
+	frappe.clear_cache()
+
+
+def _diff_roles(roles, diff):
+	if not roles:
+		return
+
+	current = {
+		row.name: row
+		for row in frappe.get_all(
+			"Role",
+			filters={"name": ("in", [role["role_name"] for role in roles])},
+			fields=["name", "desk_access", "disabled"],
+		)
+	}
+	for role in roles:
+		wanted = {"desk_access": role.get("desk_access", 1), "disabled": 0}
+		row = current.get(role["role_name"])
+		if not row:
+			diff["roles_insert"].append({"role_name": role["role_name"], **wanted})
+		elif any(row[field] != value for field, value in wanted.items()):
+			previous = {field: row[field] for field, value in wanted.items() if row[field] != value}
+			diff["roles_update"].append({"name": row.name, **wanted, "previous": previous})
+
+
+def _diff_docperms(docperms, revoke, diff):
+	doctypes = sorted({perm["doctype"] for perm in (*docperms, *revoke)})
+	if not doctypes:
+		return
+
+	existing_doctypes = set(frappe.get_all("DocType", filters={"name": ("in", doctypes)}, pluck="name"))
+	custom, standard = {}, {}
+	for row in _get_perms("Custom DocPerm", doctypes):
+		custom.setdefault(row.parent, []).append(row)
+	for row in _get_perms("DocPerm", doctypes):
+		standard.setdefault(row.parent, []).append(row)
+
+	for doctype in doctypes:
+		if doctype not in existing_doctypes:
+			diff["skipped"].append(f"DocType {doctype} does not exist")
+			continue
+
+		revoked = {perm["role"] for perm in revoke if perm["doctype"] == doctype}
+		wanted = {
+			(perm["role"], perm.get("permlevel", 0)): {flag: perm.get(flag, 0) for flag in PERM_FLAGS}
+			for perm in docperms
+			if perm["doctype"] == doctype and perm["role"] not in revoked
+		}
+
+		diff["standard_docperms_delete"] += [
+			{"name": row.name, "parent": doctype, "role": row.role}
+			for row in standard.get(doctype, [])
+			if row.role in revoked
+		]
+
+		rows = custom.get(doctype)
+		if rows is None and not wanted:
+			# Revoking standard permissions only needs the deletes above
+			continue
+		if rows is None:
+			# Once a doctype has any custom permission its standard ones stop applying,
+			# so they are copied over first (as frappe.permissions.setup_custom_perms does)
+			rows = [frappe._dict(row, name=None) for row in standard.get(doctype, [])]
+
+		last_idx = max((row.idx or 0 for row in rows), default=0)
+		for row in rows:
+			key = (row.role, row.permlevel)
+			if row.role in revoked:
+				if row.name:
+					diff["docperms_delete"].append({"name": row.name, "parent": doctype, "role": row.role})
+				continue
+
+			flags = wanted.pop(key, None)
+			if row.name is None:
+				copied = {field: row[field] for field in COPIED_PERM_FIELDS}
+				diff["docperms_insert"].append({**copied, **(flags or {}), "parent": doctype, "idx": row.idx})
+			elif flags and any(row[flag] != value for flag, value in flags.items()):
+				previous = {flag: row[flag] for flag, value in flags.items() if row[flag] != value}
+				diff["docperms_update"].append(
+					{
+						"name": row.name,
+						"parent": doctype,
+						"role": row.role,
+						"permlevel": row.permlevel,
+						**flags,
+						"previous": previous,
+					}
+				)
+
+		for (role, permlevel), flags in wanted.items():
+			last_idx += 1
+			row = dict.fromkeys(COPIED_PERM_FIELDS, 0)
+			row.update(flags, parent=doctype, role=role, permlevel=permlevel, idx=last_idx)
+			diff["docperms_insert"].append(row)
+
+
+def _diff_pages(pages, diff):
+	if not pages:
+		return
+
+	names = [page["page"] for page in pages]
+	existing_pages = set(frappe.get_all("Page", filters={"name": ("in", names)}, pluck="name"))
+	held, last_idx = {}, {}
+	for parent, role, idx in frappe.get_all(
+		"Has Role",
+		filters={"parenttype": "Page", "parent": ("in", names)},
+		fields=["parent", "role", "idx"],
+		as_list=True,
+	):
+		held.setdefault(parent, set()).add(role)
+		last_idx[parent] = max(last_idx.get(parent, 0), idx or 0)
+
+	for page in pages:
+		if page["page"] not in existing_pages:
+			diff["skipped"].append(f"Page {page['page']} does not exist")
+			continue
+		for role in page["roles"]:
+			if role not in held.setdefault(page["page"], set()):
+				held[page["page"]].add(role)
+				last_idx[page["page"]] = last_idx.get(page["page"], 0) + 1
+				diff["page_roles_insert"].append(
+					{"parent": page["page"], "role": role, "idx": last_idx[page["page"]]}
+				)
+
+
+def _get_perms(doctype, parents):
+	# query builder rather than get_all: "select", "create" and "delete" are column names here
+	table = frappe.qb.DocType(doctype)
+	fields = ["name", "parent", "idx", *COPIED_PERM_FIELDS]
+	return (
+		frappe.qb.from_(table)
+		.select(*(table[field] for field in fields))
+		.where(table.parent.isin(parents))
+		.run(as_dict=True)
+	)
+
+
+def _insert(doctype, rows):
+	if not rows:
+		return
+	fields = sorted({field for row in rows for field in row})
+	values = [tuple(row.get(field) for field in fields) for row in rows]
+	frappe.db.bulk_insert(doctype, fields=fields, values=values)
+
+
+def _update_grouped(doctype, rows, fields, timestamp):
+	"""One UPDATE per distinct set of values"""
+	groups = {}
+	for row in rows:
+		groups.setdefault(tuple(row[field] for field in fields), []).append(row["name"])
+
+	table = frappe.qb.DocType(doctype)
+	for values, names in groups.items():
+		query = frappe.qb.update(table).set(table.modified, timestamp).where(table.name.isin(names))
+		for field, value in zip(fields, values, strict=True):
+			query = query.set(table[field], value)
+		query.run()
+
+
+def _delete(doctype, rows):
+	if rows:
+		frappe.db.delete(doctype, {"name": ("in", [row["name"] for row in rows])})
@@ -0,0 +1,64 @@
+# Copyright (c) 2025, APAS and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from vendor_manager import roles
+
+TEST_ROLE = "_Test Manifest Role"
+MANIFEST = {
+	"roles": [{"role_name": TEST_ROLE, "desk_access": 1}],
+	"docperms": [{"doctype": "Waitlist", "role": TEST_ROLE, "read": 1, "write": 1}],
+	"revoke": [],
+	"pages": [],
+}
+
+
+class TestRoleManifest(FrappeTestCase):
+	def tearDown(self):
+		# reconcile does not commit; this also drops the Waitlist permissions it copied
+		frappe.db.rollback()
+		frappe.clear_cache(doctype="Waitlist")
+		frappe.defaults.clear_cache("__global")
+
+	def test_reconcile_is_idempotent(self):
+		diff = roles.reconcile(MANIFEST)
+		self.assertEqual(len(diff["roles_insert"]), 1)
+		self.assertTrue(frappe.db.exists("Role", TEST_ROLE))
+		perm = frappe.db.get_value(
+			"Custom DocPerm", {"parent": "Waitlist", "role": TEST_ROLE}, ["read", "write", "delete"]
+		)
+		self.assertEqual(tuple(perm), (1, 1, 0))
+		# standard permissions were carried over with the first custom one
+		self.assertTrue(frappe.db.exists("Custom DocPerm", {"parent": "Waitlist", "role": "System Manager"}))
+
+		self.assertFalse(roles.has_changes(roles.get_diff(MANIFEST)))
+
+	def test_changed_flags_are_updated(self):
+		roles.reconcile(MANIFEST)
+		changed = dict(MANIFEST, docperms=[dict(MANIFEST["docperms"][0], write=0, delete=1)])
+		diff = roles.reconcile(changed)
+		self.assertEqual(len(diff["docperms_update"]), 1)
+		perm = frappe.db.get_value(
+			"Custom DocPerm", {"parent": "Waitlist", "role": TEST_ROLE}, ["write", "delete"]
+		)
+		self.assertEqual(tuple(perm), (0, 1))
+
+	def test_sync_skips_unchanged_manifests(self):
+		roles.sync(force=True)
+		self.assertEqual(frappe.db.get_global(roles.HASH_KEY), roles.get_manifest_hash(roles.get_manifest()))
+		with self.assertQueryCount(1):
+			self.assertIsNone(roles.sync())
+
+	def test_dry_run_writes_nothing(self):
+		frappe.db.set_global(roles.HASH_KEY, "stale")
+		original = roles.get_manifest
+		roles.get_manifest = lambda: MANIFEST
+		try:
+			diff = roles.sync(dry_run=True)
+		finally:
+			roles.get_manifest = original
+		self.assertIn(f"+ Role {TEST_ROLE} (desk_access=1)", roles.format_diff(diff))
+		self.assertFalse(frappe.db.exists("Role", TEST_ROLE))
+		self.assertEqual(frappe.db.get_global(roles.HASH_KEY), "stale")
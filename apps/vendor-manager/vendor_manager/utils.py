@@ -0,0 +1,48 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""Helpers shared by the bulk import, export and provisioning pipelines"""
+
+import csv
+import gzip
+import io
+import json
+import time
+
+import frappe
+from frappe import _
+
+
+def read_rows(path):
+	"""Lazily yield dicts from a .csv or .ndjson/.jsonl file, optionally gzipped"""
+	opener = gzip.open if path.endswith(".gz") else open
+	name = path[:-3] if path.endswith(".gz") else path
+
+	with opener(path, "rb") as raw:
+		stream = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+		if name.endswith((".ndjson", ".jsonl")):
+			for line in stream:
+				if line.strip():
+					yield json.loads(line)
+		elif name.endswith(".csv"):
+			yield from csv.DictReader(stream)
+		else:
+			frappe.throw(_("Unsupported file type for {0}; use .csv or .ndjson").format(path))
+
+
+def batched(rows, size):
+	"""Yield lists of up to `size` items from `rows`"""
+	batch = []
+	for row in rows:
+		batch.append(row)
+		if len(batch) >= size:
+			yield batch
+			batch = []
+	if batch:
+		yield batch
+
+
+def with_rate(stats, started):
+	"""`stats` plus the seconds since `started` (time.monotonic) and the "read" rows per second"""
+	seconds = max(time.monotonic() - started, 1e-6)
+	return dict(stats, seconds=round(seconds, 3), rows_per_second=round(stats["read"] / seconds, 1))
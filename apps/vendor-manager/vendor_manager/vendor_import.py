@@ -0,0 +1,162 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Streaming bulk import for the Vendor doctype.
+
+Rows are read lazily from CSV or NDJSON (optionally gzipped), validated and
+checked for `field:vendor_name` naming conflicts a batch at a time, and
+written with multi-row INSERTs, one transaction per batch. Only the current
+batch is held in memory, so large files import in constant memory.
+
+The per-document controller is bypassed, so apps that keep derived state
+about vendors are told through the `after_vendor_bulk_import` hook.
+"""
+
+import json
+import time
+
+import frappe
+from frappe.utils import now, validate_email_address
+
+from vendor_manager.utils import batched, read_rows, with_rate
+
+VENDOR_FIELDS = ["vendor_name", "type", "email", "phone", "status", "description"]
+DEFAULT_BATCH_SIZE = 1000
+# Data fields are varchar(140); a longer value would fail the whole INSERT
+MAX_DATA_LENGTH = 140
+DATA_FIELDS = ["vendor_name", "email", "phone"]
+
+
+def import_vendors(path, batch_size=DEFAULT_BATCH_SIZE, reject_file=None, progress=None):
+	"""
+	Import vendors from `path` (.csv, .ndjson/.jsonl, optionally .gz).
+
+	Args:
+		path (str): Source file
+		batch_size (int): Rows validated and inserted per transaction
+		reject_file (str): Optional NDJSON file receiving every rejected row with its reason
+		progress (callable): Optional callback receiving the running stats after each batch
+
+	Returns:
+		dict: {"read", "inserted", "rejected", "seconds", "rows_per_second"}
+	"""
+	meta = frappe.get_meta("Vendor")
+	options = {field: _select_options(meta, field) for field in ("type", "status")}
+	defaults = _get_defaults()
+
+	stats = {"read": 0, "inserted": 0, "rejected": 0}
+	started = time.monotonic()
+	rejects = open(reject_file, "w") if reject_file else None
+
+	try:
+		# Batches commit one by one, so derived state must be refreshed even if a later batch fails
+		for batch in batched(read_rows(path), batch_size):
+			stats["read"] += len(batch)
+			accepted, rejected = _validate_batch(batch, options)
+			accepted, conflicts = _resolve_conflicts(accepted)
+			rejected += conflicts
+
+			_insert_batch(accepted, defaults)
+			frappe.db.commit()
+
+			stats["inserted"] += len(accepted)
+			stats["rejected"] += len(rejected)
+			if rejects:
+				for row, reason in rejected:
+					rejects.write(json.dumps({"row": row, "reason": reason}, default=str) + "\n")
+			if progress:
+				progress(with_rate(stats, started))
+	finally:
+		if rejects:
+			rejects.close()
+		if stats["inserted"]:
+			for method in frappe.get_hooks("after_vendor_bulk_import"):
+				frappe.get_attr(method)()
+
+	return with_rate(stats, started)
+
+
+def _validate_batch(batch, options):
+	accepted, rejected, seen = [], [], set()
+	for raw in batch:
+		row = {
+			field: (str(raw.get(field)).strip() if raw.get(field) not in (None, "") else None)
+			for field in VENDOR_FIELDS
+		}
+		too_long = next((field for field in DATA_FIELDS if len(row[field] or "") > MAX_DATA_LENGTH), None)
+		reason = None
+
+		if not row["vendor_name"]:
+			reason = "vendor_name is required"
+		elif too_long:
+			reason = f"{too_long} longer than {MAX_DATA_LENGTH} characters"
+		elif row["vendor_name"].casefold() in seen:
+			reason = "duplicate vendor_name in file"
+		elif row["type"] and row["type"] not in options["type"]:
+			reason = f"invalid type {row['type']}"
+		elif row["status"] and row["status"] not in options["status"]:
+			reason = f"invalid status {row['status']}"
+		elif row["email"] and not validate_email_address(row["email"]):
+			reason = f"invalid email {row['email']}"
+
+		if reason:
+			rejected.append((raw, reason))
+		else:
+			seen.add(row["vendor_name"].casefold())
+			accepted.append(row)
+	return accepted, rejected
+
+
+def _resolve_conflicts(rows):
+	"""Split off rows whose name is already taken; the name column compares case-insensitively"""
+	if not rows:
+		return rows, []
+
+	existing = {
+		name.casefold()
+		for name in frappe.get_all(
+			"Vendor", filters={"name": ["in", [row["vendor_name"] for row in rows]]}, pluck="name"
+		)
+	}
+	accepted = [row for row in rows if row["vendor_name"].casefold() not in existing]
+	conflicts = [(row, "vendor already exists") for row in rows if row["vendor_name"].casefold() in existing]
+	return accepted, conflicts
+
+
+def _insert_batch(rows, defaults):
+	if not rows:
+		return
+
+	timestamp, user = now(), frappe.session.user
+	fields = ["name", "owner", "creation", "modified", "modified_by", "docstatus", "idx", *VENDOR_FIELDS]
+	values = [
+		(
+			row["vendor_name"],
+			user,
+			timestamp,
+			timestamp,
+			user,
+			0,
+			0,
+			*(row[field] if row[field] is not None else defaults.get(field) for field in VENDOR_FIELDS),
+		)
+		for row in rows
+	]
+	frappe.db.bulk_insert("Vendor", fields=fields, values=values, chunk_size=len(values))
+
+
+def _get_defaults():
+	"""
+	Values Document.insert would fill in for empty fields: field defaults,
+	user defaults and the first option of Select fields (type -> Supplier,
+	status -> Active).
+	"""
+	new_vendor = frappe.new_doc("Vendor", as_dict=True)
+	return {
+		field: new_vendor.get(field) for field in VENDOR_FIELDS if new_vendor.get(field) not in (None, "")
+	}
+
+
+def _select_options(meta, fieldname):
+	return set(filter(None, (meta.get_field(fieldname).options or "").split("\n")))
@@ -1,9 +1,57 @@
 # Copyright (c) 2025, APAS and Contributors
 # See license.txt
 
-# import frappe
+import json
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from vendor_manager.cache import get_redis, make_key
+from vendor_manager.waitlist_intake import EMAILS_KEY, insert_signups, join_waitlist
+
 
 class TestWaitlist(FrappeTestCase):
-	pass
+	def test_batched_insert_skips_known_emails(self):
+		frappe.db.delete("Waitlist", {"email": ["like", "%@waitlist.example.com"]})
+		rows = [
+			{"full_name": "First", "email": "one@waitlist.example.com", "vendor_type": "_No Such Vendor"},
+			{"full_name": "Second", "email": "two@waitlist.example.com"},
+			{"full_name": "Repeat", "email": "one@waitlist.example.com"},
+		]
+
+		names = insert_signups([dict(row) for row in rows])
+		self.assertEqual(len(names), 2)
+		self.assertTrue(all(name.startswith("WL-") for name in names))
+		self.assertIsNone(frappe.db.get_value("Waitlist", names[0], "vendor_type"))
+
+		# A batch of duplicates does not use up a series number
+		current = frappe.db.sql("select current from `tabSeries` where name = ''")[0][0]
+		self.assertEqual(insert_signups([dict(row) for row in rows]), [])
+		self.assertEqual(frappe.db.sql("select current from `tabSeries` where name = ''")[0][0], current)
+
+	def test_join_waitlist_does_not_reveal_duplicates(self):
+		email = "guest@join.example.com"
+		get_redis().srem(make_key(EMAILS_KEY), email)
+		self.addCleanup(get_redis().srem, make_key(EMAILS_KEY), email)
+		signups = json.dumps([{"full_name": "Guest", "email": email}, {"full_name": "Bad", "email": "nope"}])
+
+		with patch.object(frappe, "enqueue") as enqueue:
+			first = join_waitlist(signups=signups)
+			second = join_waitlist(signups=signups)
+
+		self.assertEqual(
+			first, {"accepted": 1, "rejected": [{"index": 1, "reason": "a valid email is required"}]}
+		)
+		self.assertEqual(second, first)
+		# The repeat is caught by the known-email set and never queued
+		queued = [call.kwargs["rows"] for call in enqueue.call_args_list if "rows" in call.kwargs]
+		self.assertEqual([[row["email"] for row in rows] for rows in queued], [[email]])
+
+	def test_names_share_the_desk_series(self):
+		frappe.db.delete("Waitlist", {"email": ["like", "%@series.example.com"]})
+		(intake_name,) = insert_signups([{"full_name": "Intake", "email": "intake@series.example.com"}])
+		desk = frappe.get_doc(
+			{"doctype": "Waitlist", "full_name": "Desk", "email": "desk@series.example.com"}
+		).insert(ignore_permissions=True)
+		self.assertGreater(desk.name, intake_name)
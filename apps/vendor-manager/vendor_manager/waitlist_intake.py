@@ -0,0 +1,249 @@
+# Copyright (c) 2025, APAS and contributors
+# For license information, please see license.txt
+
+"""
+Guest Waitlist intake.
+
+`join_waitlist` only validates the payload and adds the emails to a Redis
+set of known signups in one round trip, so it answers in constant time
+however busy the database is. The new signups travel in the payload of a
+background job on the durable job queue (the known-email set lives in the
+cache and may be cleared at any time; it only saves work). The job
+re-checks the emails against the table (the authoritative dedupe), names
+the rows through the doctype's autoname and writes them with a single
+multi-row INSERT.
+
+The response is the same whether or not an email was already on the
+waitlist, so the endpoint cannot be used to probe who has signed up.
+"""
+
+from functools import partial
+
+import frappe
+from frappe import _
+from frappe.model.naming import set_new_name
+from frappe.rate_limiter import rate_limit
+from frappe.utils import now, validate_email_address
+
+from vendor_manager.cache import get_redis, make_key
+from vendor_manager.data_import import get_series
+
+EMAILS_KEY = "vendor_manager:waitlist_emails"
+READY_KEY = "vendor_manager:waitlist_emails:ready"
+
+WAITLIST_FIELDS = ["full_name", "email", "vendor_type", "notes"]
+MAX_SIGNUPS_PER_REQUEST = 100
+MAX_NOTES_LENGTH = 2000
+
+
+@frappe.whitelist(allow_guest=True, methods=["POST"])
+@rate_limit(limit=30, seconds=60)
+def join_waitlist(signups=None, full_name=None, email=None, vendor_type=None, notes=None):
+	"""
+	Accept one signup (as form fields) or many (`signups`, a JSON list of dicts).
+
+	Returns:
+		dict: {"accepted": n, "rejected": [{"index": i, "reason": str}]}; emails already
+		on the waitlist count as accepted
+	"""
+	if signups is None:
+		signups = [{"full_name": full_name, "email": email, "vendor_type": vendor_type, "notes": notes}]
+	else:
+		signups = frappe.parse_json(signups)
+	if not isinstance(signups, list):
+		frappe.throw(_("signups must be a list"))
+	if len(signups) > MAX_SIGNUPS_PER_REQUEST:
+		frappe.throw(_("At most {0} signups per request").format(MAX_SIGNUPS_PER_REQUEST))
+
+	valid, rejected = [], []
+	for index, signup in enumerate(signups):
+		row, reason = _clean_signup(signup)
+		if reason:
+			rejected.append({"index": index, "reason": reason})
+		else:
+			valid.append(row)
+
+	accepted = _mark_known(valid) if valid else []
+	if accepted:
+		_enqueue_insert(accepted)
+	if not _email_index_ready():
+		enqueue_email_index_rebuild()
+
+	return {"accepted": len(valid), "rejected": rejected}
+
+
+def insert_queued_signups(rows):
+	"""Background job queued by join_waitlist"""
+	insert_signups(rows)
+	frappe.db.commit()
+
+
+def insert_signups(rows):
+	"""Insert cleaned signups, skipping emails already on the waitlist. Returns the inserted names."""
+	if not rows:
+		return []
+
+	# Locking the series row until commit serializes concurrent intake jobs and desk
+	# inserts, so the locking read below sees every committed signup
+	_lock_series()
+	existing = {
+		value.lower()
+		for (value,) in existing_emails_query([row["email"] for row in rows], for_update=True).run()
+	}
+	vendor_names = {row["vendor_type"] for row in rows if row.get("vendor_type")}
+	known_vendors = {
+		name.casefold()
+		for name in (
+			frappe.get_all("Vendor", filters={"name": ["in", list(vendor_names)]}, pluck="name")
+			if vendor_names
+			else []
+		)
+	}
+
+	pending = []
+	for row in rows:
+		if row["email"] in existing:
+			continue
+		existing.add(row["email"])
+		if row.get("vendor_type") and row["vendor_type"].casefold() not in known_vendors:
+			row["vendor_type"] = None
+		pending.append(row)
+
+	if not pending:
+		return []
+
+	names = [_new_name(row) for row in pending]
+	timestamp = now()
+	fields = ["name", "owner", "creation", "modified", "modified_by", "docstatus", "idx", *WAITLIST_FIELDS]
+	values = [
+		(name, "Guest", timestamp, timestamp, "Guest", 0, 0, *(row.get(field) for field in WAITLIST_FIELDS))
+		for name, row in zip(names, pending, strict=True)
+	]
+	frappe.db.bulk_insert("Waitlist", fields=fields, values=values, chunk_size=len(values))
+	return names
+
+
+def existing_emails_query(emails, for_update=False):
+	return frappe.qb.get_query(
+		"Waitlist", fields=["email"], filters={"email": ["in", emails]}, for_update=for_update
+	)
+
+
+def rebuild_email_index():
+	"""Rebuild the known-email set from the table and swap it in"""
+	r = get_redis()
+	building_key = make_key(EMAILS_KEY + ":building")
+	r.delete(building_key)
+
+	last_name = ""
+	while True:
+		rows = frappe.get_all(
+			"Waitlist",
+			filters={"name": [">", last_name]},
+			fields=["name", "email"],
+			order_by="name asc",
+			limit=5000,
+		)
+		if not rows:
+			break
+		emails = [row.email.strip().lower() for row in rows if row.email]
+		if emails:
+			r.sadd(building_key, *emails)
+		last_name = rows[-1].name
+
+	pipe = r.pipeline()
+	if r.exists(building_key):
+		pipe.rename(building_key, make_key(EMAILS_KEY))
+	else:
+		pipe.delete(make_key(EMAILS_KEY))
+	pipe.set(make_key(READY_KEY), 1)
+	pipe.execute()
+
+
+def enqueue_email_index_rebuild():
+	frappe.enqueue(
+		"vendor_manager.waitlist_intake.rebuild_email_index",
+		queue="long",
+		job_id="vendor_manager_waitlist_email_index",
+		deduplicate=True,
+	)
+
+
+def on_waitlist_insert(doc, method=None):
+	# Signups added from the desk; queued ones are already in the set
+	if doc.email:
+		frappe.db.after_commit.add(partial(_add_email, doc.email.strip().lower()))
+
+
+def on_waitlist_trash(doc, method=None):
+	if doc.email:
+		frappe.db.after_commit.add(partial(_remove_email, doc.email.strip().lower()))
+
+
+def _clean_signup(signup):
+	if not isinstance(signup, dict):
+		return None, "signup must be an object"
+
+	row = {
+		field: (str(signup.get(field)).strip() if signup.get(field) else None) for field in WAITLIST_FIELDS
+	}
+	if not row["full_name"]:
+		return None, "full_name is required"
+	if len(row["full_name"]) > 140:
+		return None, "full_name is too long"
+	if not row["email"] or not validate_email_address(row["email"]):
+		return None, "a valid email is required"
+	if row["vendor_type"] and len(row["vendor_type"]) > 140:
+		return None, "vendor_type is too long"
+
+	row["email"] = row["email"].lower()
+	if row["notes"]:
+		row["notes"] = row["notes"][:MAX_NOTES_LENGTH]
+	return row, None
+
+
+def _mark_known(rows):
+	"""Add the emails to the known set; returns the rows whose email was new"""
+	with get_redis().pipeline() as pipe:
+		for row in rows:
+			pipe.sadd(make_key(EMAILS_KEY), row["email"])
+		added = pipe.execute()
+	return [row for row, new in zip(rows, added, strict=True) if new]
+
+
+def _enqueue_insert(rows):
+	try:
+		frappe.enqueue("vendor_manager.waitlist_intake.insert_queued_signups", queue="short", rows=rows)
+	except Exception:
+		# Not queued, so let the client retry without being told it is a duplicate
+		get_redis().srem(make_key(EMAILS_KEY), *(row["email"] for row in rows))
+		raise
+
+
+def _lock_series():
+	"""Lock the Waitlist naming series row, creating it if needed, without taking a number"""
+	key, _prefix = get_series(frappe.get_meta("Waitlist").autoname)
+	frappe.db.sql(
+		"insert into `tabSeries` (name, current) values (%s, 0) on duplicate key update current = current",
+		key,
+	)
+
+
+def _new_name(row):
+	"""Name a signup the way Document.insert would, from the Waitlist autoname (format:WL-{####})"""
+	doc = frappe.new_doc("Waitlist")
+	doc.update(row)
+	set_new_name(doc)
+	return doc.name
+
+
+def _email_index_ready():
+	return bool(get_redis().exists(make_key(READY_KEY)))
+
+
+def _add_email(email):
+	get_redis().sadd(make_key(EMAILS_KEY), email)
+
+
+def _remove_email(email):
+	get_redis().srem(make_key(EMAILS_KEY), email)
@@ -1,25 +1,14 @@
 import frappe
-import json
-import os
 
-frappe.connect()
+from vendor_manager.data_export import export_doctypes
 
-# Export Vendor DocType
-vendor_doc = frappe.get_doc('DocType', 'Vendor')
-with open('/tmp/vendor_doctype.json', 'w') as f:
-    json.dump(vendor_doc.as_dict(), f, indent=2, default=str)
-print('✓ Vendor DocType exported')
+# Prefer the bench command, which takes any DocType or module:
+#   bench --site builder.localhost export-doctypes Vendor Waitlist --out /tmp/export
 
-# Export Waitlist DocType
-waitlist_doc = frappe.get_doc('DocType', 'Waitlist')
-with open('/tmp/waitlist_doctype.json', 'w') as f:
-    json.dump(waitlist_doc.as_dict(), f, indent=2, default=str)
-print('✓ Waitlist DocType exported')
+frappe.connect()
 
-# Export sample vendor data
-vendors = frappe.get_all('Vendor', fields=['*'])
-with open('/tmp/vendors_data.json', 'w') as f:
-    json.dump(vendors, f, indent=2, default=str)
-print(f'✓ Exported {len(vendors)} vendors')
+results = export_doctypes(['Vendor', 'Waitlist'], '/tmp/export')
+for doctype, result in results.items():
+    print(f"✓ {doctype}: {result['rows']} rows exported with its schema")
 
-print('\nExport complete! Files saved to /tmp/')
+print('\nExport complete! Files saved to /tmp/export/')
@@ -0,0 +1,337 @@
+"""
+Parallel restore of a Frappe `*-database.sql.gz` backup into MariaDB.
+
+`bench restore` replays the dump as one serial stream. This tool streams the
+gzip file once and splits it per table on the fly:
+
+- each table is created without its secondary indexes, so rows load into
+  the clustered primary key only;
+- its INSERT statements (mysqldump emits one per ~1 MB of rows) are loaded
+  concurrently over `--workers` connections, with foreign key and unique
+  checks off;
+- once a table's last INSERT has finished, its secondary indexes are added
+  back in a single ALTER TABLE, while other tables keep loading.
+
+At most `--workers` * 4 statements are held in memory, so memory does not
+grow with the dump. Per-table rows, MB, load time and throughput are
+printed at the end.
+
+Run it with bench's Python (pymysql comes with Frappe), then clear the cache:
+
+    ./env/bin/python parallel_restore.py backups/<...>-database.sql.gz \\
+        --site-config sites/builder.localhost/site_config.json --host mariadb --workers 8
+    bench --site builder.localhost clear-cache
+
+Try it against a throwaway MariaDB container:
+
+    docker run -d --name restore-test -e MARIADB_ROOT_PASSWORD=root -p 3307:3306 mariadb:10.8
+    docker exec restore-test mariadb -uroot -proot -e 'create database restore_test'
+    python scripts/parallel_restore.py backups/<...>-database.sql.gz \\
+        --host 127.0.0.1 --port 3307 --user root --password root --database restore_test --verify
+
+`--dry-run` only parses the dump and reports what it would load.
+"""
+
+import argparse
+import gzip
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SESSION_SETTINGS = [
+    'SET NAMES utf8mb4',
+    "SET time_zone = '+00:00'",
+    "SET sql_mode = 'NO_AUTO_VALUE_ON_ZERO'",
+    'SET foreign_key_checks = 0',
+    'SET unique_checks = 0',
+]
+# mysqldump wrappers this tool replaces with its own session settings and index handling
+SKIPPED_STATEMENT = re.compile(
+    r'^(/\*!\d+ SET |/\*!40000 ALTER TABLE .* (DISABLE|ENABLE) KEYS|LOCK TABLES |UNLOCK TABLES)'
+)
+TABLE_NAME = re.compile(r'^(?:DROP TABLE IF EXISTS|CREATE TABLE|INSERT INTO) `((?:[^`]|``)+)`')
+SECONDARY_KEY = re.compile(r'^\s*(UNIQUE |FULLTEXT |SPATIAL )?KEY ')
+AUTO_INCREMENT_COLUMN = re.compile(r'^\s*`((?:[^`]|``)+)` .*\bAUTO_INCREMENT\b')
+
+
+def iter_statements(path):
+    """Yield the SQL statements of a mysqldump file (optionally gzipped), without comments"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='\n') as dump:
+        statement = []
+        for line in dump:
+            if not statement:
+                if not line.strip() or line.startswith('--'):
+                    continue
+                # e.g. /*M!999999\- enable the sandbox mode */ has no terminating semicolon
+                if line.startswith('/*') and line.rstrip().endswith('*/'):
+                    continue
+            statement.append(line)
+            # Dumped values escape newlines, so only a statement's last line ends with ";"
+            if line.rstrip('\r\n').endswith(';'):
+                yield ''.join(statement)
+                statement = []
+
+
+def split_create_table(statement):
+    """
+    Move a CREATE TABLE's secondary indexes out of it.
+
+    Returns:
+        tuple: (CREATE TABLE without them, "ALTER TABLE ... ADD ..." or None)
+    """
+    lines = statement.splitlines()
+    auto_increment = {m.group(1) for m in map(AUTO_INCREMENT_COLUMN.match, lines) if m}
+    kept, deferred = [], []
+    for line in lines:
+        # An AUTO_INCREMENT column must stay the first column of some key
+        if SECONDARY_KEY.match(line) and not any(f'(`{column}`' in line for column in auto_increment):
+            deferred.append(line.strip().rstrip(','))
+        else:
+            kept.append(line)
+    if not deferred:
+        return statement, None
+
+    # The last column or key left before ") ENGINE=..." must not end with a comma
+    closing = next(i for i in range(len(kept) - 1, -1, -1) if kept[i].startswith(')'))
+    kept[closing - 1] = kept[closing - 1].rstrip(',')
+    table = TABLE_NAME.match(statement).group(1)
+    return '\n'.join(kept), f"ALTER TABLE `{table}` " + ', '.join(f'ADD {key}' for key in deferred)
+
+
+class TableStats:
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.bytes = 0
+        self.pending = 0
+        self.finished_reading = False
+        self.load_seconds = 0.0
+        self.index_seconds = 0.0
+        self.started = None
+        self.ended = None
+        self.alter = None
+
+    def as_dict(self):
+        wall = (self.ended - self.started) if self.started and self.ended else 0.0
+        return {
+            'table': self.name,
+            'rows': self.rows,
+            'mb': round(self.bytes / 1024 / 1024, 2),
+            'load_seconds': round(self.load_seconds, 3),
+            'index_seconds': round(self.index_seconds, 3),
+            'wall_seconds': round(wall, 3),
+            'rows_per_second': round(self.rows / wall) if wall else None,
+            'mb_per_second': round(self.bytes / 1024 / 1024 / wall, 2) if wall else None,
+        }
+
+
+class Restore:
+    def __init__(self, connect, workers=4, dry_run=False):
+        self.connect = connect
+        self.workers = workers
+        self.dry_run = dry_run
+        self.tables = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        # Bounds the statements read ahead of the workers
+        self.slots = threading.BoundedSemaphore(workers * 4)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='restore')
+        self.futures = []
+        self.errors = []
+
+    def run(self, path):
+        started = time.perf_counter()
+        main = None if self.dry_run else self._connection()
+        current = None
+
+        for statement in iter_statements(path):
+            if SKIPPED_STATEMENT.match(statement):
+                continue
+            if self.errors:
+                break
+
+            match = TABLE_NAME.match(statement)
+            table = match.group(1) if match else None
+            if current is not None and table != current:
+                self._finish_reading(current)
+                current = None
+
+            if statement.startswith('INSERT INTO'):
+                current = table
+                self._submit_insert(table, statement)
+            elif statement.startswith('CREATE TABLE'):
+                create, alter = split_create_table(statement)
+                stats = self.tables.setdefault(table, TableStats(table))
+                stats.alter = alter
+                self._execute(main, create)
+                current = table
+            else:
+                # DROP TABLE / sequences / anything else runs in dump order on the main connection
+                self._execute(main, statement)
+
+        if current is not None:
+            self._finish_reading(current)
+        for future in list(self.futures):
+            future.result()
+        self.pool.shutdown()
+        if self.errors:
+            raise self.errors[0]
+        return time.perf_counter() - started
+
+    def report(self):
+        return sorted((stats.as_dict() for stats in self.tables.values()), key=lambda row: -row['rows'])
+
+    def _submit_insert(self, table, statement):
+        stats = self.tables.setdefault(table, TableStats(table))
+        with self.lock:
+            stats.pending += 1
+            stats.bytes += len(statement)
+            # Each dumped row starts on its own line with "("
+            stats.rows += statement.count('\n(') or 1
+        self.slots.acquire()
+        self.futures.append(self.pool.submit(self._load, stats, statement))
+
+    def _load(self, stats, statement):
+        try:
+            started = time.perf_counter()
+            with self.lock:
+                stats.started = stats.started or started
+            self._execute(self._worker_connection(), statement)
+            ended = time.perf_counter()
+            with self.lock:
+                stats.load_seconds += ended - started
+                stats.ended = ended
+                stats.pending -= 1
+                done = stats.finished_reading and stats.pending == 0
+            if done:
+                self._build_indexes(stats)
+        except Exception as e:
+            self.errors.append(e)
+        finally:
+            self.slots.release()
+
+    def _finish_reading(self, table):
+        stats = self.tables.setdefault(table, TableStats(table))
+        with self.lock:
+            stats.finished_reading = True
+            done = stats.pending == 0
+        if done:
+            self.futures.append(self.pool.submit(self._build_indexes_safely, stats))
+
+    def _build_indexes_safely(self, stats):
+        try:
+            self._build_indexes(stats)
+        except Exception as e:
+            self.errors.append(e)
+
+    def _build_indexes(self, stats):
+        if stats.alter:
+            started = time.perf_counter()
+            self._execute(self._worker_connection(), stats.alter)
+            stats.index_seconds = time.perf_counter() - started
+        stats.ended = time.perf_counter()
+
+    def _worker_connection(self):
+        if self.dry_run:
+            return None
+        if getattr(self.local, 'connection', None) is None:
+            self.local.connection = self._connection()
+        return self.local.connection
+
+    def _connection(self):
+        connection = self.connect()
+        with connection.cursor() as cursor:
+            for setting in SESSION_SETTINGS:
+                cursor.execute(setting)
+        return connection
+
+    def _execute(self, connection, statement):
+        if connection is None:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(statement)
+
+
+def verify(connect, report):
+    """Compare the rows parsed from the dump with COUNT(*) of each loaded table"""
+    mismatches = []
+    connection = connect()
+    with connection.cursor() as cursor:
+        for row in report:
+            cursor.execute(f"SELECT COUNT(*) FROM `{row['table']}`")
+            count = cursor.fetchone()[0]
+            if count != row['rows']:
+                mismatches.append((row['table'], row['rows'], count))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Restore a Frappe database backup with parallel per-table loads'
+    )
+    parser.add_argument('dump', help='*-database.sql.gz backup (or plain .sql)')
+    parser.add_argument('--site-config', help="site_config.json providing db_name, db_password and db_host")
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    parser.add_argument('--database')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent MariaDB connections')
+    parser.add_argument('--verify', action='store_true', help='Compare row counts after loading')
+    parser.add_argument('--dry-run', action='store_true', help='Parse the dump and report; load nothing')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    config = {}
+    if args.site_config:
+        with open(args.site_config) as f:
+            config = json.load(f)
+    database = args.database or config.get('db_name')
+    settings = {
+        'host': args.host or config.get('db_host') or '127.0.0.1',
+        'port': args.port or int(config.get('db_port') or 3306),
+        'user': args.user or config.get('db_user') or database,
+        'password': args.password if args.password is not None else config.get('db_password'),
+        'database': database,
+    }
+    if not args.dry_run and not database:
+        parser.error('--database or --site-config is required')
+
+    def connect():
+        import pymysql
+
+        return pymysql.connect(charset='utf8mb4', autocommit=True, **settings)
+
+    restore = Restore(connect, workers=args.workers, dry_run=args.dry_run)
+    seconds = restore.run(args.dump)
+    report = restore.report()
+
+    if args.json:
+        print(json.dumps({'seconds': round(seconds, 3), 'tables': report}, indent=1))
+    else:
+        print(f"{'table':<48} {'rows':>10} {'MB':>8} {'load s':>8} {'index s':>8} {'rows/s':>10} {'MB/s':>7}")
+        for row in report:
+            rows_per_second, mb_per_second = row['rows_per_second'] or '-', row['mb_per_second'] or '-'
+            print(
+                f"{row['table'][:48]:<48} {row['rows']:>10} {row['mb']:>8} {row['load_seconds']:>8} "
+                f"{row['index_seconds']:>8} {rows_per_second:>10} {mb_per_second:>7}"
+            )
+        total_rows = sum(row['rows'] for row in report)
+        total_mb = sum(row['mb'] for row in report)
+        print(f'\n{len(report)} tables, {total_rows} rows, {total_mb:.1f} MB in {seconds:.1f}s')
+
+    if args.verify and not args.dry_run:
+        mismatches = verify(connect, report)
+        for table, expected, actual in mismatches:
+            print(f'✗ {table}: {expected} rows in the dump, {actual} loaded')
+        if mismatches:
+            sys.exit(1)
+        print('✓ Row counts match the dump')
+
+
+if __name__ == '__main__':
+    main()